@@ -1,6 +1,10 @@
 from .api import *
+from .async_api import *
+from .cache import *
 from .consts import *
 from .exceptions import *
+from .ratelimit import *
+from .retry import *
 
 """
 **Update v1.1**
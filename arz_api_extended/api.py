@@ -1,12 +1,19 @@
-from bs4 import BeautifulSoup
-from re import compile, findall
-from requests import session, Response
-from html import unescape
-
-from arz_api_extended.consts import MAIN_URL, ROLE_COLOR
-from arz_api_extended.bypass_antibot import bypass
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+from requests import Response
+
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.bypass_antibot import bypass, is_challenge, refresh, CookieStore, default_store
+from arz_api_extended.cache import ResponseCache, ConditionalCache, MISS, fingerprint
+from arz_api_extended.csrf import TokenManager, is_security_error, replace_token, request_token
+from arz_api_extended.ratelimit import RateLimiter
+from arz_api_extended.retry import RetryPolicy, RetrySession
 
 from arz_api_extended.exceptions import IncorrectLoginData, ThisIsYouError
+from arz_api_extended.parsers import get_parser
+from arz_api_extended.parsers.payload import loads, page_content
 from arz_api_extended.models.other import Statistic
 from arz_api_extended.models.post_object import Post, ProfilePost
 from arz_api_extended.models.member_object import Member, CurrentMember
@@ -15,21 +22,42 @@ from arz_api_extended.models.category_object import Category
 
 
 class ArizonaAPI:
-    def __init__(self, user_agent: str, cookie: dict, do_bypass: bool = True) -> None:
+    def __init__(self, user_agent: str, cookie: dict, do_bypass: bool = True, token_ttl: float = 3600, cookie_store: CookieStore = default_store, cache: ResponseCache = None, conditional: ConditionalCache = None, parser: str = 'lxml', base_url: str = MAIN_URL, rate_limiter: RateLimiter = None, retry: RetryPolicy = None) -> None:
         self.user_agent = user_agent
         self.cookie = cookie
-        self.session = session()
+        self.base_url = base_url.rstrip('/')
+        """Адрес форума (например, локальный тестовый сервер)"""
+        self.session = RetrySession(rate_limiter, retry)
         self.session.headers = {"user-agent": user_agent}
         self.session.cookies.update(cookie)
 
+        self.token_manager = TokenManager(token_ttl)
+        """Кэш CSRF токена (token_manager.fetches_avoided - сколько запросов за токеном удалось избежать)"""
+        self.cookie_store = cookie_store
+        """Хранилище cookie анти-бота (MemoryCookieStore, FileCookieStore или None)"""
+        self.cache = cache
+        """Кэш разобранных ответов (ResponseCache или None - без кэша). Статистика: cache.stats"""
+        self.conditional = conditional
+        """Условные запросы для опрашиваемых страниц (ConditionalCache или None). Статистика: conditional.stats"""
+        self.parser = get_parser(parser)
+        """Бэкенд разбора страниц ('lxml' - быстрый, 'soup' - эталонный на BeautifulSoup)"""
+        self.rate_limiter = rate_limiter
+        """Ограничение частоты запросов (RateLimiter или None). Статистика ожидания: rate_limiter.stats"""
+        self.retry = retry
+        """Повтор запросов при 5xx / 429 / обрыве соединения / анти-боте (RetryPolicy или None). Статистика: retry.stats"""
+        self.session.hooks['response'].extend((self._bypass_hook, self._token_hook))
+
         if do_bypass:
-            name, code = str(bypass(user_agent)).split('=')
+            name, code = str(bypass(user_agent, store=cookie_store, url=f"{self.base_url}/", retry=retry, limiter=rate_limiter)).split('=')
             self.session.cookies.set(name, code)
 
-        if BeautifulSoup(self.session.get(f"{MAIN_URL}").content, 'lxml').find('html')['data-logged-in'] == "false":
+        response = self.session.get(f"{self.base_url}")
+        if is_challenge(response.content):
+            response = self.session.get(f"{self.base_url}")
+
+        if not self.parser.parse_logged_in(response.content):
             raise IncorrectLoginData
 
-    
     def logout(self):
         """Закрыть сессию"""
 
@@ -40,159 +68,342 @@ class ArizonaAPI:
     def current_member(self) -> CurrentMember:
         """Объект текущего пользователя"""
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/account").content, 'lxml')
-        user_id = int(content.find('span', {'class': 'avatar--xxs'})['data-user-id'])
+        user_id = self.parser.parse_current_user_id(self.session.get(f"{self.base_url}/account").content)
         member_info = self.get_member(user_id)
 
-        return CurrentMember(self, user_id, member_info.username, member_info.user_title, member_info.avatar, member_info.roles, member_info.messages_count, member_info.reactions_count, member_info.trophies_count)
+        return CurrentMember(self, user_id, member_info.username, member_info.user_title, member_info.avatar, member_info.roles, member_info.messages_count, member_info.reactions_count, member_info.trophies_count, member_info.username_color)
+
 
     @property
     def token(self) -> str:
-        """Получить токен CSRF"""
-        return BeautifulSoup(self.session.get(f"{MAIN_URL}/help/terms/").content, 'lxml').find('html')['data-csrf']
+        """Получить токен CSRF (из кэша, либо запросом к /help/terms/)"""
+        return self.token_manager.get(lambda: self.session.get(f"{self.base_url}/help/terms/").content)
 
 
-    def get_category(self, category_id: int) -> Category:
-        """Найти раздел по ID"""
+    def _bypass_hook(self, response: Response, **kwargs) -> Response:
+        """Если форум снова отдал страницу анти-бота - сбрасывает сохраненный cookie и решает задачу заново"""
 
-        request = self.session.get(f"{MAIN_URL}/forums/{category_id}?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
+        if not kwargs.get('stream') and is_challenge(response.content):
+            name, code = refresh(response.text, self.user_agent, self.cookie_store).split('=')
+            self.session.cookies.set(name, code)
+        return response
+
+
+    def _token_hook(self, response: Response, **kwargs) -> Response:
+        """Собирает CSRF токен из ответов и однократно повторяет запрос при ошибке безопасности XenForo"""
+
+        if kwargs.get('stream'):
+            return response
+
+        if not is_security_error(response.status_code, response.content) or getattr(response.request, '_token_retry', False):
+            self.token_manager.harvest(response.content)
+            return response
+
+        old_token = request_token(response.request)
+        self.token_manager.invalidate()
+        new_token = self.token
+        request = response.request.copy()
+        if old_token is None or new_token is None or not replace_token(request, old_token, new_token):
+            return response
+
+        request._token_retry = True
+        return self.session.send(request, **kwargs)
+
+
+    def _cache_get(self, endpoint: str, *key):
+        return self.cache.get(endpoint, *key) if self.cache is not None else MISS
+
+
+    def _cache_set(self, endpoint: str, *key, value):
+        if self.cache is not None:
+            self.cache.set(endpoint, *key, value=value)
+        return value
+
+
+    def _invalidate(self, endpoint: str, *key) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(endpoint, *key)
+
+
+    def _get_polled(self, key: tuple, url: str, parse, json: bool = False):
+        """GET опрашиваемой страницы. С self.conditional отправляется условный запрос,
+        а если страница не изменилась - возвращается прошлый результат без разбора"""
+
+        conditional = self.conditional
+        response = self.session.get(url, headers=conditional.headers(key) if conditional is not None else None)
+        if conditional is not None and response.status_code == 304:
+            result = conditional.get_not_modified(key)
+            if result is not MISS:
+                return result
+            # запись вытеснили после того, как были отправлены условные заголовки - загружаем страницу заново
+            response = self.session.get(url)
+
+        data = loads(response.content) if json else response.content
+        if json and data['status'] == 'error':
             return None
+        if conditional is None:
+            return parse(data)
+
+        digest = fingerprint(page_content(data).encode() if json else data)
+        result = conditional.get_unchanged(key, digest)
+        if result is MISS:
+            result = conditional.set(key, response.headers, digest, parse(data))
+        return result
+
+
+    def _invalidate_thread(self, thread_id: int) -> None:
+        """Сбросить кэш темы и всех ее страниц (после ответа может появиться новая страница)"""
 
-        content = unescape(request['html']['content'])
-        content = BeautifulSoup(content, 'lxml')
+        self._invalidate('thread', thread_id)
+        self._invalidate('thread_posts', thread_id)
+        self._invalidate('thread_posts_full', thread_id)
 
-        title = unescape(request['html']['title'])
-        try: pages_count = int(content.find_all('li', {'class': 'pageNav-page'})[-1].text)
-        except IndexError: pages_count = 1
 
-        return Category(self, category_id, title, pages_count)
+    def get_category(self, category_id: int) -> Category:
+        """Найти раздел по ID"""
+
+        data = self._cache_get('category', category_id)
+        if data is MISS:
+            request = loads(self.session.get(f"{self.base_url}/forums/{category_id}?_xfResponseType=json&_xfToken={self.token}").content)
+            if request['status'] == 'error':
+                return None
+            data = self._cache_set('category', category_id, value=self.parser.parse_category(request))
+
+        return Category(self, category_id, **data)
     
     
     def get_member(self, user_id: int) -> Member:
         """Найти пользователя по ID (возвращает либо Member, либо None (если профиль закрыт / не существует))"""
 
-        request = self.session.get(f"{MAIN_URL}/members/{user_id}?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
-            return None
+        data = self._cache_get('member', user_id)
+        if data is MISS:
+            request = loads(self.session.get(f"{self.base_url}/members/{user_id}?_xfResponseType=json&_xfToken={self.token}").content)
+            if request['status'] == 'error':
+                return None
+            data = self._cache_set('member', user_id, value=self.parser.parse_member(request, user_id))
 
-        content = unescape(request['html']['content'])
-        content = BeautifulSoup(content, 'lxml')
+        return Member(self, **data)
 
-        username = unescape(request['html']['title'])
 
-        username_class = content.find('span', class_='username')
+    def get_members(self, user_ids: Iterable[int], max_concurrency: int = 8, on_error: Callable = None) -> dict:
+        """[NEW] Найти пользователей по списку ID (повторы загружаются один раз, профили - параллельно)
 
-        if username_class:
-            for style in ROLE_COLOR:
-                if style in str(username_class):
-                    username_color = ROLE_COLOR[style]
-                    break
-            else:
-                username_color = '#fff'
+        Attributes:
+            user_ids (Iterable[int]): ID пользователей
+            max_concurrency (int): Сколько профилей загружать одновременно. По умолчанию 8 (необяз.)
+            on_error (Callable): Функция on_error(user_id, исключение) для ошибок запроса, ее результат попадает в словарь.
+                По умолчанию ошибка поднимается (необяз.)
 
-        roles = []
-        for i in content.find('div', {'class': 'memberHeader-banners'}).children:
-            if i.text != '\n': roles.append(i.text)
+        Returns:
+            Словарь (dict) ID -> Member или None (профиль закрыт / не существует) в порядке user_ids
+        """
 
-        try: user_title = content.find('span', {'class': 'userTitle'}).text
-        except AttributeError: user_title = None
-        try: avatar = MAIN_URL + content.find('a', {'class': 'avatar avatar--l'})['href']
-        except TypeError: avatar = None
+        user_ids = list(dict.fromkeys(user_ids))
+        members = dict(self.iter_members(user_ids, max_concurrency, on_error))
+        return {user_id: members[user_id] for user_id in user_ids}
 
-        messages_count = int(content.find('a', {'href': f'/search/member?user_id={user_id}'}).text.strip().replace(',', ''))
-        reactions_count = int(content.find('dl', {'class': 'pairs pairs--rows pairs--rows--centered'}).find('dd').text.strip().replace(',', ''))
-        trophies_count = int(content.find('a', {'href': f'/members/{user_id}/trophies'}).text.strip().replace(',', ''))
-        
-        return Member(self, user_id, username, user_title, avatar, roles, messages_count, reactions_count, trophies_count, username_color)
-    
 
-    def get_thread(self, thread_id: int):
-        request = self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-1?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
-            return None
-        
-        if request.get('redirect') is not None:
-            return self.get_thread(request['redirect'].strip(MAIN_URL).split('/')[1])
+    def iter_members(self, user_ids: Iterable[int], max_concurrency: int = 8, on_error: Callable = None) -> Iterator[tuple]:
+        """[NEW] Загружать пользователей по списку ID и отдавать их по мере загрузки
 
-        content = unescape(request['html']['content'])
-        content_h1 = unescape(request['html']['h1'])
-        content = BeautifulSoup(content, 'lxml')
-        content_h1 = BeautifulSoup(content_h1, 'lxml')
+        Повторяющиеся ID пропускаются, токен CSRF запрашивается один раз до начала загрузки,
+        одновременно в работе не больше 2 * max_concurrency ID (список может быть генератором)
 
-        creator_id = content.find('a', {'class': 'username'})
-        try: creator = self.get_member(int(creator_id['data-user-id']))
-        except: creator = Member(self, int(creator_id['data-user-id']), content.find('a', {'class': 'username'}).text, None, None, None, None, None, None, None)
-        
-        create_date = int(content.find('time')['data-time'])
-        
+        Attributes:
+            user_ids (Iterable[int]): ID пользователей
+            max_concurrency (int): Количество потоков. По умолчанию 8 (необяз.)
+            on_error (Callable): Функция on_error(user_id, исключение) для ошибок запроса (необяз.)
+
+        Returns:
+            Генератор пар (ID, Member или None) в порядке загрузки
+        """
+
+        user_ids = iter(dict.fromkeys(user_ids))
+        self.token
+
+        executor = ThreadPoolExecutor(max_concurrency)
         try:
-            prefix = content_h1.find('span', {'class': 'label'}).text
-            title = content_h1.text.strip(prefix).strip()
-
-        except AttributeError:
-            prefix = ""
-            title = content_h1.text
-        thread_content_html = content.find('div', {'class': 'bbWrapper'})
-        thread_content = thread_content_html.text
-        
-        try: pages_count = int(content.find_all('li', {'class': 'pageNav-page'})[-1].text)
-        except IndexError: pages_count = 1
+            pending = {executor.submit(self._fetch_member, user_id, on_error): user_id for user_id in islice(user_ids, max_concurrency * 2)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+                for user_id in islice(user_ids, len(done)):
+                    pending[executor.submit(self._fetch_member, user_id, on_error)] = user_id
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+    def _fetch_member(self, user_id: int, on_error: Callable | None) -> Member | None:
+        try:
+            return self.get_member(user_id)
+        except Exception as error:
+            if on_error is None:
+                raise
+            return on_error(user_id, error)
+
 
-        is_closed = False
-        if content.find('dl', {'class': 'blockStatus'}): is_closed = True
-        thread_post_id = content.find('article', {'id': compile('js-post-*')})['id'].strip('js-post-')
+    def hydrate_member(self, member: Member) -> Member:
+        """Загрузить поля профиля заглушки Member (если профиль закрыт, поля остаются None)"""
 
-        return Thread(self, thread_id, creator, create_date, title, prefix, thread_content, thread_content_html, pages_count, thread_post_id, is_closed)
+        try: info = self.get_member(member.id)
+        except Exception: info = None
+        member._fill(info)
+        return member
 
 
-    def get_post(self, post_id: int) -> Post:
-        """Найти пост по ID (Post если существует, None - удален / нет доступа)"""
+    def _hydrate_members(self, members: list, max_concurrency: int) -> None:
+        """Загрузить профили заглушек (каждый ID - один раз, ошибка запроса - поля None, как в hydrate_member)"""
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/posts/{post_id}").content, 'lxml')
-        post = content.find('article', {'id': f'js-post-{post_id}'})
-        if post is None:
+        info = self.get_members((member.id for member in members), max_concurrency, on_error=lambda user_id, error: None)
+        for member in members:
+            member._fill(info[member.id])
+
+
+    def _get_member_stub(self, user_id: int, username: str, hydrate: bool) -> Member:
+        member = Member.stub(self, user_id, username)
+        return self.hydrate_member(member) if hydrate else member
+
+
+    def get_thread(self, thread_id: int, hydrate: bool = False):
+        """Найти тему по ID. hydrate=True - сразу загрузить профиль автора (иначе он загрузится при первом обращении)"""
+
+        data = self._cache_get('thread', thread_id)
+        if data is MISS:
+            request = loads(self.session.get(f"{self.base_url}/threads/{thread_id}/page-1?_xfResponseType=json&_xfToken={self.token}").content)
+            if request['status'] == 'error':
+                return None
+
+            if request.get('redirect') is not None:
+                return self.get_thread(request['redirect'].strip(self.base_url).split('/')[1], hydrate)
+            data = self._cache_set('thread', thread_id, value=self.parser.parse_thread(request))
+
+        return self._make_thread(thread_id, data, hydrate)
+
+
+    def _make_thread(self, thread_id: int, data: dict, hydrate: bool) -> Thread:
+        data = dict(data)
+        creator = self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+
+        return Thread(self, thread_id, creator, **data)
+
+
+    def get_threads_by_id(self, thread_ids: Iterable[int], hydrate: bool = False, max_concurrency: int = 8) -> dict:
+        """[NEW] Найти темы по списку ID (повторы загружаются один раз, темы - параллельно)
+
+        Attributes:
+            thread_ids (Iterable[int]): ID тем
+            hydrate (bool): Сразу загрузить профили авторов (каждый автор - один раз). По умолчанию False (необяз.)
+            max_concurrency (int): Количество потоков. По умолчанию 8 (необяз.)
+
+        Returns:
+            Словарь (dict) ID -> Thread или None в порядке thread_ids
+        """
+
+        thread_ids = list(dict.fromkeys(thread_ids))
+        self.token
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            threads = dict(zip(thread_ids, executor.map(self.get_thread, thread_ids)))
+        if hydrate:
+            self._hydrate_members([thread.creator for thread in threads.values() if thread is not None], max_concurrency)
+        return threads
+
+
+    def get_post(self, post_id: int, hydrate: bool = False) -> Post:
+        """Найти пост по ID (Post если существует, None - удален / нет доступа). hydrate=True - сразу загрузить профили пользователей"""
+
+        data = self.parser.parse_post(self.session.get(f"{self.base_url}/posts/{post_id}").content, post_id)
+        if data is None:
             return None
 
-        try: creator = self.get_member(int(post.find('a', {'data-xf-init': 'member-tooltip'})['data-user-id']))
-        except:
-            user_info = post.find('a', {'data-xf-init': 'member-tooltip'})
-            creator = Member(self, int(user_info['data-user-id']), user_info.text, None, None, None, None, None, None, None)
+        creator = self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+
+        thread = self.get_thread(data.pop('thread_id'), hydrate)
+        return Post(self, post_id, creator, thread, **data)
+
+
+    def get_posts(self, post_ids: Iterable[int], hydrate: bool = False, max_concurrency: int = 1) -> dict:
+        """[NEW] Найти сообщения по списку ID
+
+        /posts/{id} отдает страницу темы со всеми ее сообщениями (~20), поэтому из одного ответа берутся все запрошенные
+        сообщения этой страницы, а отдельный запрос нужен только сообщениям с других страниц. Темы и авторы
+        загружаются один раз на всю выборку, сообщения одной темы получают общий объект Thread
+
+        Attributes:
+            post_ids (Iterable[int]): ID сообщений
+            hydrate (bool): Сразу загрузить профили авторов сообщений и тем. По умолчанию False (необяз.)
+            max_concurrency (int): Сколько страниц загружать одновременно. По умолчанию 1: ID обходятся по возрастанию
+                и каждая страница загружается один раз. При большем значении сообщения одной страницы могут
+                запросить одновременно, поэтому оно полезно для ID из разных тем (необяз.)
+
+        Returns:
+            Словарь (dict) ID -> Post или None (удалено / нет доступа) в порядке post_ids
+        """
+
+        post_ids = [int(post_id) for post_id in dict.fromkeys(post_ids)]
+        wanted, found = set(post_ids), {}
+        remaining = deque(sorted(wanted))
+        self.token
+
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            futures = {}
+            while remaining or futures:
+                while remaining and len(futures) < max_concurrency:
+                    post_id = remaining.popleft()
+                    if post_id not in found:
+                        futures[executor.submit(self._get_posts_page, post_id)] = post_id
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    post_id = futures.pop(future)
+                    found.update((key, data) for key, data in future.result().items() if key in wanted)
+                    found.setdefault(post_id, None)
+
+        threads = self.get_threads_by_id({data['thread_id'] for data in found.values() if data is not None}, max_concurrency=max(max_concurrency, 8))
+        posts, members = {}, {}
+        for post_id in post_ids:
+            data = found.get(post_id)
+            if data is None:
+                posts[post_id] = None
+                continue
+
+            data = dict(data)
+            creator_id, creator_username = data.pop('creator_id'), data.pop('creator_username')
+            creator = members.setdefault(creator_id, Member.stub(self, creator_id, creator_username))
+            posts[post_id] = Post(self, post_id, creator, threads[data.pop('thread_id')], **data)
+
+        if hydrate:
+            self._hydrate_members([*members.values(), *(thread.creator for thread in threads.values() if thread is not None)], max(max_concurrency, 8))
+        return posts
+
 
-        thread = self.get_thread(int(content.find('html')['data-content-key'].strip('thread-')))
-        create_date = int(post.find('time', {'class': 'u-dt'})['data-time'])
-        bb_content = post.find('div', {'class': 'bbWrapper'})
-        text_content = bb_content.text
-        return Post(self, post_id, creator, thread, create_date, bb_content, text_content)
+    def _get_posts_page(self, post_id: int) -> dict:
+        return self.parser.parse_posts(self.session.get(f"{self.base_url}/posts/{post_id}").content)
 
 
-    def get_profile_post(self, post_id: int) -> ProfilePost:
-        """Найти сообщение профиля по ID"""
+    def get_profile_post(self, post_id: int, hydrate: bool = False) -> ProfilePost:
+        """Найти сообщение профиля по ID. hydrate=True - сразу загрузить профили пользователей"""
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/profile-posts/{post_id}").content, 'lxml')
-        post = content.find('article', {'id': f'js-profilePost-{post_id}'})
-        if post is None:
+        data = self.parser.parse_profile_post(self.session.get(f"{self.base_url}/profile-posts/{post_id}").content, post_id)
+        if data is None:
             return None
 
-        creator = self.get_member(int(post.find('a', {'class': 'username'})['data-user-id']))
-        profile = self.get_member(int(content.find('span', {'class': 'username'})['data-user-id']))
-        create_date = int(post.find('time')['data-time'])
-        bb_content = post.find('div', {'class': 'bbWrapper'})
-        text_content = bb_content.text
+        creator = self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+        profile = self._get_member_stub(data.pop('profile_id'), data.pop('profile_username'), hydrate)
+        return ProfilePost(self, post_id, creator, profile, **data)
 
-        return ProfilePost(self, post_id, creator, profile, create_date, bb_content, text_content)
 
-    def get_forum_statistic(self) -> Statistic:
-        """Получить статистику форума"""
+    def get_forum_statistic(self, hydrate: bool = False) -> Statistic:
+        """Получить статистику форума. hydrate=True - сразу загрузить профиль последнего зарегистрированного"""
 
-        content = BeautifulSoup(self.session.get(MAIN_URL).content, 'lxml')
-        threads_count = int(content.find('dl', {'class': 'pairs pairs--justified count--threads'}).find('dd').text.replace(',', ''))
-        posts_count = int(content.find('dl', {'class': 'pairs pairs--justified count--messages'}).find('dd').text.replace(',', ''))
-        users_count = int(content.find('dl', {'class': 'pairs pairs--justified count--users'}).find('dd').text.replace(',', ''))
-        last_register_member = self.get_member(int(content.find('dl', {'class': 'pairs pairs--justified'}).find('a')['data-user-id']))
+        data = self.parser.parse_forum_statistic(self.session.get(self.base_url).content)
+        last_register_member = self._get_member_stub(data.pop('last_register_member_id'), data.pop('last_register_member_username'), hydrate)
+
+        return Statistic(self, last_register_member=last_register_member, **data)
 
-        return Statistic(self, threads_count, posts_count, users_count, last_register_member)
-    
 
     # ---------------================ МЕТОДЫ ОБЪЕКТОВ ====================--------------------
 
@@ -215,7 +426,9 @@ class ArizonaAPI:
             Cделать возврат ID новой темы
         """
 
-        return self.session.post(f"{MAIN_URL}/forums/{category_id}/post-thread?inline-mode=1", {'_xfToken': self.token, 'title': title, 'message_html': message_html, 'discussion_type': discussion_type, 'watch_thread': int(watch_thread)})
+        response = self.session.post(f"{self.base_url}/forums/{category_id}/post-thread?inline-mode=1", {'_xfToken': self.token, 'title': title, 'message_html': message_html, 'discussion_type': discussion_type, 'watch_thread': int(watch_thread)})
+        self._invalidate('category', category_id)
+        return response
     
 
     def set_read_category(self, category_id: int) -> Response:
@@ -228,7 +441,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/forums/{category_id}/mark-read", {'_xfToken': self.token})
+        return self.session.post(f"{self.base_url}/forums/{category_id}/mark-read", {'_xfToken': self.token})
     
 
     def watch_category(self, category_id: int, notify: str, send_alert: bool = True, send_email: bool = False, stop: bool = False) -> Response:
@@ -245,8 +458,8 @@ class ArizonaAPI:
             Объект Response модуля requests    
         """
 
-        if stop: return self.session.post(f"{MAIN_URL}/forums/{category_id}/watch", {'_xfToken': self.token, 'stop': "1"})
-        else: return self.session.post(f"{MAIN_URL}/forums/{category_id}/watch", {'_xfToken': self.token, 'send_alert': int(send_alert), 'send_email': int(send_email), 'notify': notify})
+        if stop: return self.session.post(f"{self.base_url}/forums/{category_id}/watch", {'_xfToken': self.token, 'stop': "1"})
+        else: return self.session.post(f"{self.base_url}/forums/{category_id}/watch", {'_xfToken': self.token, 'send_alert': int(send_alert), 'send_email': int(send_email), 'notify': notify})
 
 
     def get_threads(self, category_id: int, page: int = 1) -> dict:
@@ -260,20 +473,7 @@ class ArizonaAPI:
             Словарь (dict), состоящий из списков закрепленных ('pins') и незакрепленных ('unpins') тем
         """
 
-        request = self.session.get(f"{MAIN_URL}/forums/{category_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
-            return None
-        
-        soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-        result = {'pins': [], 'unpins': []}
-        for thread in soup.find_all('div', compile('structItem structItem--thread.*')):
-            link = thread.find_all('div', "structItem-title")[0].find_all("a")[-1]
-            if len(findall(r'\d+', link['href'])) < 1: continue
-
-            if len(thread.find_all('i', {'title': 'Закреплено'})) > 0: result['pins'].append(int(findall(r'\d+', link['href'])[0]))
-            else: result['unpins'].append(int(findall(r'\d+', link['href'])[0]))
-        
-        return result
+        return self._get_polled(('threads', category_id, page), f"{self.base_url}/forums/{category_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}", self.parser.parse_threads, json=True)
     
     def get_threads_extended(self, category_id: int, page: int = 1) -> list:
         """[NEW] Получить темы из раздела на странице, с дополнительной информацией о темах
@@ -285,63 +485,7 @@ class ArizonaAPI:
         Returns:
             Словарь (dict), состоящий из списков закрепленных ('pins') и незакрепленных ('unpins') тем
         """
-        request = self.session.get(f"{MAIN_URL}/forums/{category_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
-            return None
-
-        soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-        result = []
-        seen_thread_ids = set()
-        
-        for thread in soup.find_all('div', class_=compile('structItem structItem--thread.*')):
-            link = thread.find('div', "structItem-title").find_all("a")[-1]
-            thread_id = int(findall(r'\d+', link['href'])[0])
-            if thread_id in seen_thread_ids:
-                continue
-            seen_thread_ids.add(thread_id)
-
-            thread_data = {}
-            
-            username_author = thread.find('div', 'structItem-cell--main').find('div', 'structItem-minor').find('ul', 'structItem-parts').find('a', class_='username')
-            thread_data['username_author'] = username_author.text.strip() if username_author else None
-            
-            thread_data['thread_title'] = link.text.strip()
-            
-            prefix_label = thread.find('span', class_='label')
-            thread_data['prefix'] = prefix_label.text.strip() if prefix_label else None
-
-            if username_author:
-                for style in ROLE_COLOR:
-                    if style in str(username_author):
-                        thread_data['username_author_color'] = ROLE_COLOR[style]
-                        break
-                else:
-                    thread_data['username_author_color'] = '#fff'
-
-            created_date = thread.find('div', 'structItem-cell--main').find('div', 'structItem-minor').find('ul', 'structItem-parts').find('li', 'structItem-startDate').find('time', class_='u-dt').get('data-time')
-            thread_data['created_date'] = int(created_date) if created_date else None
-            
-            last_message_username = thread.find('div', 'structItem-cell--latest').find('div', 'structItem-minor').find(class_=compile('username'))
-            thread_data['username_last_message'] = last_message_username.text.strip() if last_message_username else None
-
-            if last_message_username:
-                for style in ROLE_COLOR:
-                    if style in str(last_message_username):
-                        thread_data['username_last_message_color'] = ROLE_COLOR[style]
-                        break
-                else:
-                    thread_data['username_last_message_color'] = '#fff'
-
-            last_message_date = thread.find('div', 'structItem-cell--latest').find('time', class_='structItem-latestDate').get('data-time')
-            thread_data['last_message_date'] = int(last_message_date) if last_message_date else None
-
-            thread_data['thread_id'] = thread_id
-            thread_data['is_pinned'] = len(thread.find_all('i', {'title': 'Закреплено'})) > 0
-            thread_data['is_closed'] = len(thread.find_all('i', {'title': 'Закрыта'})) > 0
-
-            result.append(thread_data)
-        
-        return result
+        return self._get_polled(('threads_extended', category_id, page), f"{self.base_url}/forums/{category_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}", self.parser.parse_threads_extended, json=True)
     
     def get_parent_category_of_category(self, category_id: int) -> Category:
         """Получить родительский раздел раздела
@@ -354,10 +498,10 @@ class ArizonaAPI:
             - Если не существует: None
         """
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/forums/{category_id}").content, 'lxml')
-        
-        parent_category_id = str(content.find('ul', {'class': 'p-breadcrumbs'}).find_all('li')[-1].find('a')['href'].split('/')[2])
-        if not parent_category_id.isdigit():
+        parent_category_id = self._cache_get('parent_category', category_id)
+        if parent_category_id is MISS:
+            parent_category_id = self._cache_set('parent_category', category_id, value=self.parser.parse_parent_category_id(self.session.get(f"{self.base_url}/forums/{category_id}").content))
+        if parent_category_id is None:
             return None
         
         return self.get_category(parent_category_id)
@@ -373,14 +517,60 @@ class ArizonaAPI:
             Список (list), состоящий из ID дочерних категорий раздела
         """
 
-        request = self.session.get(f"{MAIN_URL}/forums/{category_id}/page-1?_xfResponseType=json&_xfToken={self.token}").json()
+        request = loads(self.session.get(f"{self.base_url}/forums/{category_id}/page-1?_xfResponseType=json&_xfToken={self.token}").content)
         if request['status'] == 'error':
             return None
         
-        soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-        return [int(findall(r'\d+', category.find("a")['href'])[0]) for category in soup.find_all('div', compile('.*node--depth2 node--forum.*'))]
+        return self.parser.parse_categories(request)
     
 
+    def iter_category_threads(self, category_id: int, extended: bool = True, start_page: int = 1, prefetch: int = 2) -> Iterator[dict]:
+        """Обойти все темы раздела, начиная со страницы start_page
+
+        Темы отдаются по одной, пока в фоне загружаются следующие prefetch страниц
+
+        Attributes:
+            category_id (int): ID категории
+            extended (bool): Отдавать темы с дополнительной информацией (как get_threads_extended). По умолчанию True (необяз.)
+            start_page (int): Страница, с которой начинается обход. По умолчанию 1 (необяз.)
+            prefetch (int): Сколько страниц загружать заранее. По умолчанию 2 (необяз.)
+
+        Returns:
+            Генератор словарей (dict) с информацией о темах. При extended=False - словари с ключами 'thread_id' и 'is_pinned'
+        """
+
+        request = loads(self.session.get(f"{self.base_url}/forums/{category_id}/page-{start_page}?_xfResponseType=json&_xfToken={self.token}").content)
+        if request['status'] == 'error':
+            return
+
+        pages_count = self.parser.parse_category(request)['pages_count']
+        parse = self.parser.parse_threads_extended if extended else self.parser.parse_thread_records
+
+        def fetch(page: int) -> list | None:
+            request = loads(self.session.get(f"{self.base_url}/forums/{category_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").content)
+            return None if request['status'] == 'error' else parse(request)
+
+        executor = ThreadPoolExecutor(max(prefetch, 1))
+        try:
+            pages = iter(range(start_page + 1, pages_count + 1))
+            pending = deque(executor.submit(fetch, page) for page in islice(pages, prefetch))
+            records = parse(request)
+            while records is not None:
+                yield from records
+                if pending:
+                    records = pending.popleft().result()
+                    for page in islice(pages, 1):
+                        pending.append(executor.submit(fetch, page))
+                else:
+                    # prefetch=0 - без фоновой загрузки, следующая страница загружается здесь
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    records = fetch(page)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
     # MEMBER
     def follow_member(self, member_id: int) -> Response:
         """Изменить статус подписки на пользователя
@@ -395,7 +585,7 @@ class ArizonaAPI:
         if member_id == self.current_member.id:
             raise ThisIsYouError(member_id)
 
-        return self.session.post(f"{MAIN_URL}/members/{member_id}/follow", {'_xfToken': self.token})
+        return self.session.post(f"{self.base_url}/members/{member_id}/follow", {'_xfToken': self.token})
     
 
     def ignore_member(self, member_id: int) -> Response:
@@ -411,7 +601,7 @@ class ArizonaAPI:
         if member_id == self.current_member.id:
             raise ThisIsYouError(member_id)
 
-        return self.session.post(f"{MAIN_URL}/members/{member_id}/ignore", {'_xfToken': self.token})
+        return self.session.post(f"{self.base_url}/members/{member_id}/ignore", {'_xfToken': self.token})
     
 
     def add_profile_message(self, member_id: int, message_html: str) -> Response:
@@ -425,7 +615,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/members/{member_id}/post", {'_xfToken': self.token, 'message_html': message_html})
+        return self.session.post(f"{self.base_url}/members/{member_id}/post", {'_xfToken': self.token, 'message_html': message_html})
     
 
     def get_profile_messages(self, member_id: int, page: int = 1) -> list | None:
@@ -440,12 +630,55 @@ class ArizonaAPI:
             - None, если пользователя не существует / закрыл профиль
         """
 
-        request = self.session.get(f"{MAIN_URL}/members/{member_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").json()
+        request = loads(self.session.get(f"{self.base_url}/members/{member_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").content)
         if request['status'] == 'error':
             return None
         
-        soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-        return [int(post['id'].strip('js-profilePost-')) for post in soup.find_all('article', {'id': compile('js-profilePost-*')})]
+        return self.parser.parse_profile_messages(request)
+
+
+    def edit_avatar(self, upload_photo: str) -> Response:
+        """Изменить аватарку текущего пользователя
+
+        Attributes:
+            upload_photo (str): Относительный или полный путь до изображения
+        
+        Returns:
+            Объект Response модуля requests
+        """
+
+        with open(upload_photo, 'rb') as image:
+            file_dict = {'upload': (upload_photo, image.read())}
+
+        data = {
+            "avatar_crop_x": 0, 
+            "avatar_crop_y": 0,
+            "_xfToken": self.token, 
+            "use_custom": 1,
+        }
+        response = self.session.post(f"{self.base_url}/account/avatar", files=file_dict, data=data)
+        self._invalidate('member')
+        return response
+
+
+    def delete_avatar(self) -> Response:
+        """Удалить аватарку текущего пользователя
+        
+        Returns:
+            Объект Response модуля requests
+        """
+
+        file_dict = {'upload': ("", "")}
+        data = {
+            "avatar_crop_x": 0, 
+            "avatar_crop_y": 0,
+            "_xfToken": self.token, 
+            "use_custom": 1,
+            "delete_avatar": 1
+        }
+        response = self.session.post(f"{self.base_url}/account/avatar", files=file_dict, data=data)
+        self._invalidate('member')
+        return response
 
 
     # POST
@@ -460,7 +693,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f'{MAIN_URL}/posts/{post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
+        return self.session.post(f'{self.base_url}/posts/{post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
     
 
     def edit_post(self, post_id: int, message_html: str) -> Response:
@@ -474,9 +707,11 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        title_of_thread_post = self.get_post(post_id).thread.title
+        thread = self.get_post(post_id).thread
 
-        return self.session.post(f"{MAIN_URL}/posts/{post_id}/edit", {"title": title_of_thread_post, "message_html": message_html, "message": message_html, "_xfToken": self.token})
+        response = self.session.post(f"{self.base_url}/posts/{post_id}/edit", {"title": thread.title, "message_html": message_html, "message": message_html, "_xfToken": self.token})
+        self._invalidate_thread(thread.id)
+        return response
 
 
     def delete_post(self, post_id: int, reason: str, hard_delete: bool = False) -> Response:
@@ -491,7 +726,12 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
+        response = self.session.post(f"{self.base_url}/posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
+        # Тема сообщения неизвестна без лишнего запроса - сбрасываются все темы
+        self._invalidate('thread')
+        self._invalidate('thread_posts')
+        self._invalidate('thread_posts_full')
+        return response
     
 
     def bookmark_post(self, post_id: int) -> Response:
@@ -504,7 +744,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/posts/{post_id}/bookmark", {"_xfToken": self.token})
+        return self.session.post(f"{self.base_url}/posts/{post_id}/bookmark", {"_xfToken": self.token})
 
 
     # PROFILE POST
@@ -519,7 +759,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f'{MAIN_URL}/profile-posts/{post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
+        return self.session.post(f'{self.base_url}/profile-posts/{post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
 
 
     def comment_profile_post(self, post_id: int, message_html: str) -> Response:
@@ -533,7 +773,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/profile-posts/{post_id}/add-comment", {"message_html": message_html, "_xfToken": self.token})
+        return self.session.post(f"{self.base_url}/profile-posts/{post_id}/add-comment", {"message_html": message_html, "_xfToken": self.token})
 
 
     def delete_profile_post(self, post_id: int, reason: str, hard_delete: bool = False) -> Response:
@@ -548,7 +788,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/profile-posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
+        return self.session.post(f"{self.base_url}/profile-posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
     
 
     def edit_profile_post(self, post_id: int, message_html: str) -> Response:
@@ -562,7 +802,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/profile-posts/{post_id}/edit", {"message_html": message_html, "message": message_html, "_xfToken": self.token})
+        return self.session.post(f"{self.base_url}/profile-posts/{post_id}/edit", {"message_html": message_html, "message": message_html, "_xfToken": self.token})
 
 
     # THREAD
@@ -577,7 +817,9 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/threads/{thread_id}/add-reply", {'_xfToken': self.token, 'message_html': message_html})
+        response = self.session.post(f"{self.base_url}/threads/{thread_id}/add-reply", {'_xfToken': self.token, 'message_html': message_html})
+        self._invalidate_thread(thread_id)
+        return response
 
 
     def watch_thread(self, thread_id: int, email_subscribe: bool = False, stop: bool = False) -> Response:
@@ -592,7 +834,7 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/threads/{thread_id}/watch", {'_xfToken': self.token, 'stop': int(stop), 'email_subscribe': int(email_subscribe)})
+        return self.session.post(f"{self.base_url}/threads/{thread_id}/watch", {'_xfToken': self.token, 'stop': int(stop), 'email_subscribe': int(email_subscribe)})
     
 
     def delete_thread(self, thread_id: int, reason: str, hard_delete: bool = False) -> Response:
@@ -607,7 +849,10 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        return self.session.post(f"{MAIN_URL}/threads/{thread_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
+        response = self.session.post(f"{self.base_url}/threads/{thread_id}/delete", {"reason": reason, "hard_delete": int(hard_delete), "_xfToken": self.token})
+        self._invalidate_thread(thread_id)
+        self._invalidate('thread_category', thread_id)
+        return response
     
 
     def edit_thread(self, thread_id: int, message_html: str) -> Response:
@@ -621,9 +866,10 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-1").content, 'lxml')
-        thread_post_id = content.find('article', {'id': compile('js-post-*')})['id'].strip('js-post-')
-        return self.session.post(f"{MAIN_URL}/posts/{thread_post_id}/edit", {"message_html": message_html, "message": message_html, "_xfToken": self.token})
+        thread_post_id = self.parser.parse_first_post_id(self.session.get(f"{self.base_url}/threads/{thread_id}/page-1").content)
+        response = self.session.post(f"{self.base_url}/posts/{thread_post_id}/edit", {"message_html": message_html, "message": message_html, "_xfToken": self.token})
+        self._invalidate_thread(thread_id)
+        return response
     
 
     def edit_thread_info(self, thread_id: int, title: str, prefix_id: int = None, sticky: bool = True, opened: bool = True) -> Response:
@@ -646,7 +892,11 @@ class ArizonaAPI:
         if opened: data.update({"discussion_open": 1})
         if sticky: data.update({"sticky": 1})
 
-        return self.session.post(f"{MAIN_URL}/threads/{thread_id}/edit", data)
+        response = self.session.post(f"{self.base_url}/threads/{thread_id}/edit", data)
+        self._invalidate('thread', thread_id)
+        # страницы 'thread_posts_full' хранят и разобранную тему (заголовок, префикс)
+        self._invalidate('thread_posts_full', thread_id)
+        return response
     
 
     def get_thread_category(self, thread_id: int) -> Category:
@@ -658,62 +908,193 @@ class ArizonaAPI:
         Returns:
             Объект Catrgory, в котормо создана тема
         """
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-1").content, 'lxml')
-        
-        creator_id = content.find('a', {'class': 'username'})
-        if creator_id is None: return None
+        category_id = self._cache_get('thread_category', thread_id)
+        if category_id is MISS:
+            category_id = self._cache_set('thread_category', thread_id, value=self.parser.parse_thread_category_id(self.session.get(f"{self.base_url}/threads/{thread_id}/page-1").content))
+        if category_id is None: return None
         
-        return self.get_category(int(content.find('html')['data-container-key'].strip('node-')))
+        return self.get_category(category_id)
     
 
-    def get_thread_posts(self, thread_id: int, page: int = 1) -> list:
+    def get_thread_posts(self, thread_id: int, page: int = 1, full: bool = False) -> list:
         """Получить все сообщения из темы на странице
         
         Attributes:
             thread_id (int): ID темы
             page (int): Cтраница для поиска. По умолчанию 1 (необяз.)
+            full (bool): Вернуть объекты Post, разобранные из этой же страницы, без запроса на каждое сообщение. По умолчанию False (необяз.)
         
         Returns:
-            Список (list), состоящий из ID всех сообщений на странице
+            Список (list), состоящий из ID всех сообщений на странице (при full=True - из объектов Post)
         """
 
-        request = self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").json()
-        if request['status'] == 'error':
+        if full:
+            result = self._load_thread_posts_full(thread_id, page)
+            return self._make_posts(result, self._page_thread(thread_id, result), {}) if result is not None else None
+
+        result = self._load_thread_posts_page(thread_id, page)
+        return list(result[0]) if result is not None else None
+
+
+    def get_thread_page(self, thread_id: int, page: int = 1, thread: Thread = None, fresh: bool = False) -> tuple | None:
+        """[NEW] Сообщения страницы темы (объекты Post) вместе с количеством страниц темы
+
+        Attributes:
+            thread_id (int): ID темы
+            page (int): Страница. По умолчанию 1 (необяз.)
+            thread (Thread): Объект темы для сообщений, если он уже есть. По умолчанию берется из ответа 1 страницы или get_thread (необяз.)
+            fresh (bool): Загрузить страницу заново, минуя кэш ответов. По умолчанию False (необяз.)
+
+        Returns:
+            Пара (tuple) из списка объектов Post и количества страниц, либо None (тема не найдена / нет доступа)
+        """
+
+        if fresh:
+            self._invalidate('thread_posts_full', thread_id, page)
+        result = self._load_thread_posts_full(thread_id, page)
+        if result is None:
             return None
-        
-        soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-        return [i['id'].strip('js-post-') for i in soup.find_all('article', {'id': compile('js-post-*')})]
+        return self._make_posts(result, thread or self._page_thread(thread_id, result), {}), result[1]
+
+
+    def iter_thread_posts(self, thread_id: int, start_page: int = 1, prefetch: int = 2) -> Iterator[Post]:
+        """[NEW] Обойти все сообщения темы (объекты Post), начиная со страницы start_page
+
+        Сообщения разбираются прямо из страниц темы, пока в фоне загружаются следующие prefetch страниц.
+        Объект Thread общий для всех сообщений (с 1 страницы он берется из того же ответа), авторы - общие заглушки
+
+        Attributes:
+            thread_id (int): ID темы
+            start_page (int): Страница, с которой начинается обход. По умолчанию 1 (необяз.)
+            prefetch (int): Сколько страниц загружать заранее. По умолчанию 2 (необяз.)
+
+        Returns:
+            Генератор объектов Post в порядке сообщений в теме
+        """
+
+        result = self._load_thread_posts_full(thread_id, start_page)
+        if result is None:
+            return
+
+        thread, members = self._page_thread(thread_id, result), {}
+        executor = ThreadPoolExecutor(max(prefetch, 1))
+        try:
+            pages = iter(range(start_page + 1, result[1] + 1))
+            pending = deque(executor.submit(self._load_thread_posts_full, thread_id, page) for page in islice(pages, prefetch))
+            while result is not None:
+                yield from self._make_posts(result, thread, members)
+                if pending:
+                    result = pending.popleft().result()
+                    for page in islice(pages, 1):
+                        pending.append(executor.submit(self._load_thread_posts_full, thread_id, page))
+                else:
+                    # prefetch=0 - без фоновой загрузки, следующая страница загружается здесь
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    result = self._load_thread_posts_full(thread_id, page)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+    def _load_thread_posts_full(self, thread_id: int, page: int) -> tuple | None:
+        """Данные сообщений (tuple), количество страниц и данные темы (только на 1 странице) со страницы темы (None - ошибка)"""
+
+        result = self._cache_get('thread_posts_full', thread_id, page)
+        if result is MISS:
+            request = loads(self.session.get(f"{self.base_url}/threads/{thread_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").content)
+            if request['status'] == 'error':
+                return None
+
+            posts, pages_count = self.parser.parse_thread_posts_full(request, thread_id)
+            thread = None
+            if page == 1 and posts and request.get('redirect') is None:
+                thread = self._cache_set('thread', thread_id, value=self.parser.parse_thread(request))
+            result = self._cache_set('thread_posts_full', thread_id, page, value=(tuple(posts), pages_count, thread))
+        return result
+
+
+    def _page_thread(self, thread_id: int, result: tuple) -> Thread | None:
+        """Объект Thread для сообщений страницы: из ее же ответа на 1 странице, иначе get_thread (кэш)"""
+
+        return self._make_thread(thread_id, result[2], False) if result[2] is not None else self.get_thread(thread_id)
+
+
+    def _make_posts(self, result: tuple, thread: Thread, members: dict) -> list:
+        posts = []
+        for data in result[0]:
+            data = dict(data)
+            post_id, creator_id, creator_username = data.pop('id'), data.pop('creator_id'), data.pop('creator_username')
+            data.pop('thread_id')
+            creator = members.get(creator_id)
+            if creator is None:
+                creator = members[creator_id] = Member.stub(self, creator_id, creator_username)
+            posts.append(Post(self, post_id, creator, thread, **data))
+        return posts
     
-    def get_all_thread_posts(self, thread_id: int) -> list:
+    def _load_thread_posts_page(self, thread_id: int, page: int) -> tuple | None:
+        """ID сообщений (tuple) и количество страниц темы на странице (None - ошибка)"""
+
+        result = self._cache_get('thread_posts', thread_id, page)
+        if result is MISS:
+            request = loads(self.session.get(f"{self.base_url}/threads/{thread_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").content)
+            if request['status'] == 'error':
+                return None
+
+            posts, pages_count = self.parser.parse_thread_posts_page(request)
+            result = self._cache_set('thread_posts', thread_id, page, value=(tuple(posts), pages_count))
+        return result
+
+    def _get_thread_posts_page(self, thread_id: int, page: int) -> tuple | None:
+        """ID сообщений и количество страниц темы на странице (None - ошибка / пустая страница)"""
+
+        result = self._load_thread_posts_page(thread_id, page)
+        return (list(result[0]), result[1]) if result is not None and result[0] else None
+
+
+    def get_all_thread_posts(self, thread_id: int, max_workers: int = 8, stream: bool = False) -> list | Iterator[tuple]:
         """[NEW] Получить все сообщения из темы на всех страницах треда
 
+        Количество страниц берется с первой страницы, остальные загружаются параллельно
+
         Attributes:
             thread_id (int): ID темы
+            max_workers (int): Количество потоков для загрузки страниц. По умолчанию 8 (необяз.)
+            stream (bool): Вернуть генератор пар (номер страницы, список ID) в порядке загрузки страниц. По умолчанию False (необяз.)
 
         Returns:
-            Список (list), состоящий из ID всех сообщений в теме
+            - Список (list), состоящий из ID всех сообщений в теме (в порядке страниц)
+            - Генератор пар (страница, список ID), если stream=True
         """
-        all_posts = []
-        page = 1
-        while True:
-            request = self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-{page}?_xfResponseType=json&_xfToken={self.token}").json()
-            if request['status'] == 'error':
-                break
-            soup = BeautifulSoup(unescape(request['html']['content']), "lxml")
-            posts = [i['id'].strip('js-post-') for i in soup.find_all('article', {'id': compile('js-post-*')})]
-            if not posts:
-                break
-            all_posts.extend(posts)
-            if page == 1:
-                try:
-                    pages_count = int(soup.find('ul', {'class': 'pageNav-main'}).find_all('li', {'class': 'pageNav-page'})[-1].text)
-                except:
-                    pages_count = 1
-            if page >= pages_count:
-                break
-            page += 1
+
+        first_page = self._get_thread_posts_page(thread_id, 1)
+        pages = range(2, first_page[1] + 1) if first_page is not None else range(0)
+        if stream:
+            return self._stream_thread_posts(thread_id, first_page, pages, max_workers)
+
+        all_posts = list(first_page[0]) if first_page is not None else []
+        with ThreadPoolExecutor(max_workers) as executor:
+            for page in executor.map(lambda page: self._get_thread_posts_page(thread_id, page), pages):
+                if page is not None:
+                    all_posts.extend(page[0])
         return all_posts
 
+
+    def _stream_thread_posts(self, thread_id: int, first_page: tuple | None, pages: range, max_workers: int) -> Iterator[tuple]:
+        if first_page is None:
+            return
+        yield 1, first_page[0]
+
+        executor = ThreadPoolExecutor(max_workers)
+        try:
+            futures = {executor.submit(self._get_thread_posts_page, thread_id, page): page for page in pages}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    yield futures[future], result[0]
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def react_thread(self, thread_id: int, reaction_id: int = 1) -> Response:
         """Поставить реакцию на тему
 
@@ -725,9 +1106,8 @@ class ArizonaAPI:
             Объект Response модуля requests
         """
 
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/threads/{thread_id}/page-1").content, 'lxml')
-        thread_post_id = content.find('article', {'id': compile('js-post-*')})['id'].strip('js-post-')
-        return self.session.post(f'{MAIN_URL}/posts/{thread_post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
+        thread_post_id = self.parser.parse_first_post_id(self.session.get(f"{self.base_url}/threads/{thread_id}/page-1").content)
+        return self.session.post(f'{self.base_url}/posts/{thread_post_id}/react?reaction_id={reaction_id}', {'_xfToken': self.token})
 
 
     # OTHER
@@ -743,55 +1123,11 @@ class ArizonaAPI:
         """
 
         data.update({'_xfToken': self.token})
-        return self.session.post(f"{MAIN_URL}/form/{form_id}/submit", data)
+        return self.session.post(f"{self.base_url}/form/{form_id}/submit", data)
 
     def get_notifications(self) -> list:
         """Получить список уведомлений с детальной информацией"""
-        content = BeautifulSoup(self.session.get(f"{MAIN_URL}/account/alerts").content, 'lxml')
-        notifications = []
-        
-        for alert in content.find_all('li', {'class': 'js-alert'}):
-            if not alert.has_attr('data-alert-id'):
-                continue
-                
-            sender = None
-            username_link = alert.find('a', {'class': 'username'})
-            if username_link:
-                sender = {
-                    'id': int(username_link.get('data-user-id', 0)),
-                    'name': username_link.get_text(strip=True),
-                    'avatar': None,
-                    'avatar_color': None,
-                    'initials': None
-                }
-                
-                avatar_img = alert.find('img', {'class': 'avatar'})
-                avatar_span = alert.find('span', {'class': 'avatar-u'})
-                
-                if avatar_img and avatar_img.has_attr('src'):
-                    sender['avatar'] = avatar_img['src']
-                elif avatar_span:
-                    sender['avatar_color'] = avatar_span.get('style') 
-                    sender['initials'] = avatar_span.get_text(strip=True) if avatar_span else None
-
-            time_tag = alert.find('time')
-            timestamp = {
-                'iso': time_tag['datetime'] if time_tag else None,
-                'unix': int(time_tag['data-time']) if time_tag and time_tag.has_attr('data-time') else None
-            } if time_tag else None
-
-            alert_data = {
-                'id': alert['data-alert-id'],
-                'is_unread': 'is-unread' in alert.get('class', []),
-                'text': alert.find('div', {'class': 'contentRow-main'}).get_text(strip=True) if alert.find('div', {'class': 'contentRow-main'}) else None,
-                'link': alert.find('a', {'class': 'fauxBlockLink-blockLink'})['href'] if alert.find('a', {'class': 'fauxBlockLink-blockLink'}) else None,
-                'sender': sender,
-                'timestamp': timestamp
-            }
-            
-            notifications.append(alert_data)
-            
-        return notifications
+        return self._get_polled(('notifications',), f"{self.base_url}/account/alerts", self.parser.parse_notifications)
 
     def search_threads(self, query: str, sort: str = 'relevance') -> list:
         """Поиск тем по форуму с заданными параметрами
@@ -803,30 +1139,8 @@ class ArizonaAPI:
         Returns:
             Список словарей с информацией о найденных темах
         """
-        url = f"{MAIN_URL}/search/24587779/?q={query}&o={sort}"
-        content = BeautifulSoup(self.session.get(url).content, 'lxml')
-        results = []
-        
-        for thread in content.find_all('li', {'class': 'block-row'}):
-            title_link = thread.find('h3', {'class': 'contentRow-title'}).find('a')
-            date_tag = thread.find('time', {'class': 'u-dt'})
-            answers_tag = thread.find(text=compile('Ответы: '))
-            
-            thread_data = {
-                'title': title_link.text.strip().split('| Причина:')[0].strip(),
-                'status': thread.find('span', {'class': 'label'}).text if thread.find('span', {'class': 'label'}) else None,
-                'author': thread['data-author'],
-                'thread_id': int(title_link['href'].split('/')[-2]),
-                'create_date': int(date_tag['data-time']) if date_tag else None,
-                'answers_count': int(answers_tag.split(': ')[1]) if answers_tag else 0,
-                'forum': thread.find('a', href=compile('/forums/')).text if thread.find('a', href=compile('/forums/')) else None,
-                'snippet': thread.find('div', {'class': 'contentRow-snippet'}).text.strip() if thread.find('div', {'class': 'contentRow-snippet'}) else None,
-                'url': MAIN_URL + title_link['href']
-            }
-            
-            results.append(thread_data)
-            
-        return results
+        url = f"{self.base_url}/search/24587779/?q={query}&o={sort}"
+        return self.parser.parse_search_results(self.session.get(url).content)
     
     def mark_notifications_read(self, alert_ids: list[int]) -> Response:
         """Пометить уведомления как прочитанные"""
@@ -838,7 +1152,7 @@ class ArizonaAPI:
         }
         
         return self.session.post(
-            f"{MAIN_URL}/account/alert-toggle",
+            f"{self.base_url}/account/alert-toggle",
             data=data
         )
     
@@ -860,11 +1174,11 @@ class ArizonaAPI:
         }
             
         response = self.session.get(
-            f"{MAIN_URL}/posts/{post_id}/edit",
+            f"{self.base_url}/posts/{post_id}/edit",
             params=params
         )
             
-        html_content = response.json().get('html', {}).get('content', '')
+        html_content = loads(response.content).get('html', {}).get('content', '')
         
         if not html_content:
             return ''
@@ -877,7 +1191,7 @@ class ArizonaAPI:
             'html': html_content
         }
         response = self.session.post(
-            f"{MAIN_URL}/index.php?editor/to-bb-code",
+            f"{self.base_url}/index.php?editor/to-bb-code",
             data=data
         )
-        return response.json().get('bbCode', '')
\ No newline at end of file
+        return loads(response.content).get('bbCode', '')
\ No newline at end of file
@@ -0,0 +1,967 @@
+from asyncio import FIRST_COMPLETED, Semaphore, TimeoutError as WaitTimeout, create_task, gather, sleep as async_sleep, wait
+from collections import deque
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterable
+
+from aiohttp import ClientConnectionError, ClientPayloadError, ClientSession, CookieJar, FormData, TCPConnector
+from aiohttp_socks import ProxyConnector
+from yarl import URL
+
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.bypass_antibot import bypass_async, is_challenge, refresh, CookieStore, default_store
+from arz_api_extended.cache import ResponseCache, ConditionalCache, MISS, fingerprint
+from arz_api_extended.csrf import TokenManager, is_security_error
+from arz_api_extended.ratelimit import RateLimiter
+from arz_api_extended.retry import RetryPolicy
+
+from arz_api_extended.exceptions import IncorrectLoginData, ThisIsYouError
+from arz_api_extended.parsers import get_parser
+from arz_api_extended.parsers.payload import loads, page_content
+from arz_api_extended.models.other import Statistic
+from arz_api_extended.models.post_object import Post, ProfilePost
+from arz_api_extended.models.member_object import Member, CurrentMember
+from arz_api_extended.models.thread_object import Thread
+from arz_api_extended.models.category_object import Category
+
+
+def _replace_form_token(data, token: str):
+    """Подставить новый _xfToken в данные запроса (dict, список пар или partial(фабрика формы, ..., token=...))"""
+
+    if isinstance(data, partial):
+        return partial(data, token=token) if 'token' in data.keywords else None
+    if isinstance(data, dict):
+        return {**data, '_xfToken': token} if '_xfToken' in data else None
+    if isinstance(data, list) and any(key == '_xfToken' for key, _ in data):
+        return [(key, token if key == '_xfToken' else value) for key, value in data]
+    return None
+
+
+def _avatar_form(content: bytes, filename: str, token: str, delete: bool = False) -> FormData:
+    form = FormData()
+    form.add_field('upload', content, filename=filename)
+    fields = (("avatar_crop_x", 0), ("avatar_crop_y", 0), ("_xfToken", token), ("use_custom", 1))
+    for key, value in fields + ((("delete_avatar", 1),) if delete else ()):
+        form.add_field(key, str(value))
+    return form
+
+
+class AsyncResponse:
+    """Прочитанный ответ форума (тело уже загружено, соединение возвращено в пул)"""
+
+    def __init__(self, status: int, url: str, headers: dict, content: bytes) -> None:
+        self.status = status
+        """**Код ответа**"""
+        self.url = url
+        self.headers = headers
+        self.content = content
+        """**Тело ответа (bytes)**"""
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(errors="replace")
+
+    def json(self) -> dict:
+        return loads(self.content)
+
+
+class AsyncArizonaAPI:
+    """Асинхронный клиент форума на aiohttp. Методы повторяют ArizonaAPI, но являются корутинами
+    и возвращают те же объекты models (методы моделей тоже возвращают корутины)
+
+    Attributes:
+        user_agent (str): User-Agent браузера
+        cookie (dict): Cookie авторизованного пользователя
+        do_bypass (bool): Обходить ли анти-бот. По умолчанию True (необяз.)
+        token_ttl (float): Время жизни CSRF токена в кэше. По умолчанию 3600 (необяз.)
+        cookie_store (CookieStore): Хранилище cookie анти-бота (необяз.)
+        proxy (str): Прокси в формате URL (socks5://..., http://...) (необяз.)
+        limit (int): Максимальное количество одновременных соединений. По умолчанию 100 (необяз.)
+        limit_per_host (int): Максимальное количество соединений к одному хосту. По умолчанию 10 (необяз.)
+        cache (ResponseCache): Кэш разобранных ответов. По умолчанию без кэша (необяз.)
+        conditional (ConditionalCache): Условные запросы для опрашиваемых страниц. По умолчанию выключены (необяз.)
+        parser (str): Бэкенд разбора страниц: 'lxml' (по умолчанию) или 'soup' (необяз.)
+        base_url (str): Адрес форума, например локальный тестовый сервер. По умолчанию MAIN_URL (необяз.)
+        rate_limiter (RateLimiter): Ограничение частоты и количества одновременных запросов. По умолчанию выключено (необяз.)
+        retry (RetryPolicy): Повтор запросов при 5xx / 429 / обрыве соединения / анти-боте. По умолчанию без повторов (необяз.)
+
+    Пример:
+        async with AsyncArizonaAPI(user_agent, cookie) as api:
+            member = await api.get_member(1)
+    """
+
+    def __init__(self, user_agent: str, cookie: dict, do_bypass: bool = True, token_ttl: float = 3600, cookie_store: CookieStore = default_store, proxy: str = "", limit: int = 100, limit_per_host: int = 10, cache: ResponseCache = None, conditional: ConditionalCache = None, parser: str = 'lxml', base_url: str = MAIN_URL, rate_limiter: RateLimiter = None, retry: RetryPolicy = None) -> None:
+        self.user_agent = user_agent
+        self.cookie = cookie
+        self.base_url = base_url.rstrip('/')
+        self.do_bypass = do_bypass
+        self.proxy = proxy
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.session: ClientSession = None
+
+        self.token_manager = TokenManager(token_ttl)
+        """Кэш CSRF токена (token_manager.fetches_avoided - сколько запросов за токеном удалось избежать)"""
+        self.cookie_store = cookie_store
+        """Хранилище cookie анти-бота (MemoryCookieStore, FileCookieStore или None)"""
+        self.cache = cache
+        """Кэш разобранных ответов (ResponseCache или None - без кэша). Статистика: cache.stats"""
+        self.conditional = conditional
+        """Условные запросы для опрашиваемых страниц (ConditionalCache или None). Статистика: conditional.stats"""
+        self.parser = get_parser(parser)
+        """Бэкенд разбора страниц ('lxml' - быстрый, 'soup' - эталонный на BeautifulSoup)"""
+        self.rate_limiter = rate_limiter
+        """Ограничение частоты запросов (RateLimiter или None). Статистика ожидания: rate_limiter.stats"""
+        self.retry = retry
+        """Повтор запросов при 5xx / 429 / обрыве соединения / анти-боте (RetryPolicy или None). Статистика: retry.stats"""
+
+
+    async def start(self) -> 'AsyncArizonaAPI':
+        """Открыть сессию, обойти анти-бот и проверить авторизацию"""
+
+        if len(self.proxy) > 1:
+            connector = ProxyConnector.from_url(self.proxy, limit=self.limit, limit_per_host=self.limit_per_host)
+        else:
+            connector = TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+        # unsafe=True - чтобы cookie анти-бота сохранялась и для base_url с IP адресом (локальный сервер)
+        self.session = ClientSession(connector=connector, headers={"user-agent": self.user_agent}, cookies=self.cookie, cookie_jar=CookieJar(unsafe=True))
+
+        if self.do_bypass:
+            try:
+                cookie, _ = await bypass_async(self.user_agent, self.proxy, self.cookie_store, url=f"{self.base_url}/", retry=self.retry, limiter=self.rate_limiter)
+            except Exception:
+                await self.logout()
+                raise
+            self._set_cookie(cookie)
+
+        response = await self._request('GET', self.base_url)
+        if is_challenge(response.content):
+            response = await self._request('GET', self.base_url)
+
+        if not self.parser.parse_logged_in(response.content):
+            await self.logout()
+            raise IncorrectLoginData
+        return self
+
+
+    async def __aenter__(self) -> 'AsyncArizonaAPI':
+        return await self.start()
+
+
+    async def __aexit__(self, *args) -> None:
+        await self.logout()
+
+
+    async def logout(self) -> None:
+        """Закрыть сессию"""
+
+        if self.session is not None:
+            await self.session.close()
+
+
+    def _set_cookie(self, cookie: str) -> None:
+        name, code = cookie.split('=')
+        self.session.cookie_jar.update_cookies({name: code}, URL(self.base_url))
+
+
+    async def _request(self, method: str, url: str, _retry: bool = True, **kwargs) -> AsyncResponse:
+        """Выполнить запрос, прочитать тело и обработать CSRF токен / страницу анти-бота"""
+
+        response = await self._send(method, url, **kwargs)
+        content = response.content
+        if is_challenge(content):
+            return response
+
+        if not is_security_error(response.status, content) or not _retry:
+            self.token_manager.harvest(content)
+            return response
+
+        self.token_manager.invalidate()
+        token = await self.get_token()
+        for key in ('data', 'params'):
+            replaced = _replace_form_token(kwargs.get(key), token)
+            if replaced is not None:
+                kwargs[key] = replaced
+                return await self._request(method, url, _retry=False, **kwargs)
+        return response
+
+
+    async def _send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        """Отправить запрос с учетом rate_limiter и повторить его по self.retry.
+        На странице анти-бота cookie решается заново, а запрос повторяется (если есть self.retry)"""
+
+        policy = self.retry
+        attempt = challenges = 0
+        # FormData нельзя отправить дважды, поэтому multipart форма передается фабрикой и собирается для каждой попытки
+        data = kwargs.get('data')
+        while True:
+            if callable(data):
+                kwargs['data'] = data()
+            try:
+                async with self._limit(method, url), self.session.request(method, url, **kwargs) as response:
+                    response = AsyncResponse(response.status, str(response.url), response.headers, await response.read())
+            except (ClientConnectionError, ClientPayloadError, WaitTimeout):
+                delay = policy.retry_error(method, attempt) if policy is not None else None
+                if delay is None:
+                    raise
+            else:
+                if is_challenge(response.content):
+                    self._set_cookie(refresh(response.text, self.user_agent, self.cookie_store, self.proxy))
+                    if policy is None:
+                        return response
+                    policy.retry_challenge(url, challenges)
+                    challenges += 1
+                    continue
+
+                delay = policy.retry_response(method, url, response.status, response.headers, attempt) if policy is not None else None
+                if delay is None:
+                    return response
+
+            await async_sleep(delay)
+            attempt += 1
+
+
+    def _limit(self, method: str, url: str):
+        return self.rate_limiter.limit_async(method, url) if self.rate_limiter is not None else nullcontext()
+
+
+    async def _get(self, url: str, **kwargs) -> bytes:
+        return (await self._request('GET', url, **kwargs)).content
+
+
+    async def _get_json(self, url: str) -> dict:
+        return loads(await self._get(url, params={'_xfResponseType': 'json', '_xfToken': await self.get_token()}))
+
+
+    async def _post(self, url: str, data=None, **kwargs) -> AsyncResponse:
+        if data is None:
+            data = {}
+        if isinstance(data, dict):
+            data = {'_xfToken': await self.get_token(), **data}
+        return await self._request('POST', url, data=data, **kwargs)
+
+
+    def _cache_get(self, endpoint: str, *key):
+        return self.cache.get(endpoint, *key) if self.cache is not None else MISS
+
+
+    def _cache_set(self, endpoint: str, *key, value):
+        if self.cache is not None:
+            self.cache.set(endpoint, *key, value=value)
+        return value
+
+
+    def _invalidate(self, endpoint: str, *key) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(endpoint, *key)
+
+
+    async def _get_polled(self, key: tuple, url: str, parse, json: bool = False):
+        """GET опрашиваемой страницы с условными заголовками и пропуском разбора неизмененной страницы"""
+
+        conditional = self.conditional
+        kwargs = {'params': {'_xfResponseType': 'json', '_xfToken': await self.get_token()}} if json else {}
+        response = await self._request('GET', url, headers=conditional.headers(key) if conditional is not None else None, **kwargs)
+        if conditional is not None and response.status == 304:
+            result = conditional.get_not_modified(key)
+            if result is not MISS:
+                return result
+            # запись вытеснили после того, как были отправлены условные заголовки - загружаем страницу заново
+            response = await self._request('GET', url, **kwargs)
+
+        data = response.json() if json else response.content
+        if json and data['status'] == 'error':
+            return None
+        if conditional is None:
+            return parse(data)
+
+        digest = fingerprint(page_content(data).encode() if json else data)
+        result = conditional.get_unchanged(key, digest)
+        if result is MISS:
+            result = conditional.set(key, response.headers, digest, parse(data))
+        return result
+
+
+    def _invalidate_thread(self, thread_id: int) -> None:
+        self._invalidate('thread', thread_id)
+        self._invalidate('thread_posts', thread_id)
+        self._invalidate('thread_posts_full', thread_id)
+
+
+    async def get_token(self) -> str:
+        """Получить токен CSRF (из кэша, либо запросом к /help/terms/)"""
+
+        async def fetch() -> bytes:
+            return (await self._send('GET', f"{self.base_url}/help/terms/")).content
+
+        return await self.token_manager.get_async(fetch)
+
+
+    async def get_current_member(self) -> CurrentMember:
+        """Объект текущего пользователя"""
+
+        user_id = self.parser.parse_current_user_id(await self._get(f"{self.base_url}/account"))
+        member_info = await self.get_member(user_id)
+
+        return CurrentMember(self, user_id, member_info.username, member_info.user_title, member_info.avatar, member_info.roles, member_info.messages_count, member_info.reactions_count, member_info.trophies_count, member_info.username_color)
+
+
+    async def get_category(self, category_id: int) -> Category:
+        """Найти раздел по ID"""
+
+        data = self._cache_get('category', category_id)
+        if data is MISS:
+            request = await self._get_json(f"{self.base_url}/forums/{category_id}")
+            if request['status'] == 'error':
+                return None
+            data = self._cache_set('category', category_id, value=self.parser.parse_category(request))
+
+        return Category(self, category_id, **data)
+
+
+    async def get_member(self, user_id: int) -> Member:
+        """Найти пользователя по ID (возвращает либо Member, либо None (если профиль закрыт / не существует))"""
+
+        data = self._cache_get('member', user_id)
+        if data is MISS:
+            request = await self._get_json(f"{self.base_url}/members/{user_id}")
+            if request['status'] == 'error':
+                return None
+            data = self._cache_set('member', user_id, value=self.parser.parse_member(request, user_id))
+
+        return Member(self, **data)
+
+
+    async def get_members(self, user_ids: Iterable[int], max_concurrency: int = 8, on_error: Callable = None) -> dict:
+        """Найти пользователей по списку ID (повторы загружаются один раз, профили - параллельно)
+
+        Returns:
+            Словарь (dict) ID -> Member или None в порядке user_ids. on_error(user_id, исключение) - как в ArizonaAPI.get_members
+        """
+
+        user_ids = list(dict.fromkeys(user_ids))
+        members = {user_id: member async for user_id, member in self.iter_members(user_ids, max_concurrency, on_error)}
+        return {user_id: members[user_id] for user_id in user_ids}
+
+
+    async def iter_members(self, user_ids: Iterable[int], max_concurrency: int = 8, on_error: Callable = None) -> AsyncIterator[tuple]:
+        """Загружать пользователей по списку ID (асинхронный генератор пар (ID, Member или None) в порядке загрузки),
+        не больше max_concurrency запросов одновременно, токен CSRF запрашивается один раз"""
+
+        user_ids = iter(dict.fromkeys(user_ids))
+        await self.get_token()
+
+        async def fetch(user_id: int) -> tuple:
+            try:
+                return user_id, await self.get_member(user_id)
+            except Exception as error:
+                if on_error is None:
+                    raise
+                return user_id, on_error(user_id, error)
+
+        pending = {create_task(fetch(user_id)) for user_id in islice(user_ids, max_concurrency)}
+        try:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                pending.update(create_task(fetch(user_id)) for user_id in islice(user_ids, len(done)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+    async def hydrate_member(self, member: Member) -> Member:
+        """Загрузить поля профиля заглушки Member (если профиль закрыт, поля остаются None)"""
+
+        try: info = await self.get_member(member.id)
+        except Exception: info = None
+        member._fill(info)
+        return member
+
+
+    async def _hydrate_members(self, members: list, max_concurrency: int) -> None:
+        info = await self.get_members((member.id for member in members), max_concurrency, on_error=lambda user_id, error: None)
+        for member in members:
+            member._fill(info[member.id])
+
+
+    async def _get_member_stub(self, user_id: int, username: str, hydrate: bool) -> Member:
+        member = Member.stub(self, user_id, username)
+        return await self.hydrate_member(member) if hydrate else member
+
+
+    async def get_thread(self, thread_id: int, hydrate: bool = False) -> Thread:
+        """Найти тему по ID. hydrate=True - сразу загрузить профиль автора"""
+
+        data = self._cache_get('thread', thread_id)
+        if data is MISS:
+            request = await self._get_json(f"{self.base_url}/threads/{thread_id}/page-1")
+            if request['status'] == 'error':
+                return None
+
+            if request.get('redirect') is not None:
+                return await self.get_thread(request['redirect'].strip(self.base_url).split('/')[1], hydrate)
+            data = self._cache_set('thread', thread_id, value=self.parser.parse_thread(request))
+
+        return await self._make_thread(thread_id, data, hydrate)
+
+
+    async def _make_thread(self, thread_id: int, data: dict, hydrate: bool) -> Thread:
+        data = dict(data)
+        creator = await self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+
+        return Thread(self, thread_id, creator, **data)
+
+
+    async def get_threads_by_id(self, thread_ids: Iterable[int], hydrate: bool = False, max_concurrency: int = 8) -> dict:
+        """Найти темы по списку ID (повторы загружаются один раз, не больше max_concurrency запросов одновременно)
+
+        Returns:
+            Словарь (dict) ID -> Thread или None в порядке thread_ids. hydrate=True - профили авторов (каждый - один раз)
+        """
+
+        thread_ids = list(dict.fromkeys(thread_ids))
+        await self.get_token()
+
+        semaphore = Semaphore(max_concurrency)
+        async def fetch(thread_id: int) -> Thread | None:
+            async with semaphore:
+                return await self.get_thread(thread_id)
+
+        threads = dict(zip(thread_ids, await gather(*(fetch(thread_id) for thread_id in thread_ids))))
+        if hydrate:
+            await self._hydrate_members([thread.creator for thread in threads.values() if thread is not None], max_concurrency)
+        return threads
+
+
+    async def get_post(self, post_id: int, hydrate: bool = False) -> Post:
+        """Найти пост по ID (Post если существует, None - удален / нет доступа). hydrate=True - сразу загрузить профили пользователей"""
+
+        data = self.parser.parse_post(await self._get(f"{self.base_url}/posts/{post_id}"), post_id)
+        if data is None:
+            return None
+
+        creator = await self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+
+        thread = await self.get_thread(data.pop('thread_id'), hydrate)
+        return Post(self, post_id, creator, thread, **data)
+
+
+    async def get_posts(self, post_ids: Iterable[int], hydrate: bool = False, max_concurrency: int = 1) -> dict:
+        """Найти сообщения по списку ID, разбирая все запрошенные сообщения страницы темы из одного ответа
+        (подробнее - ArizonaAPI.get_posts)
+
+        Returns:
+            Словарь (dict) ID -> Post или None (удалено / нет доступа) в порядке post_ids
+        """
+
+        post_ids = [int(post_id) for post_id in dict.fromkeys(post_ids)]
+        wanted, found = set(post_ids), {}
+        remaining = deque(sorted(wanted))
+        await self.get_token()
+
+        async def fetch(post_id: int) -> tuple:
+            return post_id, self.parser.parse_posts(await self._get(f"{self.base_url}/posts/{post_id}"))
+
+        pending = set()
+        try:
+            while remaining or pending:
+                while remaining and len(pending) < max_concurrency:
+                    post_id = remaining.popleft()
+                    if post_id not in found:
+                        pending.add(create_task(fetch(post_id)))
+                if not pending:
+                    break
+
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    post_id, page = task.result()
+                    found.update((key, data) for key, data in page.items() if key in wanted)
+                    found.setdefault(post_id, None)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        threads = await self.get_threads_by_id({data['thread_id'] for data in found.values() if data is not None}, max_concurrency=max(max_concurrency, 8))
+        posts, members = {}, {}
+        for post_id in post_ids:
+            data = found.get(post_id)
+            if data is None:
+                posts[post_id] = None
+                continue
+
+            data = dict(data)
+            creator_id, creator_username = data.pop('creator_id'), data.pop('creator_username')
+            creator = members.setdefault(creator_id, Member.stub(self, creator_id, creator_username))
+            posts[post_id] = Post(self, post_id, creator, threads[data.pop('thread_id')], **data)
+
+        if hydrate:
+            await self._hydrate_members([*members.values(), *(thread.creator for thread in threads.values() if thread is not None)], max(max_concurrency, 8))
+        return posts
+
+
+    async def get_profile_post(self, post_id: int, hydrate: bool = False) -> ProfilePost:
+        """Найти сообщение профиля по ID. hydrate=True - сразу загрузить профили пользователей"""
+
+        data = self.parser.parse_profile_post(await self._get(f"{self.base_url}/profile-posts/{post_id}"), post_id)
+        if data is None:
+            return None
+
+        creator = await self._get_member_stub(data.pop('creator_id'), data.pop('creator_username'), hydrate)
+        profile = await self._get_member_stub(data.pop('profile_id'), data.pop('profile_username'), hydrate)
+        return ProfilePost(self, post_id, creator, profile, **data)
+
+
+    async def get_forum_statistic(self, hydrate: bool = False) -> Statistic:
+        """Получить статистику форума. hydrate=True - сразу загрузить профиль последнего зарегистрированного"""
+
+        data = self.parser.parse_forum_statistic(await self._get(self.base_url))
+        last_register_member = await self._get_member_stub(data.pop('last_register_member_id'), data.pop('last_register_member_username'), hydrate)
+
+        return Statistic(self, last_register_member=last_register_member, **data)
+
+
+    # CATEGORY
+    async def create_thread(self, category_id: int, title: str, message_html: str, discussion_type: str = 'discussion', watch_thread: bool = True) -> AsyncResponse:
+        """Создать тему в категории"""
+
+        response = await self._post(f"{self.base_url}/forums/{category_id}/post-thread?inline-mode=1", {'title': title, 'message_html': message_html, 'discussion_type': discussion_type, 'watch_thread': int(watch_thread)})
+        self._invalidate('category', category_id)
+        return response
+
+
+    async def set_read_category(self, category_id: int) -> AsyncResponse:
+        """Отметить категорию как прочитанную"""
+
+        return await self._post(f"{self.base_url}/forums/{category_id}/mark-read")
+
+
+    async def watch_category(self, category_id: int, notify: str, send_alert: bool = True, send_email: bool = False, stop: bool = False) -> AsyncResponse:
+        """Настроить отслеживание категории"""
+
+        if stop: return await self._post(f"{self.base_url}/forums/{category_id}/watch", {'stop': "1"})
+        else: return await self._post(f"{self.base_url}/forums/{category_id}/watch", {'send_alert': int(send_alert), 'send_email': int(send_email), 'notify': notify})
+
+
+    async def get_threads(self, category_id: int, page: int = 1) -> dict:
+        """Получить темы из раздела: словарь (dict) со списками закрепленных ('pins') и незакрепленных ('unpins') тем"""
+
+        return await self._get_polled(('threads', category_id, page), f"{self.base_url}/forums/{category_id}/page-{page}", self.parser.parse_threads, json=True)
+
+
+    async def get_threads_extended(self, category_id: int, page: int = 1) -> list:
+        """Получить темы из раздела на странице, с дополнительной информацией о темах"""
+
+        return await self._get_polled(('threads_extended', category_id, page), f"{self.base_url}/forums/{category_id}/page-{page}", self.parser.parse_threads_extended, json=True)
+
+
+    async def get_parent_category_of_category(self, category_id: int) -> Category:
+        """Получить родительский раздел раздела"""
+
+        parent_category_id = self._cache_get('parent_category', category_id)
+        if parent_category_id is MISS:
+            parent_category_id = self._cache_set('parent_category', category_id, value=self.parser.parse_parent_category_id(await self._get(f"{self.base_url}/forums/{category_id}")))
+        if parent_category_id is None:
+            return None
+
+        return await self.get_category(parent_category_id)
+
+
+    async def get_categories(self, category_id: int) -> list:
+        """Получить ID дочерних категорий из раздела"""
+
+        request = await self._get_json(f"{self.base_url}/forums/{category_id}/page-1")
+        if request['status'] == 'error':
+            return None
+
+        return self.parser.parse_categories(request)
+
+
+    async def iter_category_threads(self, category_id: int, extended: bool = True, start_page: int = 1, prefetch: int = 2) -> AsyncIterator[dict]:
+        """Обойти все темы раздела (асинхронный генератор), загружая заранее следующие prefetch страниц"""
+
+        request = await self._get_json(f"{self.base_url}/forums/{category_id}/page-{start_page}")
+        if request['status'] == 'error':
+            return
+
+        pages_count = self.parser.parse_category(request)['pages_count']
+        parse = self.parser.parse_threads_extended if extended else self.parser.parse_thread_records
+
+        async def fetch(page: int) -> list | None:
+            request = await self._get_json(f"{self.base_url}/forums/{category_id}/page-{page}")
+            return None if request['status'] == 'error' else parse(request)
+
+        pages = iter(range(start_page + 1, pages_count + 1))
+        pending = deque(create_task(fetch(page)) for page in islice(pages, prefetch))
+        try:
+            records = parse(request)
+            while records is not None:
+                for record in records:
+                    yield record
+                if pending:
+                    records = await pending.popleft()
+                    for page in islice(pages, 1):
+                        pending.append(create_task(fetch(page)))
+                else:
+                    # prefetch=0 - без фоновой загрузки, следующая страница загружается здесь
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    records = await fetch(page)
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+    # MEMBER
+    async def follow_member(self, member_id: int) -> AsyncResponse:
+        """Изменить статус подписки на пользователя"""
+
+        if member_id == (await self.get_current_member()).id:
+            raise ThisIsYouError(member_id)
+
+        return await self._post(f"{self.base_url}/members/{member_id}/follow")
+
+
+    async def ignore_member(self, member_id: int) -> AsyncResponse:
+        """Изменить статус игнорирования пользователя"""
+
+        if member_id == (await self.get_current_member()).id:
+            raise ThisIsYouError(member_id)
+
+        return await self._post(f"{self.base_url}/members/{member_id}/ignore")
+
+
+    async def add_profile_message(self, member_id: int, message_html: str) -> AsyncResponse:
+        """Отправить сообщение на стенку пользователя"""
+
+        return await self._post(f"{self.base_url}/members/{member_id}/post", {'message_html': message_html})
+
+
+    async def get_profile_messages(self, member_id: int, page: int = 1) -> list | None:
+        """Возвращает ID всех сообщений со стенки пользователя на странице"""
+
+        request = await self._get_json(f"{self.base_url}/members/{member_id}/page-{page}")
+        if request['status'] == 'error':
+            return None
+
+        return self.parser.parse_profile_messages(request)
+
+
+    async def edit_avatar(self, upload_photo: str) -> AsyncResponse:
+        """Изменить аватарку текущего пользователя"""
+
+        with open(upload_photo, 'rb') as image:
+            content = image.read()
+
+        form = partial(_avatar_form, content, upload_photo, token=await self.get_token())
+        response = await self._request('POST', f"{self.base_url}/account/avatar", data=form)
+        self._invalidate('member')
+        return response
+
+
+    async def delete_avatar(self) -> AsyncResponse:
+        """Удалить аватарку текущего пользователя"""
+
+        form = partial(_avatar_form, b"", "", token=await self.get_token(), delete=True)
+        response = await self._request('POST', f"{self.base_url}/account/avatar", data=form)
+        self._invalidate('member')
+        return response
+
+
+    # POST
+    async def react_post(self, post_id: int, reaction_id: int = 1) -> AsyncResponse:
+        """Поставить реакцию на сообщение"""
+
+        return await self._post(f'{self.base_url}/posts/{post_id}/react?reaction_id={reaction_id}')
+
+
+    async def edit_post(self, post_id: int, message_html: str) -> AsyncResponse:
+        """Отредактировать сообщение"""
+
+        thread = (await self.get_post(post_id)).thread
+
+        response = await self._post(f"{self.base_url}/posts/{post_id}/edit", {"title": thread.title, "message_html": message_html, "message": message_html})
+        self._invalidate_thread(thread.id)
+        return response
+
+
+    async def delete_post(self, post_id: int, reason: str, hard_delete: bool = False) -> AsyncResponse:
+        """Удалить сообщение"""
+
+        response = await self._post(f"{self.base_url}/posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete)})
+        self._invalidate('thread')
+        self._invalidate('thread_posts')
+        self._invalidate('thread_posts_full')
+        return response
+
+
+    async def bookmark_post(self, post_id: int) -> AsyncResponse:
+        """Добавить сообщение в закладки"""
+
+        return await self._post(f"{self.base_url}/posts/{post_id}/bookmark")
+
+
+    # PROFILE POST
+    async def react_profile_post(self, post_id: int, reaction_id: int = 1) -> AsyncResponse:
+        """Поставить реакцию на сообщение профиля"""
+
+        return await self._post(f'{self.base_url}/profile-posts/{post_id}/react?reaction_id={reaction_id}')
+
+
+    async def comment_profile_post(self, post_id: int, message_html: str) -> AsyncResponse:
+        """Прокомментировать сообщение профиля"""
+
+        return await self._post(f"{self.base_url}/profile-posts/{post_id}/add-comment", {"message_html": message_html})
+
+
+    async def delete_profile_post(self, post_id: int, reason: str, hard_delete: bool = False) -> AsyncResponse:
+        """Удалить сообщение профиля"""
+
+        return await self._post(f"{self.base_url}/profile-posts/{post_id}/delete", {"reason": reason, "hard_delete": int(hard_delete)})
+
+
+    async def edit_profile_post(self, post_id: int, message_html: str) -> AsyncResponse:
+        """Отредактировать сообщение профиля"""
+
+        return await self._post(f"{self.base_url}/profile-posts/{post_id}/edit", {"message_html": message_html, "message": message_html})
+
+
+    # THREAD
+    async def answer_thread(self, thread_id: int, message_html: str) -> AsyncResponse:
+        """Оставить сообщение в теме"""
+
+        response = await self._post(f"{self.base_url}/threads/{thread_id}/add-reply", {'message_html': message_html})
+        self._invalidate_thread(thread_id)
+        return response
+
+
+    async def watch_thread(self, thread_id: int, email_subscribe: bool = False, stop: bool = False) -> AsyncResponse:
+        """Изменить статус отслеживания темы"""
+
+        return await self._post(f"{self.base_url}/threads/{thread_id}/watch", {'stop': int(stop), 'email_subscribe': int(email_subscribe)})
+
+
+    async def delete_thread(self, thread_id: int, reason: str, hard_delete: bool = False) -> AsyncResponse:
+        """Удалить тему"""
+
+        response = await self._post(f"{self.base_url}/threads/{thread_id}/delete", {"reason": reason, "hard_delete": int(hard_delete)})
+        self._invalidate_thread(thread_id)
+        self._invalidate('thread_category', thread_id)
+        return response
+
+
+    async def edit_thread(self, thread_id: int, message_html: str) -> AsyncResponse:
+        """Отредактировать содержимое темы"""
+
+        thread_post_id = self.parser.parse_first_post_id(await self._get(f"{self.base_url}/threads/{thread_id}/page-1"))
+        response = await self._post(f"{self.base_url}/posts/{thread_post_id}/edit", {"message_html": message_html, "message": message_html})
+        self._invalidate_thread(thread_id)
+        return response
+
+
+    async def edit_thread_info(self, thread_id: int, title: str, prefix_id: int = None, sticky: bool = True, opened: bool = True) -> AsyncResponse:
+        """Изменить статус темы, ее префикс и название"""
+
+        data = {'title': title}
+
+        if prefix_id is not None: data.update({'prefix_id': prefix_id})
+        if opened: data.update({"discussion_open": 1})
+        if sticky: data.update({"sticky": 1})
+
+        response = await self._post(f"{self.base_url}/threads/{thread_id}/edit", data)
+        self._invalidate('thread', thread_id)
+        # страницы 'thread_posts_full' хранят и разобранную тему (заголовок, префикс)
+        self._invalidate('thread_posts_full', thread_id)
+        return response
+
+
+    async def get_thread_category(self, thread_id: int) -> Category:
+        """Получить объект раздела, в котором создана тема"""
+
+        category_id = self._cache_get('thread_category', thread_id)
+        if category_id is MISS:
+            category_id = self._cache_set('thread_category', thread_id, value=self.parser.parse_thread_category_id(await self._get(f"{self.base_url}/threads/{thread_id}/page-1")))
+        if category_id is None: return None
+
+        return await self.get_category(category_id)
+
+
+    async def get_thread_posts(self, thread_id: int, page: int = 1, full: bool = False) -> list:
+        """Получить ID всех сообщений из темы на странице (full=True - объекты Post, разобранные из этой же страницы)"""
+
+        if full:
+            result = await self._load_thread_posts_full(thread_id, page)
+            return self._make_posts(result, await self._page_thread(thread_id, result), {}) if result is not None else None
+
+        result = await self._load_thread_posts_page(thread_id, page)
+        return list(result[0]) if result is not None else None
+
+
+    async def get_thread_page(self, thread_id: int, page: int = 1, thread: Thread = None, fresh: bool = False) -> tuple | None:
+        """Сообщения страницы темы (объекты Post) и количество страниц темы. thread - уже загруженный объект темы,
+        fresh=True - загрузить страницу заново, минуя кэш ответов"""
+
+        if fresh:
+            self._invalidate('thread_posts_full', thread_id, page)
+        result = await self._load_thread_posts_full(thread_id, page)
+        if result is None:
+            return None
+        return self._make_posts(result, thread or await self._page_thread(thread_id, result), {}), result[1]
+
+
+    async def iter_thread_posts(self, thread_id: int, start_page: int = 1, prefetch: int = 2) -> AsyncIterator[Post]:
+        """Обойти все сообщения темы (асинхронный генератор объектов Post), разбирая их прямо из страниц темы
+        и загружая заранее следующие prefetch страниц"""
+
+        result = await self._load_thread_posts_full(thread_id, start_page)
+        if result is None:
+            return
+
+        thread, members = await self._page_thread(thread_id, result), {}
+        pages = iter(range(start_page + 1, result[1] + 1))
+        pending = deque(create_task(self._load_thread_posts_full(thread_id, page)) for page in islice(pages, prefetch))
+        try:
+            while result is not None:
+                for post in self._make_posts(result, thread, members):
+                    yield post
+                if pending:
+                    result = await pending.popleft()
+                    for page in islice(pages, 1):
+                        pending.append(create_task(self._load_thread_posts_full(thread_id, page)))
+                else:
+                    # prefetch=0 - без фоновой загрузки, следующая страница загружается здесь
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    result = await self._load_thread_posts_full(thread_id, page)
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+    async def _load_thread_posts_full(self, thread_id: int, page: int) -> tuple | None:
+        result = self._cache_get('thread_posts_full', thread_id, page)
+        if result is MISS:
+            request = await self._get_json(f"{self.base_url}/threads/{thread_id}/page-{page}")
+            if request['status'] == 'error':
+                return None
+
+            posts, pages_count = self.parser.parse_thread_posts_full(request, thread_id)
+            thread = None
+            if page == 1 and posts and request.get('redirect') is None:
+                thread = self._cache_set('thread', thread_id, value=self.parser.parse_thread(request))
+            result = self._cache_set('thread_posts_full', thread_id, page, value=(tuple(posts), pages_count, thread))
+        return result
+
+
+    async def _page_thread(self, thread_id: int, result: tuple) -> Thread | None:
+        return await self._make_thread(thread_id, result[2], False) if result[2] is not None else await self.get_thread(thread_id)
+
+
+    def _make_posts(self, result: tuple, thread: Thread, members: dict) -> list:
+        posts = []
+        for data in result[0]:
+            data = dict(data)
+            post_id, creator_id, creator_username = data.pop('id'), data.pop('creator_id'), data.pop('creator_username')
+            data.pop('thread_id')
+            creator = members.get(creator_id)
+            if creator is None:
+                creator = members[creator_id] = Member.stub(self, creator_id, creator_username)
+            posts.append(Post(self, post_id, creator, thread, **data))
+        return posts
+
+
+    async def _load_thread_posts_page(self, thread_id: int, page: int) -> tuple | None:
+        result = self._cache_get('thread_posts', thread_id, page)
+        if result is MISS:
+            request = await self._get_json(f"{self.base_url}/threads/{thread_id}/page-{page}")
+            if request['status'] == 'error':
+                return None
+
+            posts, pages_count = self.parser.parse_thread_posts_page(request)
+            result = self._cache_set('thread_posts', thread_id, page, value=(tuple(posts), pages_count))
+        return result
+
+
+    async def _get_thread_posts_page(self, thread_id: int, page: int) -> tuple | None:
+        result = await self._load_thread_posts_page(thread_id, page)
+        return (list(result[0]), result[1]) if result is not None and result[0] else None
+
+
+    async def get_all_thread_posts(self, thread_id: int, max_workers: int = 8) -> list:
+        """Получить ID всех сообщений из темы на всех страницах треда (страницы после первой загружаются параллельно)"""
+
+        first_page = await self._get_thread_posts_page(thread_id, 1)
+        if first_page is None:
+            return []
+
+        semaphore = Semaphore(max_workers)
+        async def fetch(page: int) -> tuple | None:
+            async with semaphore:
+                return await self._get_thread_posts_page(thread_id, page)
+
+        all_posts = list(first_page[0])
+        for page in await gather(*(fetch(page) for page in range(2, first_page[1] + 1))):
+            if page is not None:
+                all_posts.extend(page[0])
+        return all_posts
+
+
+    async def react_thread(self, thread_id: int, reaction_id: int = 1) -> AsyncResponse:
+        """Поставить реакцию на тему"""
+
+        thread_post_id = self.parser.parse_first_post_id(await self._get(f"{self.base_url}/threads/{thread_id}/page-1"))
+        return await self._post(f'{self.base_url}/posts/{thread_post_id}/react?reaction_id={reaction_id}')
+
+
+    # OTHER
+    async def send_form(self, form_id: int, data: dict) -> AsyncResponse:
+        """Заполнить форму"""
+
+        return await self._post(f"{self.base_url}/form/{form_id}/submit", data)
+
+
+    async def get_notifications(self) -> list:
+        """Получить список уведомлений с детальной информацией"""
+
+        return await self._get_polled(('notifications',), f"{self.base_url}/account/alerts", self.parser.parse_notifications)
+
+
+    async def search_threads(self, query: str, sort: str = 'relevance') -> list:
+        """Поиск тем по форуму с заданными параметрами"""
+
+        return self.parser.parse_search_results(await self._get(f"{self.base_url}/search/24587779/", params={'q': query, 'o': sort}))
+
+
+    async def mark_notifications_read(self, alert_ids: list[int]) -> AsyncResponse:
+        """Пометить уведомления как прочитанные"""
+
+        data = [('_xfToken', await self.get_token()), ('_xfAction', 'toggle'), ('_xfWithData', '1')]
+        data += [('alert_id', str(alert_id)) for alert_id in alert_ids]
+        return await self._request('POST', f"{self.base_url}/account/alert-toggle", data=data)
+
+
+    async def get_post_bbcode(self, thread_id: int, post_id: int) -> str:
+        """Получить BB-код из HTML-содержимого поста"""
+
+        params = {
+            '_xfRequestUri': f'/threads/{thread_id}/',
+            '_xfWithData': 1,
+            '_xfToken': await self.get_token(),
+            '_xfResponseType': 'json'
+        }
+        html_content = loads(await self._get(f"{self.base_url}/posts/{post_id}/edit", params=params)).get('html', {}).get('content', '')
+        if not html_content:
+            return ''
+
+        data = {
+            '_xfResponseType': 'json',
+            '_xfRequestUri': f'/threads/{thread_id}/',
+            '_xfWithData': 1,
+            'html': html_content
+        }
+        response = await self._post(f"{self.base_url}/index.php?editor/to-bb-code", data)
+        return response.json().get('bbCode', '')
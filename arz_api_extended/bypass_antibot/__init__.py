@@ -1 +1,2 @@
-from .script import *
\ No newline at end of file
+from .script import *
+from .store import *
@@ -0,0 +1,130 @@
+"""Чистая Python-реализация расшифровки AES-CBC, совместимая со slowAES.decrypt из страницы анти-бота"""
+
+
+def _xtime(value: int) -> int:
+    value <<= 1
+    return (value ^ 0x11b) if value & 0x100 else value
+
+
+def _multiply(a: int, b: int) -> int:
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
+
+
+def _build_sbox() -> bytes:
+    inverse = [0] * 256
+    for a in range(1, 256):
+        for b in range(1, 256):
+            if _multiply(a, b) == 1:
+                inverse[a] = b
+                break
+
+    sbox = bytearray(256)
+    for i in range(256):
+        x = inverse[i]
+        s = x
+        for _ in range(4):
+            x = ((x << 1) | (x >> 7)) & 0xff
+            s ^= x
+        sbox[i] = s ^ 0x63
+    return bytes(sbox)
+
+
+SBOX = _build_sbox()
+INV_SBOX = bytes(SBOX.index(i) for i in range(256))
+MUL9, MUL11, MUL13, MUL14 = (bytes(_multiply(i, n) for i in range(256)) for n in (9, 11, 13, 14))
+RCON = (0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d)
+ROUNDS = {16: 10, 24: 12, 32: 14}
+# Состояние хранится по столбцам (индекс = строка + 4 * столбец), строка r сдвигается вправо на r
+INV_SHIFT_ROWS = tuple(i % 4 + 4 * ((i // 4 - i % 4) % 4) for i in range(16))
+
+
+def expand_key(key: bytes) -> list:
+    """Расширить ключ AES (16/24/32 байта) в список раундовых ключей по 16 байт"""
+
+    if len(key) not in ROUNDS:
+        raise ValueError(f"Неверная длина ключа AES: {len(key)}")
+
+    nk = len(key) // 4
+    rounds = ROUNDS[len(key)]
+    words = [list(key[i:i + 4]) for i in range(0, len(key), 4)]
+    for i in range(nk, 4 * (rounds + 1)):
+        word = list(words[i - 1])
+        if i % nk == 0:
+            word = [SBOX[b] for b in word[1:] + word[:1]]
+            word[0] ^= RCON[i // nk - 1]
+        elif nk > 6 and i % nk == 4:
+            word = [SBOX[b] for b in word]
+        words.append([a ^ b for a, b in zip(words[i - nk], word)])
+
+    return [bytes(sum(words[r * 4:r * 4 + 4], [])) for r in range(rounds + 1)]
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(16, 'big')
+
+
+def decrypt_block(block: bytes, round_keys: list) -> bytes:
+    """Расшифровать один блок AES (16 байт)"""
+
+    state = _xor(block, round_keys[-1])
+    for round_key in reversed(round_keys[1:-1]):
+        state = _xor(bytes(INV_SBOX[state[i]] for i in INV_SHIFT_ROWS), round_key)
+        # InvMixColumns
+        mixed = bytearray(16)
+        for c in range(0, 16, 4):
+            a0, a1, a2, a3 = state[c:c + 4]
+            mixed[c] = MUL14[a0] ^ MUL11[a1] ^ MUL13[a2] ^ MUL9[a3]
+            mixed[c + 1] = MUL9[a0] ^ MUL14[a1] ^ MUL11[a2] ^ MUL13[a3]
+            mixed[c + 2] = MUL13[a0] ^ MUL9[a1] ^ MUL14[a2] ^ MUL11[a3]
+            mixed[c + 3] = MUL11[a0] ^ MUL13[a1] ^ MUL9[a2] ^ MUL14[a3]
+        state = mixed
+
+    return _xor(bytes(INV_SBOX[state[i]] for i in INV_SHIFT_ROWS), round_keys[0])
+
+
+def unpad(data: bytes) -> bytes:
+    """Снять дополнение так же, как это делает slowAES.unpadBytesOut"""
+
+    if len(data) <= 16:
+        return data
+
+    pad_byte = -1
+    pad_count = 0
+    for value in reversed(data[-17:]):
+        if value > 16:
+            break
+        if pad_byte == -1:
+            pad_byte = value
+        if value != pad_byte:
+            pad_count = 0
+            break
+        pad_count += 1
+        if pad_count == pad_byte:
+            break
+
+    return data[:len(data) - pad_count] if pad_count > 0 else data
+
+
+def decrypt_cbc(ciphertext: bytes, key: bytes, iv: bytes) -> bytes:
+    """Расшифровать данные в режиме CBC (аналог slowAES.decrypt(cipher, 2, key, iv))"""
+
+    if len(iv) != 16:
+        raise ValueError("Длина вектора инициализации должна быть 128 бит")
+    if len(ciphertext) % 16:
+        raise ValueError("Длина шифротекста должна быть кратна 16 байтам")
+
+    round_keys = expand_key(key)
+    output = bytearray()
+    previous = iv
+    for start in range(0, len(ciphertext), 16):
+        block = ciphertext[start:start + 16]
+        output += _xor(decrypt_block(block, round_keys), previous)
+        previous = block
+
+    return unpad(bytes(output))
@@ -1,9 +1,26 @@
+import asyncio
 import re
-import dukpy
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
 import requests
 import aiohttp
 from aiohttp_socks import ProxyConnector
 
+from arz_api_extended.bypass_antibot.aes import decrypt_cbc
+from arz_api_extended.bypass_antibot.store import CookieStore, default_store
+from arz_api_extended.exceptions import AntiBotError
+
+if TYPE_CHECKING:
+    from arz_api_extended.ratelimit import RateLimiter
+    from arz_api_extended.retry import RetryPolicy
+
+try:
+    import dukpy
+except ImportError:
+    dukpy = None
+
 
 text = """
 /*
@@ -808,6 +825,10 @@ _0xfab6 = [
     "\x3B\x20\x65\x78\x70\x69\x72\x65\x73\x3D\x54\x68\x75\x2C\x20\x33\x31\x2D\x44\x65\x63\x2D\x33\x37\x20\x32\x33\x3A\x35\x35\x3A\x35\x35\x20\x47\x4D\x54\x3B\x20\x70\x61\x74\x68\x3D\x2F"
 ]
 
+CHALLENGE_START = ",\"\\x30\",\"\\x74\\x6F\\x4C\\x6F\\x77\\x65\\x72\\x43\\x61\\x73\\x65\","
+CHALLENGE_END = ",\"\\x63\\x6F\\x6F\\x6B\\x69\\x65\","
+CHALLENGE_MARKER = CHALLENGE_START.encode()
+
 user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36 OPR/86.0.4363.64"
 
 
@@ -840,34 +861,120 @@ def slow_aes(value):
     return data
 
 
-def bypass(agent=user_agent):
-    session = requests.session()
-    session.headers = {"user-agent": agent}
-    r = session.get("https://forum.arizona-rp.com/", timeout=3)
-    codes = r.text.split(",\"\\x30\",\"\\x74\\x6F\\x4C\\x6F\\x77\\x65\\x72\\x43\\x61\\x73\\x65\",")[1].split(",\"\\x63\\x6F\\x6F\\x6B\\x69\\x65\",")[0]
+def solve_native(key: str, iv: str, cipher: str) -> str:
+    """Решить задачу анти-бота без JS: AES-CBC расшифровка на чистом Python"""
+
+    return decrypt_cbc(bytes.fromhex(cipher), bytes.fromhex(key), bytes.fromhex(iv)).hex()
+
+
+def solve_dukpy(key: str, iv: str, cipher: str) -> str:
+    """Решить задачу анти-бота, выполнив оригинальный slowAES через dukpy"""
+
+    a, b, c = to_numbers(key), to_numbers(iv), to_numbers(cipher)
+    return to_hex([slow_aes([c, a, b]), _0xfab6])
+
+
+def is_challenge(content: bytes) -> bool:
+    """Является ли ответ страницей с задачей анти-бота"""
+
+    return CHALLENGE_MARKER in content
+
+
+def solve_challenge(body: str) -> str:
+    """Получить cookie анти-бота (R3ACTLAB-ARZ1=...) из страницы с задачей
+
+    Расшифровка выполняется на чистом Python, dukpy используется только как запасной вариант.
+    Если это не страница анти-бота (например, 429 или 502) - AntiBotError
+    """
+
+    if CHALLENGE_START not in body:
+        raise AntiBotError()
+    codes = body.split(CHALLENGE_START)[1].split(CHALLENGE_END)[0]
     found = re.compile("\"(.*)\",\"(.*)\",\"(.*)\"").findall(codes)[0]
-    a, b, c = to_numbers(found[0]), to_numbers(found[1]), to_numbers(found[2])
-    return _0xfab6[11] + to_hex([slow_aes([c, a, b]), _0xfab6])
+    try:
+        value = solve_native(*found)
+    except ValueError:
+        if dukpy is None:
+            raise
+        value = solve_dukpy(*found)
+    return _0xfab6[11] + value
+
+
+def refresh(body: str, agent=user_agent, store: CookieStore = default_store, proxy="") -> str:
+    """Заново решить задачу анти-бота из уже полученной страницы и обновить хранилище"""
 
+    if store is not None:
+        store.invalidate(agent, proxy)
+    cookie = solve_challenge(body)
+    if store is not None:
+        store.set(agent, proxy, cookie)
+    return cookie
 
-async def bypass_async(agent=user_agent, proxy=""):
-    body = ""
+
+def bypass(agent=user_agent, proxy="", store: CookieStore = default_store, url="https://forum.arizona-rp.com/", retry: 'RetryPolicy' = None, limiter: 'RateLimiter' = None):
+    """Получить cookie анти-бота (из store или решив задачу со страницы url).
+    С retry запрос страницы повторяется при 5xx / 429 / обрыве соединения, с limiter - каждая попытка проходит через RateLimiter"""
+
+    if store is not None:
+        cookie = store.get(agent, proxy)
+        if cookie is not None:
+            return cookie
+
+    session = requests.session()
+    session.headers = {"user-agent": agent}
     if len(proxy) > 1:
-        connector = ProxyConnector.from_url(proxy)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            session.headers.update({"user-agent": agent})
-            async with session.get("https://forum.arizona-rp.com/") as resp:
-                body = await resp.text()
-    else:
-        async with aiohttp.ClientSession() as session:
-            session.headers.update({"user-agent": agent})
-            async with session.get("https://forum.arizona-rp.com/") as resp:
-                body = await resp.text()
-    
-    codes = body.split(",\"\\x30\",\"\\x74\\x6F\\x4C\\x6F\\x77\\x65\\x72\\x43\\x61\\x73\\x65\",")[1].split(",\"\\x63\\x6F\\x6F\\x6B\\x69\\x65\",")[0]
-    found = re.compile("\"(.*)\",\"(.*)\",\"(.*)\"").findall(codes)[0]
-    a, b, c = to_numbers(found[0]), to_numbers(found[1]), to_numbers(found[2])
-    return _0xfab6[11] + to_hex([slow_aes([c, a, b]), _0xfab6]), session.headers.get("user-agent")
+        session.proxies = {"http": proxy, "https": proxy}
+
+    attempt = 0
+    while True:
+        try:
+            with limiter.limit('GET', url) if limiter is not None else nullcontext():
+                r = session.get(url, timeout=3)
+        except (requests.ConnectionError, requests.Timeout):
+            delay = retry.retry_error('GET', attempt) if retry is not None else None
+            if delay is None:
+                raise
+        else:
+            delay = retry.retry_response('GET', url, r.status_code, r.headers, attempt) if retry is not None else None
+            if delay is None:
+                break
+        time.sleep(delay)
+        attempt += 1
+
+    if not is_challenge(r.content):
+        raise AntiBotError(r.status_code)
+    return refresh(r.text, agent, store, proxy)
+
+
+async def bypass_async(agent=user_agent, proxy="", store: CookieStore = default_store, url="https://forum.arizona-rp.com/", retry: 'RetryPolicy' = None, limiter: 'RateLimiter' = None):
+    """Асинхронный bypass. Возвращает пару (cookie, user-agent)"""
+
+    if store is not None:
+        cookie = store.get(agent, proxy)
+        if cookie is not None:
+            return cookie, agent
+
+    connector = ProxyConnector.from_url(proxy) if len(proxy) > 1 else None
+    async with aiohttp.ClientSession(connector=connector, headers={"user-agent": agent}) as session:
+        attempt = 0
+        while True:
+            try:
+                async with limiter.limit_async('GET', url) if limiter is not None else nullcontext(), session.get(url) as resp:
+                    status, headers, body = resp.status, resp.headers, await resp.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = retry.retry_error('GET', attempt) if retry is not None else None
+                if delay is None:
+                    raise
+            else:
+                delay = retry.retry_response('GET', url, status, headers, attempt) if retry is not None else None
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    if not is_challenge(body.encode()):
+        raise AntiBotError(status)
+    return refresh(body, agent, store, proxy), agent
 
 
 def main():
@@ -0,0 +1,156 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+__all__ = ('CookieStore', 'MemoryCookieStore', 'FileCookieStore', 'default_store')
+
+
+class CookieStore(ABC):
+    """Базовое хранилище cookie анти-бота. Ключ - пара (user-agent, прокси)"""
+
+    @abstractmethod
+    def get(self, user_agent: str, proxy: str = "") -> str | None:
+        """Получить cookie (R3ACTLAB-ARZ1=...) или None, если его нет"""
+
+    @abstractmethod
+    def set(self, user_agent: str, proxy: str, cookie: str) -> None:
+        """Сохранить cookie"""
+
+    @abstractmethod
+    def invalidate(self, user_agent: str, proxy: str = "") -> None:
+        """Удалить cookie (например, если форум снова показал страницу анти-бота)"""
+
+    @staticmethod
+    def key(user_agent: str, proxy: str = "") -> str:
+        return f"{user_agent}|{proxy or ''}"
+
+
+class MemoryCookieStore(CookieStore):
+    """LRU-хранилище cookie в памяти процесса
+
+    Attributes:
+        maxsize (int): Максимальное количество записей. По умолчанию 128 (необяз.)
+        ttl (float): Время жизни cookie в секундах. По умолчанию не ограничено (необяз.)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_agent: str, proxy: str = "") -> str | None:
+        key = self.key(user_agent, proxy)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and time() - entry[1] > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, user_agent: str, proxy: str, cookie: str, created_at: float = None) -> None:
+        """Сохранить cookie (created_at - время получения, если cookie взята из другого хранилища)"""
+
+        key = self.key(user_agent, proxy)
+        with self._lock:
+            self._data[key] = (cookie, time() if created_at is None else created_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_agent: str, proxy: str = "") -> None:
+        with self._lock:
+            self._data.pop(self.key(user_agent, proxy), None)
+
+
+class FileCookieStore(CookieStore):
+    """Хранилище cookie в JSON файле с блокировкой, общее для нескольких процессов
+
+    Перед файлом стоит LRU-кэш в памяти, поэтому повторные обращения не читают диск.
+
+    Attributes:
+        path (str): Путь до файла хранилища
+        ttl (float): Время жизни cookie в секундах. По умолчанию не ограничено (необяз.)
+        maxsize (int): Размер LRU-кэша в памяти. По умолчанию 128 (необяз.)
+    """
+
+    def __init__(self, path: str, ttl: float = None, maxsize: int = 128) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.memory = MemoryCookieStore(maxsize, ttl)
+
+    @contextmanager
+    def _locked(self):
+        with open(f"{self.path}.lock", 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, data: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as file:
+            json.dump(data, file)
+        os.replace(file.name, self.path)
+
+    def get(self, user_agent: str, proxy: str = "") -> str | None:
+        cookie = self.memory.get(user_agent, proxy)
+        if cookie is not None:
+            return cookie
+
+        with self._locked():
+            entry = self._read().get(self.key(user_agent, proxy))
+        if entry is None or (self.ttl is not None and time() - entry['created_at'] > self.ttl):
+            return None
+
+        self.memory.set(user_agent, proxy, entry['cookie'], entry['created_at'])
+        return entry['cookie']
+
+    def set(self, user_agent: str, proxy: str, cookie: str) -> None:
+        created_at = time()
+        self.memory.set(user_agent, proxy, cookie, created_at)
+        with self._locked():
+            data = self._read()
+            data[self.key(user_agent, proxy)] = {'cookie': cookie, 'created_at': created_at}
+            self._write(data)
+
+    def invalidate(self, user_agent: str, proxy: str = "") -> None:
+        self.memory.invalidate(user_agent, proxy)
+        with self._locked():
+            data = self._read()
+            if data.pop(self.key(user_agent, proxy), None) is not None:
+                self._write(data)
+
+
+default_store = MemoryCookieStore()
+"""Хранилище по умолчанию для bypass()/bypass_async()"""
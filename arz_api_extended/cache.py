@@ -0,0 +1,223 @@
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from hashlib import blake2b
+from re import compile
+from threading import Lock
+from time import monotonic
+
+
+MISS = object()
+"""Значение, которое возвращает ResponseCache.get при промахе (None - допустимое закэшированное значение)"""
+
+DEFAULT_TTLS = {
+    'category': 300,
+    'parent_category': 3600,
+    'thread_category': 600,
+    'member': 300,
+    'thread': 60,
+    'thread_posts': 30,
+    'thread_posts_full': 30
+}
+"""Время жизни записей по умолчанию (в секундах) для каждого эндпоинта"""
+
+VOLATILE_PATTERN = compile(rb"data-csrf=\"[^\"]*\"|csrf: '[^']*'|_xfToken[\"']? value=\"[^\"]*\"|\b(?:now|today|todayDow|tomorrow|yesterday|week): \d+")
+"""Части страницы, которые меняются при каждом запросе (CSRF токен, серверное время) и не учитываются в отпечатке"""
+
+
+class ResponseCache:
+    """LRU-кэш разобранных ответов форума с временем жизни записей для каждого эндпоинта
+
+    Ключ записи - (эндпоинт, ID, страница...). Запись удаляется, когда истекает ее время жизни,
+    когда кэш переполнен (самая давно использованная) или после действия, меняющего эти данные
+    (например, answer_thread сбрасывает закэшированные страницы темы).
+    Кэш хранит и отдает копии значений, поэтому изменение полученного объекта (например, member.roles) не портит запись
+
+    Attributes:
+        maxsize (int): Максимальное количество записей. По умолчанию 1024 (необяз.)
+        ttl (float): Время жизни записей эндпоинтов, которых нет в ttls. По умолчанию 60 (необяз.)
+        ttls (dict): Время жизни записей по эндпоинтам, дополняет DEFAULT_TTLS (необяз.)
+
+    Пример:
+        api = ArizonaAPI(user_agent, cookie, cache=ResponseCache(ttls={'member': 600}))
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, ttls: dict = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+        self.hits = Counter()
+        """Количество попаданий по эндпоинтам"""
+        self.misses = Counter()
+        """Количество промахов по эндпоинтам"""
+        self.evictions = 0
+        """Количество записей, вытесненных из-за переполнения"""
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(endpoint: str, key: tuple) -> tuple:
+        return (endpoint, *(str(part) for part in key))
+
+    def get(self, endpoint: str, *key):
+        """Получить запись или MISS, если ее нет или время жизни истекло"""
+
+        full_key = self._key(endpoint, key)
+        with self._lock:
+            entry = self._data.get(full_key)
+            if entry is not None and entry[0] < monotonic():
+                del self._data[full_key]
+                entry = None
+
+            if entry is None:
+                self.misses[endpoint] += 1
+                return MISS
+
+            self._data.move_to_end(full_key)
+            self.hits[endpoint] += 1
+        return deepcopy(entry[1])
+
+    def set(self, endpoint: str, *key, value) -> None:
+        """Сохранить запись"""
+
+        full_key, value = self._key(endpoint, key), deepcopy(value)
+        with self._lock:
+            self._data[full_key] = (monotonic() + self.ttls.get(endpoint, self.ttl), value)
+            self._data.move_to_end(full_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint: str = None, *key) -> int:
+        """Удалить записи эндпоинта, ключ которых начинается с key (без аргументов - очистить весь кэш)
+
+        Returns:
+            Количество удаленных записей
+        """
+
+        with self._lock:
+            if endpoint is None:
+                count = len(self._data)
+                self._data.clear()
+                return count
+
+            prefix = self._key(endpoint, key)
+            keys = [full_key for full_key in self._data if full_key[:len(prefix)] == prefix]
+            for full_key in keys:
+                del self._data[full_key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> dict:
+        """Статистика кэша: попадания, промахи, доля попаданий, вытеснения и размер"""
+
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            'hits': hits, 'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'evictions': self.evictions, 'size': len(self._data),
+            'endpoints': {endpoint: (self.hits[endpoint], self.misses[endpoint]) for endpoint in self.hits.keys() | self.misses.keys()}
+        }
+
+
+def fingerprint(content: bytes) -> bytes:
+    """Отпечаток содержимого страницы без CSRF токена и серверного времени"""
+
+    return blake2b(VOLATILE_PATTERN.sub(b"", content), digest_size=16).digest()
+
+
+class ConditionalCache:
+    """Валидаторы (ETag, Last-Modified) и отпечатки опрашиваемых страниц вместе с результатом их разбора
+
+    Повторный запрос отправляется с If-None-Match / If-Modified-Since. Если форум ответил 304
+    или отпечаток тела не изменился, страница не разбирается заново и возвращается копия прошлого результата
+
+    Attributes:
+        maxsize (int): Максимальное количество страниц. По умолчанию 256 (необяз.)
+
+    Пример:
+        api = ArizonaAPI(user_agent, cookie, conditional=ConditionalCache())
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+
+        self.not_modified = 0
+        """Количество ответов 304"""
+        self.unchanged = 0
+        """Количество ответов, у которых не изменился отпечаток"""
+        self.parsed = 0
+        """Количество разобранных (новых или изменившихся) страниц"""
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def headers(self, key: tuple) -> dict:
+        """Условные заголовки для запроса страницы"""
+
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry['etag'] is not None: headers['If-None-Match'] = entry['etag']
+        if entry['last_modified'] is not None: headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _result(self, key: tuple, digest: bytes = None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (digest is not None and entry['fingerprint'] != digest):
+                return MISS
+            self._data.move_to_end(key)
+        return deepcopy(entry['result'])
+
+    def get_not_modified(self, key: tuple):
+        """Прошлый результат для ответа 304 (MISS, если страницу уже вытеснили из кэша - тогда нужен обычный запрос)"""
+
+        result = self._result(key)
+        if result is not MISS:
+            self.not_modified += 1
+        return result
+
+    def get_unchanged(self, key: tuple, digest: bytes):
+        """Прошлый результат, если отпечаток страницы не изменился, иначе MISS"""
+
+        result = self._result(key, digest)
+        if result is not MISS:
+            self.unchanged += 1
+        return result
+
+    def set(self, key: tuple, headers, digest: bytes, result):
+        """Запомнить валидаторы, отпечаток и результат разбора страницы
+
+        Returns:
+            Переданный результат
+        """
+
+        entry = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified'), 'fingerprint': digest, 'result': deepcopy(result)}
+        with self._lock:
+            self.parsed += 1
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+    def invalidate(self, key: tuple = None) -> None:
+        """Забыть страницу (без аргументов - все страницы)"""
+
+        with self._lock:
+            if key is None: self._data.clear()
+            else: self._data.pop(key, None)
+
+    @property
+    def stats(self) -> dict:
+        """Статистика: ответы 304, неизмененные и разобранные страницы"""
+
+        return {'not_modified': self.not_modified, 'unchanged': self.unchanged, 'parsed': self.parsed, 'size': len(self._data)}
@@ -0,0 +1,150 @@
+from json import dumps
+from re import compile
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable
+from urllib.parse import quote_plus, unquote_plus
+
+from requests import PreparedRequest
+
+
+CSRF_PATTERNS = (compile(rb'data-csrf="([^"]+)"'), compile(rb'"csrf"\s*:\s*"([^"]+)"'))
+REQUEST_TOKEN_PATTERNS = (compile(rb'_xfToken=([^&\s]+)'), compile(rb'name="_xfToken"\r\n\r\n([^\r]+)'))
+
+SECURITY_ERROR_PHRASES = (
+    'Security error occurred',
+    'Произошла ошибка безопасности',
+)
+SECURITY_ERROR_MARKERS = tuple(
+    marker
+    for phrase in SECURITY_ERROR_PHRASES
+    for marker in (phrase.encode('utf-8'), dumps(phrase)[1:-1].encode('ascii'))
+)
+
+
+def is_security_error(status_code: int, content: bytes) -> bool:
+    """Является ли ответ ошибкой безопасности XenForo (устаревший/неверный CSRF токен)"""
+
+    return status_code == 400 and any(marker in content for marker in SECURITY_ERROR_MARKERS)
+
+
+def request_token(request: PreparedRequest) -> str | None:
+    """Достать значение _xfToken, с которым был отправлен запрос"""
+
+    body = request.body.encode() if isinstance(request.body, str) else request.body
+    for content in (request.url.encode(), body):
+        if not isinstance(content, bytes):
+            continue
+        for pattern in REQUEST_TOKEN_PATTERNS:
+            match = pattern.search(content)
+            if match is not None:
+                return unquote_plus(match.group(1).decode())
+    return None
+
+
+def replace_token(request: PreparedRequest, old: str, new: str) -> bool:
+    """Заменить значение _xfToken в подготовленном запросе (URL и тело)
+
+    Returns:
+        True, если токен был найден и заменен
+    """
+
+    replaced = False
+    for old_value, new_value in {(old, new), (quote_plus(old), quote_plus(new))}:
+        if old_value in request.url:
+            request.url = request.url.replace(old_value, new_value)
+            replaced = True
+
+        body = request.body
+        if isinstance(body, str) and old_value in body:
+            request.body = body.replace(old_value, new_value)
+            replaced = True
+        elif isinstance(body, bytes) and old_value.encode() in body:
+            request.body = body.replace(old_value.encode(), new_value.encode())
+            replaced = True
+
+    if replaced and request.body is not None:
+        request.prepare_content_length(request.body)
+    return replaced
+
+
+class TokenManager:
+    """Кэш CSRF токена XenForo
+
+    Токен собирается из любых уже полученных HTML/JSON ответов (data-csrf) и хранится ttl секунд.
+    Отдельный запрос за токеном выполняется только если кэш пуст или устарел.
+
+    Attributes:
+        ttl (float): Время жизни токена в секундах. По умолчанию 3600 (необяз.)
+    """
+
+    def __init__(self, ttl: float = 3600) -> None:
+        self.ttl = ttl
+        self.fetches = 0
+        """**Количество запросов за токеном**"""
+        self.fetches_avoided = 0
+        """**Количество запросов за токеном, которых удалось избежать**"""
+
+        self._token = None
+        self._updated_at = 0.0
+        self._lock = Lock()
+
+
+    @property
+    def cached(self) -> str | None:
+        """Актуальный токен из кэша (None, если его нет или он устарел)"""
+
+        if self._token is not None and monotonic() - self._updated_at < self.ttl:
+            return self._token
+        return None
+
+
+    def set(self, token: str) -> None:
+        """Сохранить токен в кэш"""
+
+        with self._lock:
+            self._token = token
+            self._updated_at = monotonic()
+
+
+    def invalidate(self) -> None:
+        """Сбросить кэш токена"""
+
+        with self._lock:
+            self._token = None
+
+
+    def harvest(self, content: bytes) -> str | None:
+        """Достать токен из содержимого ответа и сохранить его в кэш"""
+
+        for pattern in CSRF_PATTERNS:
+            match = pattern.search(content)
+            if match is not None:
+                token = match.group(1).decode()
+                self.set(token)
+                return token
+        return None
+
+
+    def get(self, fetch: Callable[[], bytes]) -> str | None:
+        """Получить токен из кэша, либо вызвать fetch и достать токен из его результата"""
+
+        token = self.cached
+        if token is not None:
+            with self._lock: self.fetches_avoided += 1
+            return token
+
+        with self._lock: self.fetches += 1
+        return self.harvest(fetch())
+
+
+    async def get_async(self, fetch: Callable[[], Awaitable[bytes]]) -> str | None:
+        """Асинхронный вариант get(): fetch - корутина, возвращающая содержимое ответа"""
+
+        token = self.cached
+        if token is not None:
+            with self._lock: self.fetches_avoided += 1
+            return token
+
+        with self._lock: self.fetches += 1
+        return self.harvest(await fetch())
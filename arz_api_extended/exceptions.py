@@ -16,3 +16,21 @@ class ThisIsYouError(ArizonaException):
 
     def __str__(self) -> str:
         return f"Вы не можете совершить данное действие самому себе\nID пользователя: {self.user_id}"
+
+
+class RetryError(ArizonaException):
+    def __init__(self, url: str, reason, attempts: int):
+        self.url = url
+        self.reason = reason
+        self.attempts = attempts
+
+    def __str__(self) -> str:
+        return f"Запрос не удался после {self.attempts} попыток (последний ответ: {self.reason})\nURL: {self.url}"
+
+
+class AntiBotError(ArizonaException):
+    def __init__(self, status: int = None):
+        self.status = status
+
+    def __str__(self) -> str:
+        return f"Форум не отдал страницу анти-бота, решить задачу нельзя (код ответа: {self.status})"
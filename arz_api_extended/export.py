@@ -0,0 +1,273 @@
+import glob
+import os
+from array import array
+from typing import Iterable
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# Колоночная выгрузка тем (записей get_threads_extended / iter_category_threads) для аналитики.
+# Записи сразу раскладываются по типизированным колонкам (array из stdlib), ники / цвета / префиксы
+# кодируются словарем, и каждые batch_size тем колонки сбрасываются в файл, поэтому выгрузка всего
+# форума не держит в памяти список словарей. numpy и pyarrow необязательны: нужны только при записи
+
+MISSING = -1
+"""Значение отсутствующего числа (дата) и код отсутствующей строки в словаре (как коды pandas.Categorical)"""
+
+INT_COLUMNS = ('thread_id', 'category_id', 'created_date', 'last_message_date')
+"""Колонки int64 (даты - UNIX время)"""
+BOOL_COLUMNS = ('is_pinned', 'is_closed')
+"""Колонки bool"""
+STRING_COLUMNS = ('thread_title',)
+"""Колонки строк без словаря (почти все значения разные)"""
+DICTIONARY_COLUMNS = ('prefix', 'username_author', 'username_author_color', 'username_last_message', 'username_last_message_color')
+"""Колонки строк, закодированные словарем (int32 код + список значений)"""
+
+
+def _require(module, name: str):
+    if module is None:
+        raise ImportError(f"Для этого формата нужен {name}: pip install {name}")
+    return module
+
+
+class Dictionary:
+    """Словарь строк колонки: значение -> код. Только пополняется, поэтому коды прошлых пачек остаются верными"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self) -> None:
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ThreadColumns:
+    """Буфер тем в колонках
+
+    Attributes:
+        dictionaries (dict): Словари строковых колонок (необяз.). Передаются, чтобы коды совпадали между буферами
+    """
+
+    def __init__(self, dictionaries: dict = None) -> None:
+        self.dictionaries = dictionaries or {name: Dictionary() for name in DICTIONARY_COLUMNS}
+        """**Словари строковых колонок** (общие для всех пачек одного файла)"""
+        self.clear()
+
+    def clear(self) -> None:
+        """Очистить колонки (словари сохраняются)"""
+
+        self.ints = {name: array('q') for name in INT_COLUMNS}
+        self.flags = {name: array('b') for name in BOOL_COLUMNS}
+        self.strings = {name: [] for name in STRING_COLUMNS}
+        self.codes = {name: array('i') for name in DICTIONARY_COLUMNS}
+
+    def append(self, record: dict, category_id: int = None) -> None:
+        """Добавить тему (словарь get_threads_extended)
+
+        Attributes:
+            record (dict): Тема
+            category_id (int): ID раздела темы, если его нет в записи (необяз.)
+        """
+
+        if category_id is not None and record.get('category_id') is None:
+            record = {**record, 'category_id': category_id}
+        for name, column in self.ints.items():
+            value = record.get(name)
+            column.append(MISSING if value is None else value)
+        for name, column in self.flags.items():
+            column.append(bool(record.get(name)))
+        for name, column in self.strings.items():
+            column.append(record.get(name) or '')
+        for name, column in self.codes.items():
+            column.append(self.dictionaries[name].encode(record.get(name)))
+
+    def extend(self, records: Iterable[dict], category_id: int = None) -> None:
+        for record in records:
+            self.append(record, category_id)
+
+    def __len__(self) -> int:
+        return len(self.ints['thread_id'])
+
+    def to_numpy(self) -> dict:
+        """Колонки в виде массивов numpy (без копирования чисел)
+
+        Returns:
+            Словарь (dict) имя -> массив. Для строк со словарем - коды int32 в '{имя}' и значения в '{имя}.values'
+        """
+
+        np = _require(numpy, 'numpy')
+        columns = {name: np.frombuffer(column, dtype=np.int64) for name, column in self.ints.items()}
+        columns.update((name, np.frombuffer(column, dtype=np.int8).astype(bool)) for name, column in self.flags.items())
+        columns.update((name, np.array(column, dtype=str)) for name, column in self.strings.items())
+        for name, column in self.codes.items():
+            columns[name] = np.frombuffer(column, dtype=np.int32)
+            columns[f"{name}.values"] = np.array(self.dictionaries[name].values, dtype=str)
+        return columns
+
+    def to_arrow(self) -> 'pyarrow.RecordBatch':
+        """Колонки в виде RecordBatch pyarrow (MISSING -> null, строки со словарем - DictionaryArray)"""
+
+        pa = _require(pyarrow, 'pyarrow')
+        np = _require(numpy, 'numpy')
+        columns = {name: np.frombuffer(column, dtype=np.int64) for name, column in self.ints.items()}
+        columns.update((name, np.frombuffer(column, dtype=np.int8).astype(bool)) for name, column in self.flags.items())
+        columns.update((name, np.frombuffer(column, dtype=np.int32)) for name, column in self.codes.items())
+        arrays, names = [], []
+        for name in INT_COLUMNS:
+            values = columns[name]
+            arrays.append(pa.array(values, mask=values == MISSING))
+            names.append(name)
+        for name in BOOL_COLUMNS:
+            arrays.append(pa.array(columns[name]))
+            names.append(name)
+        for name in STRING_COLUMNS:
+            arrays.append(pa.array(self.strings[name], pa.string()))
+            names.append(name)
+        for name in DICTIONARY_COLUMNS:
+            codes = columns[name]
+            indices = pa.array(codes, mask=codes == MISSING)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionaries[name].values, pa.string())))
+            names.append(name)
+        return pa.RecordBatch.from_arrays(arrays, names)
+
+
+class ThreadExporter:
+    """Потоковая запись тем в Parquet, Arrow (IPC stream) или npz
+
+    Формат определяется по расширению: .parquet, .arrow / .arrows, .npz.
+    npz не поддерживает дозапись, поэтому каждая пачка пишется отдельным файлом '{имя}-00000.npz'
+    (прочитать все части - read_npz)
+
+    Attributes:
+        path (str): Путь к файлу
+        batch_size (int): Сколько тем держать в памяти до записи пачки. По умолчанию 50000 (необяз.)
+        compression (str): Сжатие Parquet / Arrow ('zstd', 'lz4', None). По умолчанию 'zstd' (необяз.)
+        format (str): 'parquet', 'arrow' или 'npz', если расширение другое (необяз.)
+
+    Пример:
+        with ThreadExporter('threads.parquet') as exporter:
+            for category_id in categories:
+                exporter.write_many(api.iter_category_threads(category_id), category_id)
+    """
+
+    FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.arrows': 'arrow', '.npz': 'npz'}
+
+    def __init__(self, path: str, batch_size: int = 50000, compression: str | None = 'zstd', format: str = None) -> None:
+        self.path = path
+        self.format = format or self.FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.format not in ('parquet', 'arrow', 'npz'):
+            raise ValueError(f"Неизвестный формат выгрузки: {path}")
+        _require(numpy, 'numpy')
+        if self.format != 'npz':
+            _require(pyarrow, 'pyarrow')
+
+        self.batch_size = batch_size
+        self.compression = compression
+        self.columns = ThreadColumns()
+        self.rows = 0
+        """**Количество записанных тем**"""
+        self.batches = 0
+        """**Количество записанных пачек**"""
+        self._writer = None
+
+    def write(self, record: dict, category_id: int = None) -> None:
+        """Добавить тему. Пачка записывается в файл, когда в буфере batch_size тем"""
+
+        self.columns.append(record, category_id)
+        if len(self.columns) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[dict], category_id: int = None) -> int:
+        """Добавить темы (список get_threads_extended или генератор iter_category_threads)
+
+        Returns:
+            Количество добавленных тем
+        """
+
+        count = 0
+        for record in records:
+            self.write(record, category_id)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """Записать буфер в файл"""
+
+        if not len(self.columns):
+            return
+        if self.format == 'npz':
+            root = os.path.splitext(self.path)[0]
+            numpy.savez_compressed(f"{root}-{self.batches:05d}.npz", **self.columns.to_numpy())
+        else:
+            batch = self.columns.to_arrow()
+            if self._writer is None:
+                self._writer = self._open(batch.schema)
+            self._writer.write_batch(batch)
+        self.rows += len(self.columns)
+        self.batches += 1
+        self.columns.clear()
+
+    def _open(self, schema: 'pyarrow.Schema'):
+        if self.format == 'parquet':
+            return pyarrow.parquet.ParquetWriter(self.path, schema, compression=self.compression or 'none')
+        # Словари только пополняются: в потоке пишутся дельты, а не словарь целиком на каждую пачку
+        options = pyarrow.ipc.IpcWriteOptions(compression=self.compression, emit_dictionary_deltas=True)
+        return pyarrow.ipc.new_stream(self.path, schema, options=options)
+
+    def close(self) -> None:
+        """Записать остаток буфера и закрыть файл"""
+
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> 'ThreadExporter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_npz(path: str) -> dict:
+    """Прочитать все части выгрузки npz ('threads.npz' -> threads-00000.npz, threads-00001.npz...)
+
+    Returns:
+        Словарь (dict) колонок, как ThreadColumns.to_numpy(). Значения словарей берутся из последней части
+    """
+
+    np = _require(numpy, 'numpy')
+    parts = sorted(glob.glob(f"{glob.escape(os.path.splitext(path)[0])}-[0-9][0-9][0-9][0-9][0-9].npz"))
+    if not parts:
+        raise FileNotFoundError(path)
+
+    chunks = {}
+    for part in parts:
+        with np.load(part) as data:
+            for name in data.files:
+                if name.endswith('.values'):
+                    chunks[name] = [data[name]]
+                else:
+                    chunks.setdefault(name, []).append(data[name])
+    return {name: np.concatenate(arrays) for name, arrays in chunks.items()}
@@ -0,0 +1,432 @@
+import asyncio
+from collections import Counter, defaultdict
+from hashlib import blake2b
+from random import Random
+from threading import Event, Thread
+from time import time
+
+from aiohttp import web
+
+from arz_api_extended.bypass_antibot.script import solve_native
+
+
+# Локальный сервер, изображающий форум на XenForo, для нагрузочного тестирования клиента.
+# Данные синтетические и строятся из ID: раздел c содержит темы c * 1000 + 1..threads_per_category,
+# тема t - сообщения t * 1000 + 1..posts_per_thread (+ ответы, отправленные через add-reply)
+
+THREADS_PER_PAGE = 20
+POSTS_PER_PAGE = 20
+NAMES = ('Vlad_Sokolov', 'Maks_Petrov', 'Ivan_Kuznetsov', 'Artem_Belov', 'Denis_Orlov', 'Kirill_Volkov', 'Egor_Lebedev', 'Nikita_Zaitsev')
+STYLES = (2, 3, 71, 72, 73, 74, 75, 76, 80, 84)
+PREFIXES = (None, ('На рассмотрении', 'label--orange'), ('Рассмотрено', 'label--green'), ('Закрыто', 'label--red'))
+SECURITY_ERROR = 'Произошла ошибка безопасности. Пожалуйста, обновите страницу и попробуйте снова.'
+NOT_FOUND = 'Запрашиваемая страница не может быть найдена.'
+
+
+def _name(user_id: int) -> str:
+    return f"{NAMES[user_id % len(NAMES)]}{user_id % 100}"
+
+
+def _username(user_id: int, tag: str = 'a') -> str:
+    href = f' href="/members/{user_id}/"' if tag == 'a' else ''
+    return f'<{tag}{href} class="username " dir="auto" data-user-id="{user_id}" data-xf-init="member-tooltip"><span class="username--style{STYLES[user_id % len(STYLES)]}">{_name(user_id)}</span></{tag}>'
+
+
+def _time(timestamp: int, css: str = 'u-dt') -> str:
+    return f'<time class="{css}" dir="auto" datetime="2023-11-14T12:00:00+0300" data-time="{timestamp}" title="14 ноя 2023 в 12:00">14 ноя 2023</time>'
+
+
+def _page_nav(base: str, pages: int) -> str:
+    items = ''.join(f'<li class="pageNav-page"><a href="{base}page-{page}">{page}</a></li>' for page in sorted({1, pages}))
+    return f'<div class="pageNav"><ul class="pageNav-main">{items}</ul></div>'
+
+
+def _pages(count: int, per_page: int) -> int:
+    return max(1, -(-count // per_page))
+
+
+class LocalForum:
+    """Локальный сервер на aiohttp с маршрутами форума, которые использует ArizonaAPI / AsyncArizonaAPI
+
+    Отдает разделы, темы, сообщения, профили, уведомления, поиск и CSRF токен из синтетических данных,
+    показывает страницу анти-бота до тех пор, пока клиент не решит задачу, проверяет _xfToken в POST запросах.
+    Задержка, ошибки сервера и 429 настраиваются, случайность детерминирована (seed)
+
+    Attributes:
+        latency (float): Задержка каждого ответа в секундах. По умолчанию 0 (необяз.)
+        jitter (float): Случайная добавка к задержке от 0 до jitter секунд. По умолчанию 0 (необяз.)
+        error_rate (float): Доля ответов 500/502/503. По умолчанию 0 (необяз.)
+        rate_limit_rate (float): Доля ответов 429 Too Many Requests. По умолчанию 0 (необяз.)
+        retry_after (int): Значение заголовка Retry-After в ответах 429. По умолчанию 1 (необяз.)
+        challenge_rate (float): Доля ответов со страницей анти-бота даже с верной cookie. По умолчанию 0 (необяз.)
+        threads_per_category (int): Количество тем в каждом разделе. По умолчанию 100 (необяз.)
+        posts_per_thread (int): Количество сообщений в каждой теме. По умолчанию 45 (необяз.)
+        user_id (int): ID "авторизованного" пользователя. По умолчанию 1 (необяз.)
+        seed (int): Зерно генератора случайных чисел. По умолчанию 0 (необяз.)
+
+    Пример:
+        async with LocalForum(latency=0.05, rate_limit_rate=0.01) as forum:
+            async with AsyncArizonaAPI(user_agent, {}, cookie_store=None, base_url=forum.url) as api:
+                thread = await api.get_thread(412001)
+            print(forum.stats)
+    """
+
+    def __init__(self, latency: float = 0, jitter: float = 0, error_rate: float = 0, rate_limit_rate: float = 0, retry_after: int = 1, challenge_rate: float = 0, threads_per_category: int = 100, posts_per_thread: int = 45, user_id: int = 1, seed: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.challenge_rate = challenge_rate
+        self.threads_per_category = threads_per_category
+        self.posts_per_thread = posts_per_thread
+        self.user_id = user_id
+
+        self.url = None
+        """Адрес запущенного сервера (для base_url)"""
+        self.stats = Counter()
+        """Количество ответов по кодам ('requests' - всего, 'challenge' - страниц анти-бота)"""
+        self.replies = defaultdict(list)
+        """Ответы, отправленные в темы через add-reply"""
+        self.alerts = []
+        """Уведомления (появляются после ответов в темы)"""
+        self.bumped = {}
+        """Время последнего ответа в темах (темы с ответами поднимаются наверх раздела, под закрепленные)"""
+        self.created = {}
+        """Время создания тем, добавленных через add_thread"""
+        self.closed = set()
+        """Темы, закрытые через close_thread"""
+
+        self._random = Random(seed)
+        self.antibot_cookie = None
+        """Значение cookie R3ACTLAB-ARZ1, которое принимает сервер"""
+        self.rotate_challenge()
+        self.token = f"{int(time())},{self._random.randbytes(16).hex()}"
+        """Текущий CSRF токен"""
+
+        self._runner = None
+        self._loop = None
+
+    def rotate_challenge(self) -> None:
+        """Сменить задачу анти-бота: выданные раньше cookie больше не принимаются"""
+
+        key, iv, cipher = (self._random.randbytes(16).hex() for _ in range(3))
+        self._challenge = (key, iv, cipher)
+        self.antibot_cookie = solve_native(key, iv, cipher)
+
+    def add_thread(self, category_id: int) -> int:
+        """Создать тему в разделе (тем становится больше во всех разделах)
+
+        Returns:
+            ID новой темы
+        """
+
+        self.threads_per_category += 1
+        thread_id = category_id * 1000 + self.threads_per_category
+        self.created[thread_id] = self.bumped[thread_id] = int(time())
+        return thread_id
+
+    def close_thread(self, thread_id: int) -> None:
+        """Закрыть тему"""
+
+        self.closed.add(thread_id)
+
+    def _is_closed(self, thread_id: int) -> bool:
+        return thread_id % 1000 % 7 == 3 or thread_id in self.closed
+
+    def _thread_exists(self, thread_id: int) -> bool:
+        return thread_id > 1000 and 1 <= thread_id % 1000 <= self.threads_per_category
+
+    def _posts(self, thread_id: int) -> list:
+        return [thread_id * 1000 + i for i in range(1, self.posts_per_thread + 1)] + [post_id for post_id, _ in self.replies[thread_id]]
+
+    def _thread_item(self, thread_id: int) -> str:
+        index, creator, last = thread_id % 1000, thread_id % 9973 + 2, thread_id % 7919 + 2
+        prefix = PREFIXES[index % len(PREFIXES)]
+        statuses = ''
+        if self._is_closed(thread_id): statuses += '<li><i class="structItem-status structItem-status--locked" title="Закрыта"></i></li>'
+        if index <= 2: statuses += '<li><i class="structItem-status structItem-status--sticky" title="Закреплено"></i></li>'
+        label = f'<a href="/forums/{thread_id // 1000}/?prefix_id=1" class="labelLink"><span class="label {prefix[1]}" dir="auto">{prefix[0]}</span></a> ' if prefix else ''
+        return f'''<div class="structItem structItem--thread js-threadListItem-{thread_id}">
+<div class="structItem-cell structItem-cell--main"><ul class="structItem-statuses">{statuses}</ul>
+<div class="structItem-title">{label}<a href="/threads/{thread_id}/" data-tp-primary="on">Тема #{thread_id} от {_name(creator)}</a></div>
+<div class="structItem-minor"><ul class="structItem-parts"><li>{_username(creator)}</li><li class="structItem-startDate"><a href="/threads/{thread_id}/">{_time(self.created.get(thread_id, 1700000000 + thread_id))}</a></li></ul></div></div>
+<div class="structItem-cell structItem-cell--latest"><a href="/threads/{thread_id}/latest">{_time(self.bumped.get(thread_id, 1700500000 + thread_id), 'structItem-latestDate u-dt')}</a><div class="structItem-minor">{_username(last)}</div></div>
+</div>'''
+
+    def _forum_content(self, category_id: int, page: int) -> str:
+        ids = sorted(range(category_id * 1000 + 1, category_id * 1000 + self.threads_per_category + 1), key=lambda thread_id: (thread_id % 1000 > 2, -self.bumped.get(thread_id, 0)))
+        ids = ids[(page - 1) * THREADS_PER_PAGE:page * THREADS_PER_PAGE]
+        nodes = ''.join(f'<div class="node node--id{child} node--depth2 node--forum node--read"><h3 class="node-title"><a href="/forums/{child}/">Раздел {child}</a></h3></div>' for child in range(category_id * 10 + 1, category_id * 10 + 4)) if category_id < 100 else ''
+        nav = _page_nav(f"/forums/{category_id}/", _pages(self.threads_per_category, THREADS_PER_PAGE))
+        return f'<div class="block block--category">{nodes}</div><div class="block">{nav}<div class="structItemContainer">{"".join(self._thread_item(thread_id) for thread_id in ids)}</div>{nav}</div>'
+
+    def _post(self, post_id: int, thread_id: int, text: str = None) -> str:
+        creator = post_id % 8191 + 2
+        text = text or f'Сообщение #{post_id} в теме {thread_id}.<br />\nТекст &lt;жалобы&gt; &amp; <b>доказательства</b>.'
+        return f'''<article class="message message--post js-post" data-author="{_name(creator)}" data-content="post-{post_id}" id="js-post-{post_id}">
+<div class="message-cell message-cell--user"><h4 class="message-name">{_username(creator)}</h4></div>
+<div class="message-cell message-cell--main"><ul class="message-attribution-main"><li><a href="/threads/{thread_id}/post-{post_id}">{_time(1700000000 + post_id % 10000000)}</a></li></ul>
+<article class="message-body"><div class="bbWrapper">{text}</div></article></div>
+</article>'''
+
+    def _thread_content(self, thread_id: int, page: int) -> str:
+        posts = self._posts(thread_id)
+        texts = dict(self.replies[thread_id])
+        nav = _page_nav(f"/threads/{thread_id}/", _pages(len(posts), POSTS_PER_PAGE))
+        status = '<dl class="blockStatus"><dt>Статус</dt><dd>Закрыта</dd></dl>' if self._is_closed(thread_id) else ''
+        articles = ''.join(self._post(post_id, thread_id, texts.get(post_id)) for post_id in posts[(page - 1) * POSTS_PER_PAGE:page * POSTS_PER_PAGE])
+        return f'{status}<div class="block block--messages">{nav}<div class="block-body">{articles}</div>{nav}</div>'
+
+    def _thread_h1(self, thread_id: int) -> str:
+        prefix = PREFIXES[thread_id % 1000 % len(PREFIXES)]
+        label = f'<span class="label {prefix[1]}" dir="auto">{prefix[0]}</span><span class="label-append">&nbsp;</span>' if prefix else ''
+        return f'{label}Тема #{thread_id} от {_name(thread_id % 9973 + 2)}'
+
+    def _member_content(self, user_id: int) -> str:
+        return f'''<div class="memberHeader">
+<span class="memberHeader-avatar"><a href="/data/avatars/o/{user_id // 1000}/{user_id}.jpg" class="avatar avatar--l" data-user-id="{user_id}"><img src="/data/avatars/l/{user_id // 1000}/{user_id}.jpg" alt="{_name(user_id)}" /></a></span>
+<h1 class="memberHeader-name">{_username(user_id, 'span')}</h1>
+<div class="memberHeader-banners"><em class="userBanner userBanner--staff"><strong>Игрок</strong></em></div>
+<div class="memberHeader-blurb"><span class="userTitle" dir="auto">Пользователь #{user_id}</span></div>
+<dl class="pairs pairs--rows pairs--rows--centered fauxBlockLink"><dt>Сообщения</dt><dd><a href="/search/member?user_id={user_id}">{user_id % 5000:,}</a></dd></dl>
+<dl class="pairs pairs--rows pairs--rows--centered"><dt>Реакции</dt><dd>{user_id % 3000:,}</dd></dl>
+<dl class="pairs pairs--rows pairs--rows--centered fauxBlockLink"><dt>Баллы</dt><dd><a href="/members/{user_id}/trophies">{user_id % 200}</a></dd></dl>
+</div>'''
+
+    def _profile_post(self, post_id: int) -> str:
+        creator = post_id % 4093 + 2
+        return f'''<article class="message message--simple" data-author="{_name(creator)}" id="js-profilePost-{post_id}">
+<div class="message-cell message-cell--main">{_username(creator)}<article class="message-body"><div class="bbWrapper">Сообщение профиля #{post_id}</div></article>
+<a href="/profile-posts/{post_id}/">{_time(1700000000 + post_id % 10000000)}</a></div>
+</article>'''
+
+    def _alerts_content(self) -> str:
+        items = ''.join(f'''<li data-alert-id="{alert_id}" class="alert block-row{' is-unread' if unread else ''} js-alert">
+<div class="contentRow"><div class="contentRow-main">{_username(sender)} ответил(а) в теме <a href="/threads/{thread_id}/unread" class="fauxBlockLink-blockLink">Тема #{thread_id}</a>.
+<div class="contentRow-minor">{_time(timestamp)}</div></div></div></li>''' for alert_id, sender, thread_id, timestamp, unread in reversed(self.alerts))
+        return f'<ol class="listPlain alertsList">{items}</ol>'
+
+    def _search_content(self, query: str) -> str:
+        rows = []
+        for index in range(1, min(self.threads_per_category, THREADS_PER_PAGE) + 1):
+            thread_id, creator = 412000 + index, index + 2
+            rows.append(f'''<li class="block-row block-row--separated" data-author="{_name(creator)}"><div class="contentRow-main">
+<h3 class="contentRow-title"><a href="/threads/{thread_id}/">Тема #{thread_id}: {query}</a></h3>
+<div class="contentRow-snippet">Найдено по запросу {query}</div>
+<ul class="listInline"><li>{_username(creator)}</li><li>{_time(1700000000 + thread_id)}</li><li>Ответы: {index % 17}</li><li>Раздел: <a href="/forums/412/">Раздел 412</a></li></ul>
+</div></li>''')
+        return f'<ol class="block-body">{"".join(rows)}</ol>'
+
+    def _statistic_content(self) -> str:
+        return f'''<div class="block-body">
+<dl class="pairs pairs--justified count--threads"><dt>Темы</dt><dd>{self.threads_per_category * 1000:,}</dd></dl>
+<dl class="pairs pairs--justified count--messages"><dt>Сообщения</dt><dd>{self.threads_per_category * self.posts_per_thread * 1000:,}</dd></dl>
+<dl class="pairs pairs--justified count--users"><dt>Пользователи</dt><dd>{987654:,}</dd></dl>
+<dl class="pairs pairs--justified"><dt>Новый пользователь</dt><dd>{_username(987654)}</dd></dl>
+</div>'''
+
+    def _html(self, body: str, content_key: str = '', container_key: str = '', headers: dict = None) -> web.Response:
+        html = f'''<!DOCTYPE html>
+<html id="XF" lang="ru-RU" data-container-key="{container_key}" data-content-key="{content_key}" data-logged-in="true" data-csrf="{self.token}">
+<head><meta charset="utf-8" /><title>Форум</title><script>XF.config = {{ csrf: '{self.token}', time: {{ now: {int(time())} }} }};</script></head>
+<body><div class="p-navgroup p-account"><a href="/account/" class="p-navgroup-link"><span class="avatar avatar--xxs" data-user-id="{self.user_id}"></span><span class="p-navgroup-linkText">{_name(self.user_id)}</span></a></div>
+<div class="p-body">{body}</div></body></html>'''
+        return web.Response(text=html, content_type='text/html', headers=headers)
+
+    def _json(self, content: str, title: str, h1: str = None) -> web.Response:
+        return web.json_response({'status': 'ok', 'html': {'content': content, 'title': title, 'h1': h1 or title}, 'visitor': {'alerts_unviewed': str(len(self.alerts))}})
+
+    @staticmethod
+    def _error(message: str, status: int) -> web.Response:
+        return web.json_response({'status': 'error', 'errors': [message]}, status=status)
+
+    @staticmethod
+    def _page(request: web.Request) -> int:
+        return int(request.match_info.get('page') or 1)
+
+    def _challenge_page(self) -> web.Response:
+        key, iv, cipher = self._challenge
+        return web.Response(text=f'<html><body><script>var _0x2a6d=["\\x72\\x65\\x70\\x6C\\x61\\x63\\x65","\\x30","\\x74\\x6F\\x4C\\x6F\\x77\\x65\\x72\\x43\\x61\\x73\\x65","{key}","{iv}","{cipher}","\\x63\\x6F\\x6F\\x6B\\x69\\x65","\\x52\\x33\\x41\\x43\\x54\\x4C\\x41\\x42\\x2D\\x41\\x52\\x5A\\x31\\x3D"];</script></body></html>', content_type='text/html')
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.Response:
+        self.stats['requests'] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            response = web.Response(status=429, text='Too Many Requests', headers={'Retry-After': str(self.retry_after)})
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status = self._random.choice((500, 502, 503))
+            response = web.Response(status=status, text=f'<html><body><h1>{status}</h1></body></html>', content_type='text/html')
+        elif request.cookies.get('R3ACTLAB-ARZ1') != self.antibot_cookie or roll < self.rate_limit_rate + self.error_rate + self.challenge_rate:
+            self.stats['challenge'] += 1
+            response = self._challenge_page()
+        elif request.method == 'POST' and (await request.post()).get('_xfToken') != self.token:
+            response = self._error(SECURITY_ERROR, 400)
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as exception:
+                response = exception
+
+        self.stats[response.status] += 1
+        return response
+
+    async def _index(self, request: web.Request) -> web.Response:
+        return self._html(self._statistic_content())
+
+    async def _terms(self, request: web.Request) -> web.Response:
+        return self._html('<div class="block-body">Правила форума</div>')
+
+    async def _forum(self, request: web.Request) -> web.Response:
+        category_id, page = int(request.match_info['id']), self._page(request)
+        if request.query.get('_xfResponseType') == 'json':
+            return self._json(self._forum_content(category_id, page), f'Раздел {category_id}')
+
+        parent = f'/forums/{category_id // 10}/' if category_id >= 10 else '/categories/general.1/'
+        breadcrumbs = f'<ul class="p-breadcrumbs"><li><a href="/">Форумы</a></li><li><a href="{parent}">Родитель</a></li></ul>'
+        return self._html(breadcrumbs + self._forum_content(category_id, page), container_key=f'node-{category_id}')
+
+    async def _thread(self, request: web.Request) -> web.Response:
+        thread_id, page = int(request.match_info['id']), self._page(request)
+        if not self._thread_exists(thread_id):
+            return self._error(NOT_FOUND, 404)
+        if request.query.get('_xfResponseType') == 'json':
+            return self._json(self._thread_content(thread_id, page), f'Тема #{thread_id}', self._thread_h1(thread_id))
+        return self._html(f'<h1 class="p-title-value">{self._thread_h1(thread_id)}</h1>' + self._thread_content(thread_id, page), f'thread-{thread_id}', f'node-{thread_id // 1000}')
+
+    async def _post_page(self, request: web.Request) -> web.Response:
+        post_id = int(request.match_info['id'])
+        thread_id = post_id // 1000
+        posts = self._posts(thread_id) if self._thread_exists(thread_id) else []
+        if post_id not in posts:
+            return self._html('<div class="blockMessage">Запрашиваемое сообщение не может быть найдено.</div>')
+        page = posts.index(post_id) // POSTS_PER_PAGE + 1
+        return self._html(self._thread_content(thread_id, page), f'thread-{thread_id}', f'node-{thread_id // 1000}')
+
+    async def _reply(self, request: web.Request) -> web.Response:
+        thread_id = int(request.match_info['id'])
+        if not self._thread_exists(thread_id):
+            return self._error(NOT_FOUND, 404)
+
+        post_id = thread_id * 1000 + len(self._posts(thread_id)) + 1
+        self.replies[thread_id].append((post_id, (await request.post()).get('message_html', '')))
+        self.bumped[thread_id] = int(time())
+        self.alerts.append((len(self.alerts) + 1, self.user_id + 1, thread_id, int(time()), True))
+        return web.json_response({'status': 'ok', 'message': 'Ваше сообщение было опубликовано.'})
+
+    async def _member(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info['id'])
+        if 'page' in request.match_info:
+            start = user_id * 100 + (self._page(request) - 1) * 20
+            return self._json(''.join(self._profile_post(post_id) for post_id in range(start + 1, start + 21)), _name(user_id))
+        return self._json(self._member_content(user_id), _name(user_id))
+
+    async def _profile_post_page(self, request: web.Request) -> web.Response:
+        post_id = int(request.match_info['id'])
+        return self._html(f'<h1 class="p-title-value">{_username(post_id // 100, "span")}</h1>' + self._profile_post(post_id))
+
+    async def _alerts(self, request: web.Request) -> web.Response:
+        content = self._alerts_content()
+        etag = f'"{blake2b(content.encode(), digest_size=8).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return self._html(content, headers={'ETag': etag})
+
+    async def _alert_toggle(self, request: web.Request) -> web.Response:
+        ids = {int(alert_id) for alert_id in (await request.post()).getall('alert_id', [])}
+        self.alerts = [(alert_id, sender, thread_id, timestamp, unread and alert_id not in ids) for alert_id, sender, thread_id, timestamp, unread in self.alerts]
+        return web.json_response({'status': 'ok'})
+
+    async def _search(self, request: web.Request) -> web.Response:
+        return self._html(self._search_content(request.query.get('q', '')))
+
+    async def _ok(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok'})
+
+    def make_app(self) -> web.Application:
+        """Приложение aiohttp с маршрутами форума"""
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/', self._index)
+        app.router.add_get('/account', self._index)
+        app.router.add_get('/account/', self._index)
+        app.router.add_get('/help/terms/', self._terms)
+        app.router.add_get(r'/forums/{id:\d+}', self._forum)
+        app.router.add_get(r'/forums/{id:\d+}/', self._forum)
+        app.router.add_get(r'/forums/{id:\d+}/page-{page:\d+}', self._forum)
+        app.router.add_get(r'/threads/{id:\d+}', self._thread)
+        app.router.add_get(r'/threads/{id:\d+}/', self._thread)
+        app.router.add_get(r'/threads/{id:\d+}/page-{page:\d+}', self._thread)
+        app.router.add_post(r'/threads/{id:\d+}/add-reply', self._reply)
+        app.router.add_get(r'/posts/{id:\d+}', self._post_page)
+        app.router.add_get(r'/posts/{id:\d+}/', self._post_page)
+        app.router.add_get(r'/members/{id:\d+}', self._member)
+        app.router.add_get(r'/members/{id:\d+}/', self._member)
+        app.router.add_get(r'/members/{id:\d+}/page-{page:\d+}', self._member)
+        app.router.add_get(r'/profile-posts/{id:\d+}', self._profile_post_page)
+        app.router.add_get(r'/profile-posts/{id:\d+}/', self._profile_post_page)
+        app.router.add_get('/account/alerts', self._alerts)
+        app.router.add_post('/account/alert-toggle', self._alert_toggle)
+        app.router.add_get('/search/{id}/', self._search)
+        app.router.add_post('/{path:.*}', self._ok)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Запустить сервер в текущем цикле событий (port=0 - свободный порт)
+
+        Returns:
+            Адрес сервера
+        """
+
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.url = "http://%s:%d" % self._runner.addresses[0][:2]
+        return self.url
+
+    async def stop(self) -> None:
+        """Остановить сервер"""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'LocalForum':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def start_in_thread(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Запустить сервер в фоновом потоке (для синхронного ArizonaAPI)
+
+        Returns:
+            Адрес сервера
+        """
+
+        ready = Event()
+
+        def run():
+            # stop_thread сбрасывает self._loop, поэтому поток работает со своей ссылкой на цикл
+            loop = self._loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start(host, port))
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        Thread(target=run, daemon=True).start()
+        ready.wait()
+        return self.url
+
+    def stop_thread(self) -> None:
+        """Остановить сервер, запущенный через start_in_thread"""
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
@@ -1,3 +1,4 @@
+from .base import *
 from .category_object import *
 from .member_object import *
 from .other import *
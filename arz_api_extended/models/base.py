@@ -0,0 +1,139 @@
+from typing import TYPE_CHECKING
+
+from arz_api_extended.consts import MAIN_URL
+
+if TYPE_CHECKING:
+    from arz_api_extended import ArizonaAPI
+
+
+MODELS = {}
+"""Классы моделей по имени (для вложенных моделей в from_dict)"""
+
+
+class Model:
+    """Основа моделей: __slots__ вместо __dict__, to_dict / from_dict, сравнение и хэш по ID, pickle без API
+
+    API (ArizonaAPI / AsyncArizonaAPI) необязателен: модель без него - просто данные (например, после pickle
+    в другой процесс), методы-действия становятся доступны после bind(api).
+    freeze() делает объект неизменяемым (класс Model.Frozen)
+    """
+
+    __slots__ = ('API',)
+
+    FIELDS = ()
+    """Поля модели"""
+    TYPES = {}
+    """Типы полей для from_dict: имя модели (вложенная модель) или функция преобразования"""
+    ENTITY = None
+    """Тип сущности для сравнения по ID (у Member и CurrentMember одинаковый)"""
+
+    def __init_subclass__(cls, frozen: bool = False, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if frozen:
+            return
+
+        MODELS[cls.__name__] = cls
+        cls.Frozen = type(cls.__name__, (cls,), {
+            '__slots__': (), '__module__': cls.__module__, '__qualname__': f"{cls.__qualname__}.Frozen",
+            '__setattr__': _frozen_setattr, '__delattr__': _frozen_setattr
+        }, frozen=True)
+
+    def bind(self, API: 'ArizonaAPI') -> 'Model':
+        """Привязать объект API (для моделей из from_dict / pickle)
+
+        Returns:
+            Этот же объект
+        """
+
+        object.__setattr__(self, 'API', API)
+        return self
+
+    def freeze(self) -> 'Model':
+        """Сделать объект неизменяемым (изменение полей вызывает AttributeError)
+
+        Returns:
+            Этот же объект
+        """
+
+        if not self.is_frozen:
+            object.__setattr__(self, '__class__', type(self).Frozen)
+        return self
+
+    @property
+    def is_frozen(self) -> bool:
+        return type(self).__setattr__ is _frozen_setattr
+
+    @property
+    def _base_url(self) -> str:
+        # Адрес форума клиента (base_url), для модели без API - основной форум
+        return MAIN_URL if self.API is None else self.API.base_url
+
+    def _values(self):
+        # object.__getattribute__ не вызывает __getattr__, поэтому незагруженные поля заглушки пропускаются
+        for field in self.FIELDS:
+            try: yield field, object.__getattribute__(self, field)
+            except AttributeError: pass
+
+    def to_dict(self) -> dict:
+        """Поля модели в виде словаря (вложенные модели - тоже словари, HTML - строки)"""
+
+        return {field: _dump(value) for field, value in self._values()}
+
+    @classmethod
+    def from_dict(cls, data: dict, API: 'ArizonaAPI' = None, frozen: bool = False) -> 'Model':
+        """Создать модель из словаря to_dict (без запросов к форуму)
+
+        Attributes:
+            data (dict): Поля модели
+            API (ArizonaAPI): Объект API (необяз.)
+            frozen (bool): Создать неизменяемый объект. По умолчанию False (необяз.)
+        """
+
+        model = object.__new__(cls.Frozen if frozen else cls)
+        object.__setattr__(model, 'API', API)
+        for field in cls.FIELDS:
+            if field not in data:
+                continue
+            value = data[field]
+            kind = cls.TYPES.get(field)
+            if value is not None and kind is not None:
+                value = MODELS[kind].from_dict(value, API, frozen) if isinstance(kind, str) else kind(value)
+            object.__setattr__(model, field, value)
+        return model
+
+    def __getstate__(self) -> dict:
+        return dict(self._values())
+
+    def __setstate__(self, state: dict) -> None:
+        object.__setattr__(self, 'API', None)
+        for field, value in state.items():
+            object.__setattr__(self, field, value)
+
+    def _key(self) -> tuple:
+        return self.ENTITY or type(self).__name__, object.__getattribute__(self, 'id')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Model):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{field}={value!r}" for field, value in self._values() if not isinstance(value, (Model, list)))
+        return f"{type(self).__name__}({fields})"
+
+
+def _frozen_setattr(self, name: str, value=None) -> None:
+    raise AttributeError(f"'{type(self).__name__}' заморожен, поле '{name}' нельзя изменить")
+
+
+def _dump(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    return str(value)
@@ -1,12 +1,14 @@
 from requests import Response
 from typing import TYPE_CHECKING
-from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models.base import Model
 
 if TYPE_CHECKING:
     from arz_api_extended import ArizonaAPI
 
 
-class Category:
+class Category(Model):
+    __slots__ = FIELDS = ('id', 'title', 'pages_count')
+
     def __init__(self, API: 'ArizonaAPI', id: int, title: str, pages_count: int) -> None:
         self.API = API
         self.id = id
@@ -15,8 +17,11 @@ class Category:
         """**Название категории**"""
         self.pages_count = pages_count
         """**Количество страниц в категории**"""
-        self.url = f"{MAIN_URL}/forums/{self.id}/"
+
+    @property
+    def url(self) -> str:
         """Ссылка на объект"""
+        return f"{self._base_url}/forums/{self.id}/"
 
 
     def create_thread(self, title: str, message_html: str, discussion_type: str = 'discussion', watch_thread: int = 1) -> Response:
@@ -102,6 +107,21 @@ class Category:
         return self.API.get_threads_extended(self.id, page)
 
 
+    def iter_threads(self, extended: bool = True, start_page: int = 1, prefetch: int = 2):
+        """Обойти все темы раздела с фоновой загрузкой следующих страниц
+
+        Attributes:
+            extended (bool): Отдавать темы с дополнительной информацией. По умолчанию True (необяз.)
+            start_page (int): Страница, с которой начинается обход. По умолчанию 1 (необяз.)
+            prefetch (int): Сколько страниц загружать заранее. По умолчанию 2 (необяз.)
+
+        Returns:
+            Генератор словарей (dict) с информацией о темах
+        """
+
+        return self.API.iter_category_threads(self.id, extended, start_page, prefetch)
+
+
     def get_categories(self) -> list:
         """Получить дочерние категории из раздела
         
@@ -1,15 +1,24 @@
-from bs4 import BeautifulSoup
+from inspect import iscoroutinefunction
 from requests import Response
 from re import compile
 from typing import TYPE_CHECKING
 
-from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models.base import Model
 
 if TYPE_CHECKING:
     from arz_api_extended.api import ArizonaAPI
 
 
-class Member:
+PROFILE_FIELDS = ('user_title', 'avatar', 'roles', 'messages_count', 'reactions_count', 'trophies_count', 'username_color')
+"""Поля профиля, которые у заглушки Member загружаются при первом обращении"""
+
+
+class Member(Model):
+    __slots__ = ('id', 'username') + PROFILE_FIELDS + ('hydrated',)
+
+    FIELDS = __slots__
+    ENTITY = 'member'
+
     def __init__(self, API : 'ArizonaAPI', id: int, username: str, user_title: str, avatar: str, roles: list, messages_count: int, reactions_count: int, trophies_count: int, username_color: str) -> None:
         self.API = API
         self.id = id
@@ -32,9 +41,67 @@ class Member:
 
         self.username_color = username_color
 
-        self.url = f"{MAIN_URL}/members/{self.id}/"
+        self.hydrated = True
+        """Загружены ли поля профиля (False - заглушка из ID и ника со страницы)"""
+
+
+    @classmethod
+    def stub(cls, API: 'ArizonaAPI', id: int, username: str) -> 'Member':
+        """Заглушка пользователя из ID и ника, которые уже есть на странице, без запроса профиля.
+        Поля профиля (messages_count, roles, ...) загружаются при первом обращении к ним
+
+        Attributes:
+            API (ArizonaAPI): Объект API
+            id (int): ID пользователя
+            username (str): Имя пользователя
+
+        Returns:
+            Объект Member
+        """
+
+        member = cls.__new__(cls)
+        member.API = API
+        member.id = id
+        member.username = username
+        member.hydrated = False
+        return member
+
+
+    @property
+    def url(self) -> str:
         """Ссылка на объект"""
-        
+        return f"{self._base_url}/members/{self.id}/"
+
+
+    def __getattr__(self, name: str):
+        # Вызывается только для отсутствующих атрибутов, т.е. для незагруженных полей заглушки
+        if name not in PROFILE_FIELDS or self.API is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        if iscoroutinefunction(self.API.hydrate_member):
+            raise AttributeError(f"Поле '{name}' еще не загружено, используйте await member.hydrate()")
+
+        self.hydrate()
+        return object.__getattribute__(self, name)
+
+
+    def hydrate(self):
+        """Загрузить поля профиля пользователя (для заглушки). Если профиль закрыт, поля остаются None
+
+        Returns:
+            Этот же объект Member (для AsyncArizonaAPI - корутина)
+        """
+
+        return self.API.hydrate_member(self)
+
+
+    def _fill(self, member: 'Member | None') -> None:
+        # object.__setattr__: загрузка профиля допустима и для замороженной заглушки
+        if member is not None:
+            object.__setattr__(self, 'username', member.username)
+        for field in PROFILE_FIELDS:
+            object.__setattr__(self, field, getattr(member, field) if member is not None else None)
+        object.__setattr__(self, 'hydrated', True)
+
 
     def follow(self) -> Response:
         """Изменить статус подписки на пользователя
@@ -80,6 +147,8 @@ class Member:
 
 
 class CurrentMember(Member):
+    __slots__ = ()
+
     follow = property(doc='Forbidden method for Current Member object')
     ignore = property(doc='Forbidden method for Current Member object')
 
@@ -93,17 +162,7 @@ class CurrentMember(Member):
             Объект Response модуля requests
         """
 
-        with open(upload_photo, 'rb') as image:
-            file_dict = {'upload': (upload_photo, image.read())}
-        
-        token = BeautifulSoup(self.API.session.get(f"{MAIN_URL}/help/terms/").content, 'lxml').find('html')['data-csrf']
-        data = {
-            "avatar_crop_x": 0, 
-            "avatar_crop_y": 0,
-            "_xfToken": token, 
-            "use_custom": 1,
-        }
-        return self.API.session.post(f"{MAIN_URL}/account/avatar", files=file_dict, data=data)
+        return self.API.edit_avatar(upload_photo)
     
 
     def delete_avatar(self) -> Response:
@@ -112,17 +171,7 @@ class CurrentMember(Member):
         Returns:
             Объект Response модуля requests
         """
-        token = BeautifulSoup(self.API.session.get(f"{MAIN_URL}/help/terms/").content, 'lxml').find('html')['data-csrf']
-        file_dict = {'upload': ("", "")}
-        data = {
-            "avatar_crop_x": 0, 
-            "avatar_crop_y": 0,
-            "_xfToken": token, 
-            "use_custom": 1,
-            "delete_avatar": 1
-        }
-
-        return self.API.session.post(f"{MAIN_URL}/account/avatar", files=file_dict, data=data)
+        return self.API.delete_avatar()
 
     # TODO:
     #def get_last_notifications(self, time_offset: int = 86400, limit: int = 100), change_avatar(), change_banner()
@@ -1,14 +1,75 @@
 from typing import TYPE_CHECKING
 
+from bs4 import BeautifulSoup, Tag
+
+from arz_api_extended.models.base import Model
+
 if TYPE_CHECKING:
     from arz_api_extended import ArizonaAPI
     from arz_api_extended.models.member_object import Member
 
 
-class Statistic:
+class Statistic(Model):
+    __slots__ = FIELDS = ('threads_count', 'posts_count', 'users_count', 'last_register_member')
+    TYPES = {'last_register_member': 'Member'}
+
     def __init__(self, API: 'ArizonaAPI', threads_count: int, posts_count: int, users_count: int, last_register_member: 'Member') -> None:
         self.API = API
         self.threads_count = threads_count
         self.posts_count = posts_count
         self.users_count = users_count
         self.last_register_member = last_register_member
+
+    def _key(self) -> tuple:
+        # У статистики нет ID, сравнивается по значениям
+        return ('statistic',) + tuple(value for _, value in self._values())
+
+
+
+class HtmlFragment:
+    """HTML фрагмент страницы (содержимое сообщения / темы), хранится строкой
+
+    Дерево разбора страницы освобождается сразу после разбора. Tag BeautifulSoup создается только
+    при обращении к .tag или к его методам (fragment.find_all('a'), fragment.text...)
+    """
+
+    __slots__ = ('html', '_tag')
+
+    def __init__(self, html: str) -> None:
+        self.html = str(html)
+        """**HTML фрагмента**"""
+        self._tag = None
+
+    @property
+    def tag(self) -> Tag:
+        """Tag BeautifulSoup фрагмента (создается при первом обращении)"""
+
+        if self._tag is None:
+            soup = BeautifulSoup(self.html, 'lxml')
+            self._tag = soup.body.find(True) if soup.body is not None else soup
+        return self._tag
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.tag, name)
+
+    def __str__(self) -> str:
+        return self.html
+
+    def __repr__(self) -> str:
+        return f"HtmlFragment({self.html[:60]!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HtmlFragment):
+            return self.html == other.html
+        return self.html == str(other) if isinstance(other, (str, Tag)) else NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.html)
+
+    def __getstate__(self):
+        return self.html
+
+    def __setstate__(self, html: str) -> None:
+        self.html, self._tag = html, None
@@ -1,13 +1,17 @@
 from requests import Response
 from typing import TYPE_CHECKING
-from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models.base import Model
+from arz_api_extended.models.other import HtmlFragment
 
 if TYPE_CHECKING:
     from arz_api_extended import ArizonaAPI
     from arz_api_extended.models import Member, Thread
 
 
-class Post:
+class Post(Model):
+    __slots__ = FIELDS = ('id', 'creator', 'thread', 'create_date', 'bb_content', 'text_content')
+    TYPES = {'creator': 'Member', 'thread': 'Thread', 'bb_content': HtmlFragment}
+
     def __init__(self, API: 'ArizonaAPI', id: int, creator: 'Member', thread: 'Thread', create_date: int, bb_content: str, text_content: str) -> None:
         self.API = API
         self.id = id
@@ -18,12 +22,15 @@ class Post:
         """**Объект Thread темы, в которой оставлено сообщение**"""
         self.create_date = create_date
         """**Дата отправки сообщения в UNIX**"""
-        self.bb_content = bb_content
-        """**Сырое содержимое сообщения**"""
+        self.bb_content = HtmlFragment(bb_content)
+        """**Сырое содержимое сообщения** (HtmlFragment: str() - HTML, .tag - Tag BeautifulSoup)"""
         self.text_content = text_content
         """**Текст из сообщения**"""
-        self.url = f"{MAIN_URL}/posts/{self.id}/"
+
+    @property
+    def url(self) -> str:
         """Ссылка на объект"""
+        return f"{self._base_url}/posts/{self.id}/"
 
 
     def react(self, reaction_id: int = 1) -> Response:
@@ -75,7 +82,10 @@ class Post:
 
 
 
-class ProfilePost:
+class ProfilePost(Model):
+    __slots__ = FIELDS = ('id', 'creator', 'profile', 'create_date', 'bb_content', 'text_content')
+    TYPES = {'creator': 'Member', 'profile': 'Member', 'bb_content': HtmlFragment}
+
     def __init__(self, API: 'ArizonaAPI', id: int, creator: 'Member', profile: 'Member', create_date: int, bb_content: str, text_content: str) -> None:
         self.API = API
         self.id = id
@@ -86,12 +96,15 @@ class ProfilePost:
         """**Объект Member профиля, в котором оставлено сообщение**"""
         self.create_date = create_date
         """**Дата отправки сообщения в UNIX**"""
-        self.bb_content = bb_content
-        """**Сырое содержимое сообщения**"""
+        self.bb_content = HtmlFragment(bb_content)
+        """**Сырое содержимое сообщения** (HtmlFragment: str() - HTML, .tag - Tag BeautifulSoup)"""
         self.text_content = text_content
         """**Текст из сообщения**"""
-        self.url = f"{MAIN_URL}/profile-posts/{self.id}/"
+
+    @property
+    def url(self) -> str:
         """Ссылка на объект"""
+        return f"{self._base_url}/profile-posts/{self.id}/"
 
 
     def react(self, reaction_id: int = 1) -> Response:
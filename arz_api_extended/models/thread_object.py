@@ -1,6 +1,7 @@
 from requests import Response
 from typing import TYPE_CHECKING
-from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models.base import Model
+from arz_api_extended.models.other import HtmlFragment
 
 if TYPE_CHECKING:
     from arz_api_extended.models.member_object import Member
@@ -8,7 +9,10 @@ if TYPE_CHECKING:
     from arz_api_extended import ArizonaAPI
 
 
-class Thread:
+class Thread(Model):
+    __slots__ = FIELDS = ('id', 'creator', 'create_date', 'title', 'prefix', 'content', 'content_html', 'pages_count', 'is_closed', 'thread_post_id')
+    TYPES = {'creator': 'Member', 'content_html': HtmlFragment}
+
     def __init__(self, API: 'ArizonaAPI', id: int, creator: 'Member', create_date: int, title: str, prefix: str, content: str, html_content: str, pages_content: int, thread_post_id: int, is_closed: bool) -> None:
         self.API = API
         self.id = id
@@ -23,16 +27,19 @@ class Thread:
         """**Префикс темы**"""
         self.content = content
         """**Текст из темы**"""
-        self.content_html = html_content
-        """**Сырой контент темы**"""
+        self.content_html = HtmlFragment(html_content)
+        """**Сырой контент темы** (HtmlFragment: str() - HTML, .tag - Tag BeautifulSoup)"""
         self.pages_count = pages_content
         """**Количество страниц с ответами в теме**"""
         self.is_closed = is_closed
         """**Закрыта ли тема**"""
         self.thread_post_id = thread_post_id
         """**ID сообщения темы (post_id)**"""
-        self.url = f"{MAIN_URL}/threads/{self.id}/"
+
+    @property
+    def url(self) -> str:
         """Ссылка на объект"""
+        return f"{self._base_url}/threads/{self.id}/"
     
 
     def answer(self, message_html: str) -> Response:
@@ -0,0 +1,18 @@
+from types import ModuleType
+
+from arz_api_extended.parsers import soup, xpath
+from arz_api_extended.parsers.soup import *
+
+
+BACKENDS = {'soup': soup, 'lxml': xpath}
+"""Бэкенды разбора страниц: 'soup' - эталонный на BeautifulSoup, 'lxml' - быстрый на скомпилированных XPath"""
+
+
+def get_parser(backend: str | ModuleType = 'lxml') -> ModuleType:
+    """Получить модуль бэкенда разбора по имени (или вернуть переданный модуль с функциями parse_*)"""
+
+    if isinstance(backend, ModuleType):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд разбора: {backend}. Доступные: {', '.join(BACKENDS)}")
+    return BACKENDS[backend]
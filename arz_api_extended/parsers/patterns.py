@@ -0,0 +1,40 @@
+from re import compile
+from typing import Iterable
+
+from arz_api_extended.consts import ROLE_COLOR
+
+
+# Заранее скомпилированные выражения, которые используют бэкенды разбора, и поиск цвета роли по классам ника
+
+DIGITS = compile(r'\d+')
+"""Число в ссылке (/threads/123/, /forums/45/)"""
+POST_ID = compile('js-post-*')
+"""id сообщения темы (js-post-123)"""
+PROFILE_POST_ID = compile('js-profilePost-*')
+"""id сообщения профиля (js-profilePost-123)"""
+THREAD_ITEM = compile('structItem structItem--thread.*')
+"""Класс темы в списке тем раздела"""
+FORUM_NODE = compile('.*node--depth2 node--forum.*')
+"""Класс дочернего раздела"""
+USERNAME = compile('username')
+"""Класс ника (username, username--style3...)"""
+ANSWERS = compile('Ответы: ')
+"""Количество ответов в результатах поиска"""
+FORUM_LINK = compile('/forums/')
+"""Ссылка на раздел"""
+
+STYLE_PRIORITY = {style: index for index, style in enumerate(ROLE_COLOR)}
+"""Порядок стилей в ROLE_COLOR: при нескольких подходящих стилях берется первый, как раньше"""
+
+
+def role_color(classes: Iterable[str]) -> str:
+    """Цвет ника по классам тега и его потомков (username--style76 -> ROLE_COLOR['style76'])
+
+    Один проход по классам и пересечение с ROLE_COLOR вместо поиска каждого стиля в HTML тега.
+    '#fff', если подходящего стиля нет
+    """
+
+    styles = {token.rpartition('--')[2] for token in classes} & STYLE_PRIORITY.keys()
+    if not styles:
+        return '#fff'
+    return ROLE_COLOR[min(styles, key=STYLE_PRIORITY.__getitem__)]
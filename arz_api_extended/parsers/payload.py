@@ -0,0 +1,55 @@
+from functools import cached_property
+from html import unescape
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+
+# Разбор ответов форума при _xfResponseType=json. JSON декодируется один раз (orjson, если установлен),
+# html.content / html.h1 передаются парсеру как есть: JSON уже раскодировал строку, а повторный
+# html.unescape копировал всю страницу и превращал экранированные &lt; &gt; в теги
+
+
+class JsonPage(dict):
+    """Декодированный JSON ответ форума. Ведет себя как dict (request['status'], request['html']['content']),
+    а фрагменты страницы (content, title, h1) вычисляются при первом обращении"""
+
+    @cached_property
+    def html(self) -> dict:
+        return self.get('html') or {}
+
+    @cached_property
+    def content(self) -> str:
+        """HTML основного содержимого страницы"""
+        return self.html.get('content') or ''
+
+    @cached_property
+    def title(self) -> str:
+        """Заголовок страницы (текст, сущности раскодированы)"""
+        return unescape(self.html.get('title') or '')
+
+    @cached_property
+    def h1(self) -> str:
+        """HTML заголовка h1 (с префиксом темы)"""
+        return self.html.get('h1') or ''
+
+
+def loads(content: bytes | str):
+    """Декодировать JSON ответ форума (dict оборачивается в JsonPage)"""
+
+    data = _loads(content)
+    return JsonPage(data) if isinstance(data, dict) else data
+
+
+def page_content(request: dict) -> str:
+    return request.content if isinstance(request, JsonPage) else request['html']['content']
+
+
+def page_title(request: dict) -> str:
+    return request.title if isinstance(request, JsonPage) else unescape(request['html']['title'])
+
+
+def page_h1(request: dict) -> str:
+    return request.h1 if isinstance(request, JsonPage) else request['html']['h1']
@@ -0,0 +1,390 @@
+from bs4 import BeautifulSoup, Tag
+
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.parsers.patterns import ANSWERS, DIGITS, FORUM_LINK, FORUM_NODE, POST_ID, PROFILE_POST_ID, THREAD_ITEM, USERNAME, role_color
+from arz_api_extended.parsers.payload import page_content, page_h1, page_title
+
+
+# Эталонный бэкенд разбора страниц на BeautifulSoup. Общий для ArizonaAPI и AsyncArizonaAPI:
+# на вход - ответ форума (JSON при _xfResponseType=json, иначе HTML), на выход - данные для моделей
+
+
+def _classes(tag: Tag) -> list:
+    """Классы тега и всех его потомков"""
+
+    classes = list(tag.get('class', ()))
+    for child in tag.find_all(class_=True):
+        classes.extend(child['class'])
+    return classes
+
+
+def parse_logged_in(content: bytes) -> bool:
+    """Авторизован ли пользователь на странице"""
+
+    return BeautifulSoup(content, 'lxml').find('html')['data-logged-in'] != "false"
+
+
+def parse_current_user_id(content: bytes) -> int:
+    """ID текущего пользователя со страницы /account"""
+
+    return int(BeautifulSoup(content, 'lxml').find('span', {'class': 'avatar--xxs'})['data-user-id'])
+
+
+def parse_category(request: dict) -> dict:
+    """Данные раздела из JSON ответа /forums/{id}"""
+
+    content = BeautifulSoup(page_content(request), 'lxml')
+    title = page_title(request)
+    try: pages_count = int(content.find_all('li', {'class': 'pageNav-page'})[-1].text)
+    except IndexError: pages_count = 1
+
+    return {'title': title, 'pages_count': pages_count}
+
+
+def parse_member(request: dict, user_id: int) -> dict:
+    """Данные пользователя из JSON ответа /members/{id}"""
+
+    content = BeautifulSoup(page_content(request), 'lxml')
+    username = page_title(request)
+
+    username_class = content.find('span', class_='username')
+    username_color = role_color(_classes(username_class)) if username_class else None
+
+    roles = []
+    for i in content.find('div', {'class': 'memberHeader-banners'}).children:
+        if i.text != '\n': roles.append(i.text)
+
+    try: user_title = content.find('span', {'class': 'userTitle'}).text
+    except AttributeError: user_title = None
+    try: avatar = MAIN_URL + content.find('a', {'class': 'avatar avatar--l'})['href']
+    except TypeError: avatar = None
+
+    messages_count = int(content.find('a', {'href': f'/search/member?user_id={user_id}'}).text.strip().replace(',', ''))
+    reactions_count = int(content.find('dl', {'class': 'pairs pairs--rows pairs--rows--centered'}).find('dd').text.strip().replace(',', ''))
+    trophies_count = int(content.find('a', {'href': f'/members/{user_id}/trophies'}).text.strip().replace(',', ''))
+
+    return {
+        'id': user_id, 'username': username, 'user_title': user_title, 'avatar': avatar, 'roles': roles,
+        'messages_count': messages_count, 'reactions_count': reactions_count, 'trophies_count': trophies_count,
+        'username_color': username_color
+    }
+
+
+def parse_thread(request: dict) -> dict:
+    """Данные темы из JSON ответа /threads/{id}/page-1 (создатель - только ID и имя)"""
+
+    content = BeautifulSoup(page_content(request), 'lxml')
+    content_h1 = BeautifulSoup(page_h1(request), 'lxml')
+
+    creator = content.find('a', {'class': 'username'})
+    create_date = int(content.find('time')['data-time'])
+
+    try:
+        prefix = content_h1.find('span', {'class': 'label'}).text
+        title = content_h1.text.strip(prefix).strip()
+
+    except AttributeError:
+        prefix = ""
+        title = content_h1.text
+    thread_content_html = content.find('div', {'class': 'bbWrapper'})
+    thread_content = thread_content_html.text
+
+    try: pages_count = int(content.find_all('li', {'class': 'pageNav-page'})[-1].text)
+    except IndexError: pages_count = 1
+
+    is_closed = False
+    if content.find('dl', {'class': 'blockStatus'}): is_closed = True
+    thread_post_id = content.find('article', {'id': POST_ID})['id'].strip('js-post-')
+
+    return {
+        'creator_id': int(creator['data-user-id']), 'creator_username': creator.text, 'create_date': create_date,
+        'title': title, 'prefix': prefix, 'content': thread_content, 'html_content': str(thread_content_html),
+        'pages_content': pages_count, 'thread_post_id': thread_post_id, 'is_closed': is_closed
+    }
+
+
+def _post_data(post: Tag, thread_id: int) -> dict:
+    user_info = post.find('a', {'data-xf-init': 'member-tooltip'})
+    bb_content = post.find('div', {'class': 'bbWrapper'})
+    return {
+        'creator_id': int(user_info['data-user-id']), 'creator_username': user_info.text,
+        'thread_id': thread_id,
+        'create_date': int(post.find('time', {'class': 'u-dt'})['data-time']),
+        'bb_content': str(bb_content), 'text_content': bb_content.text
+    }
+
+
+def parse_post(content: bytes, post_id: int) -> dict | None:
+    """Данные сообщения со страницы /posts/{id} (None - удалено / нет доступа)"""
+
+    content = BeautifulSoup(content, 'lxml')
+    post = content.find('article', {'id': f'js-post-{post_id}'})
+    if post is None:
+        return None
+
+    return _post_data(post, int(content.find('html')['data-content-key'].strip('thread-')))
+
+
+def parse_posts(content: bytes) -> dict:
+    """Все сообщения страницы темы (/posts/{id} отдает страницу темы с этим сообщением):
+    словарь ID -> данные как в parse_post (пустой - удалено / нет доступа)"""
+
+    content = BeautifulSoup(content, 'lxml')
+    html = content.find('html')
+    if html is None or not html.get('data-content-key', '').startswith('thread-'):
+        return {}
+
+    thread_id = int(html['data-content-key'].strip('thread-'))
+    return {int(post['id'].strip('js-post-')): _post_data(post, thread_id) for post in content.find_all('article', {'id': POST_ID})}
+
+
+def parse_profile_post(content: bytes, post_id: int) -> dict | None:
+    """Данные сообщения профиля со страницы /profile-posts/{id}"""
+
+    content = BeautifulSoup(content, 'lxml')
+    post = content.find('article', {'id': f'js-profilePost-{post_id}'})
+    if post is None:
+        return None
+
+    bb_content = post.find('div', {'class': 'bbWrapper'})
+    creator, profile = post.find('a', {'class': 'username'}), content.find('span', {'class': 'username'})
+    return {
+        'creator_id': int(creator['data-user-id']), 'creator_username': creator.text,
+        'profile_id': int(profile['data-user-id']), 'profile_username': profile.text,
+        'create_date': int(post.find('time')['data-time']),
+        'bb_content': str(bb_content), 'text_content': bb_content.text
+    }
+
+
+def parse_forum_statistic(content: bytes) -> dict:
+    """Статистика форума с главной страницы"""
+
+    content = BeautifulSoup(content, 'lxml')
+    last_register_member = content.find('dl', {'class': 'pairs pairs--justified'}).find('a')
+    return {
+        'threads_count': int(content.find('dl', {'class': 'pairs pairs--justified count--threads'}).find('dd').text.replace(',', '')),
+        'posts_count': int(content.find('dl', {'class': 'pairs pairs--justified count--messages'}).find('dd').text.replace(',', '')),
+        'users_count': int(content.find('dl', {'class': 'pairs pairs--justified count--users'}).find('dd').text.replace(',', '')),
+        'last_register_member_id': int(last_register_member['data-user-id']),
+        'last_register_member_username': last_register_member.text
+    }
+
+
+def parse_threads(request: dict) -> dict:
+    """Закрепленные ('pins') и незакрепленные ('unpins') темы из JSON ответа страницы раздела"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    result = {'pins': [], 'unpins': []}
+    for thread in soup.find_all('div', THREAD_ITEM):
+        link = thread.find_all('div', "structItem-title")[0].find_all("a")[-1]
+        thread_id = DIGITS.search(link['href'])
+        if thread_id is None: continue
+
+        if len(thread.find_all('i', {'title': 'Закреплено'})) > 0: result['pins'].append(int(thread_id.group()))
+        else: result['unpins'].append(int(thread_id.group()))
+
+    return result
+
+
+def parse_thread_records(request: dict) -> list:
+    """Темы страницы раздела в виде словарей {'thread_id', 'is_pinned'}"""
+
+    threads = parse_threads(request)
+    return [{'thread_id': thread_id, 'is_pinned': True} for thread_id in threads['pins']] + [{'thread_id': thread_id, 'is_pinned': False} for thread_id in threads['unpins']]
+
+
+def parse_threads_extended(request: dict) -> list:
+    """Темы с дополнительной информацией из JSON ответа страницы раздела"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    result = []
+    seen_thread_ids = set()
+
+    for thread in soup.find_all('div', class_=THREAD_ITEM):
+        link = thread.find('div', "structItem-title").find_all("a")[-1]
+        thread_id = int(DIGITS.search(link['href']).group())
+        if thread_id in seen_thread_ids:
+            continue
+        seen_thread_ids.add(thread_id)
+
+        thread_data = {}
+
+        username_author = thread.find('div', 'structItem-cell--main').find('div', 'structItem-minor').find('ul', 'structItem-parts').find('a', class_='username')
+        thread_data['username_author'] = username_author.text.strip() if username_author else None
+
+        thread_data['thread_title'] = link.text.strip()
+
+        prefix_label = thread.find('span', class_='label')
+        thread_data['prefix'] = prefix_label.text.strip() if prefix_label else None
+
+        if username_author:
+            thread_data['username_author_color'] = role_color(_classes(username_author))
+
+        created_date = thread.find('div', 'structItem-cell--main').find('div', 'structItem-minor').find('ul', 'structItem-parts').find('li', 'structItem-startDate').find('time', class_='u-dt').get('data-time')
+        thread_data['created_date'] = int(created_date) if created_date else None
+
+        last_message_username = thread.find('div', 'structItem-cell--latest').find('div', 'structItem-minor').find(class_=USERNAME)
+        thread_data['username_last_message'] = last_message_username.text.strip() if last_message_username else None
+
+        if last_message_username:
+            thread_data['username_last_message_color'] = role_color(_classes(last_message_username))
+
+        last_message_date = thread.find('div', 'structItem-cell--latest').find('time', class_='structItem-latestDate').get('data-time')
+        thread_data['last_message_date'] = int(last_message_date) if last_message_date else None
+
+        thread_data['thread_id'] = thread_id
+        thread_data['is_pinned'] = len(thread.find_all('i', {'title': 'Закреплено'})) > 0
+        thread_data['is_closed'] = len(thread.find_all('i', {'title': 'Закрыта'})) > 0
+
+        result.append(thread_data)
+
+    return result
+
+
+def parse_parent_category_id(content: bytes) -> str | None:
+    """ID родительского раздела со страницы раздела (None - раздел верхнего уровня)"""
+
+    content = BeautifulSoup(content, 'lxml')
+    parent_category_id = str(content.find('ul', {'class': 'p-breadcrumbs'}).find_all('li')[-1].find('a')['href'].split('/')[2])
+    if not parent_category_id.isdigit():
+        return None
+    return parent_category_id
+
+
+def parse_categories(request: dict) -> list:
+    """ID дочерних разделов из JSON ответа страницы раздела"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    return [int(DIGITS.search(category.find("a")['href']).group()) for category in soup.find_all('div', FORUM_NODE)]
+
+
+def parse_profile_messages(request: dict) -> list:
+    """ID сообщений со стенки пользователя из JSON ответа /members/{id}/page-N"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    return [int(post['id'].strip('js-profilePost-')) for post in soup.find_all('article', {'id': PROFILE_POST_ID})]
+
+
+def parse_first_post_id(content: bytes) -> str:
+    """ID первого сообщения (сообщения темы) со страницы темы"""
+
+    content = BeautifulSoup(content, 'lxml')
+    return content.find('article', {'id': POST_ID})['id'].strip('js-post-')
+
+
+def parse_thread_category_id(content: bytes) -> int | None:
+    """ID раздела, в котором создана тема, со страницы темы"""
+
+    content = BeautifulSoup(content, 'lxml')
+    creator_id = content.find('a', {'class': 'username'})
+    if creator_id is None: return None
+
+    return int(content.find('html')['data-container-key'].strip('node-'))
+
+
+def parse_thread_posts(request: dict) -> list:
+    """ID сообщений из JSON ответа страницы темы"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    return [i['id'].strip('js-post-') for i in soup.find_all('article', {'id': POST_ID})]
+
+
+def _pages_count(soup: BeautifulSoup) -> int:
+    try:
+        return int(soup.find('ul', {'class': 'pageNav-main'}).find_all('li', {'class': 'pageNav-page'})[-1].text)
+    except:
+        return 1
+
+
+def parse_thread_posts_page(request: dict) -> tuple:
+    """ID сообщений и количество страниц из JSON ответа страницы темы"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    posts = [i['id'].strip('js-post-') for i in soup.find_all('article', {'id': POST_ID})]
+    return posts, _pages_count(soup)
+
+
+def parse_thread_posts_full(request: dict, thread_id: int) -> tuple:
+    """Сообщения (словари как в parse_post и 'id') и количество страниц из JSON ответа страницы темы"""
+
+    soup = BeautifulSoup(page_content(request), "lxml")
+    posts = [{'id': int(post['id'].strip('js-post-')), **_post_data(post, thread_id)} for post in soup.find_all('article', {'id': POST_ID})]
+    return posts, _pages_count(soup)
+
+
+def parse_notifications(content: bytes) -> list:
+    """Уведомления со страницы /account/alerts"""
+
+    content = BeautifulSoup(content, 'lxml')
+    notifications = []
+
+    for alert in content.find_all('li', {'class': 'js-alert'}):
+        if not alert.has_attr('data-alert-id'):
+            continue
+
+        sender = None
+        username_link = alert.find('a', {'class': 'username'})
+        if username_link:
+            sender = {
+                'id': int(username_link.get('data-user-id', 0)),
+                'name': username_link.get_text(strip=True),
+                'avatar': None,
+                'avatar_color': None,
+                'initials': None
+            }
+
+            avatar_img = alert.find('img', {'class': 'avatar'})
+            avatar_span = alert.find('span', {'class': 'avatar-u'})
+
+            if avatar_img and avatar_img.has_attr('src'):
+                sender['avatar'] = avatar_img['src']
+            elif avatar_span:
+                sender['avatar_color'] = avatar_span.get('style')
+                sender['initials'] = avatar_span.get_text(strip=True) if avatar_span else None
+
+        time_tag = alert.find('time')
+        timestamp = {
+            'iso': time_tag['datetime'] if time_tag else None,
+            'unix': int(time_tag['data-time']) if time_tag and time_tag.has_attr('data-time') else None
+        } if time_tag else None
+
+        alert_data = {
+            'id': alert['data-alert-id'],
+            'is_unread': 'is-unread' in alert.get('class', []),
+            'text': alert.find('div', {'class': 'contentRow-main'}).get_text(strip=True) if alert.find('div', {'class': 'contentRow-main'}) else None,
+            'link': alert.find('a', {'class': 'fauxBlockLink-blockLink'})['href'] if alert.find('a', {'class': 'fauxBlockLink-blockLink'}) else None,
+            'sender': sender,
+            'timestamp': timestamp
+        }
+
+        notifications.append(alert_data)
+
+    return notifications
+
+
+def parse_search_results(content: bytes) -> list:
+    """Найденные темы со страницы поиска"""
+
+    content = BeautifulSoup(content, 'lxml')
+    results = []
+
+    for thread in content.find_all('li', {'class': 'block-row'}):
+        title_link = thread.find('h3', {'class': 'contentRow-title'}).find('a')
+        date_tag = thread.find('time', {'class': 'u-dt'})
+        answers_tag = thread.find(text=ANSWERS)
+
+        thread_data = {
+            'title': title_link.text.strip().split('| Причина:')[0].strip(),
+            'status': thread.find('span', {'class': 'label'}).text if thread.find('span', {'class': 'label'}) else None,
+            'author': thread['data-author'],
+            'thread_id': int(title_link['href'].split('/')[-2]),
+            'create_date': int(date_tag['data-time']) if date_tag else None,
+            'answers_count': int(answers_tag.split(': ')[1]) if answers_tag else 0,
+            'forum': thread.find('a', href=FORUM_LINK).text if thread.find('a', href=FORUM_LINK) else None,
+            'snippet': thread.find('div', {'class': 'contentRow-snippet'}).text.strip() if thread.find('div', {'class': 'contentRow-snippet'}) else None,
+            'url': MAIN_URL + title_link['href']
+        }
+
+        results.append(thread_data)
+
+    return results
@@ -0,0 +1,255 @@
+from lxml.etree import XPath
+from lxml.html import HtmlElement, HTMLParser, document_fromstring
+
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.parsers.patterns import DIGITS, role_color
+from arz_api_extended.parsers.payload import page_content, page_title
+from arz_api_extended.parsers.soup import *
+
+
+# Быстрый бэкенд разбора на lxml с заранее скомпилированными XPath выражениями.
+# Повторяет результаты эталонного бэкенда (soup) для самых частых страниц, остальные функции берутся из него
+
+
+def _class(name: str) -> str:
+    """Условие XPath: у элемента есть класс name (как {'class': name} в BeautifulSoup)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+UTF8_PARSER = HTMLParser(encoding='utf-8')
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+THREAD_ITEMS = XPath("//div[contains(@class, 'structItem structItem--thread')]")
+THREAD_TITLE_LINKS = XPath(f"(.//div[{_class('structItem-title')}])[1]//a")
+PINNED = XPath(".//i[@title='Закреплено']")
+CLOSED = XPath(".//i[@title='Закрыта']")
+MAIN_PARTS = XPath(f"(.//div[{_class('structItem-cell--main')}])[1]/descendant::div[{_class('structItem-minor')}][1]/descendant::ul[{_class('structItem-parts')}][1]")
+PART_USERNAME = XPath(f".//a[{_class('username')}]")
+PART_START_DATE = XPath(f"(.//li[{_class('structItem-startDate')}])[1]/descendant::time[{_class('u-dt')}][1]")
+LATEST_CELL = XPath(f"(.//div[{_class('structItem-cell--latest')}])[1]")
+LATEST_USERNAME = XPath(f"(.//div[{_class('structItem-minor')}])[1]//*[contains(@class, 'username')]")
+LATEST_DATE = XPath(f".//time[{_class('structItem-latestDate')}]")
+LABEL = XPath(f".//span[{_class('label')}]")
+
+POSTS = XPath("//article[contains(@id, 'js-post')]/@id", smart_strings=False)
+PAGE_NAV = XPath(f"(//ul[{_class('pageNav-main')}])[1]//li[{_class('pageNav-page')}]")
+
+USERNAME_SPAN = XPath(f"//span[{_class('username')}]")
+BANNERS = XPath(f"//div[{_class('memberHeader-banners')}]")
+USER_TITLE = XPath(f"//span[{_class('userTitle')}]")
+AVATAR_LINK = XPath("//a[@class='avatar avatar--l']")
+LINK_BY_HREF = XPath("//a[@href=$href]")
+REACTIONS = XPath("(//dl[@class='pairs pairs--rows pairs--rows--centered'])[1]//dd")
+
+ALERTS = XPath(f"//li[{_class('js-alert')}]")
+ALERT_USERNAME = XPath(f".//a[{_class('username')}]")
+ALERT_AVATAR_IMG = XPath(f".//img[{_class('avatar')}]")
+ALERT_AVATAR_SPAN = XPath(f".//span[{_class('avatar-u')}]")
+ALERT_TIME = XPath(".//time")
+ALERT_TEXT = XPath(f".//div[{_class('contentRow-main')}]")
+ALERT_LINK = XPath(f".//a[{_class('fauxBlockLink-blockLink')}]")
+
+CLASSES = XPath("descendant-or-self::*/@class", smart_strings=False)
+
+
+def _document(html: str | bytes) -> HtmlElement:
+    if not html or not html.strip():
+        return document_fromstring("<html></html>")
+    return document_fromstring(html, parser=UTF8_PARSER) if isinstance(html, bytes) else document_fromstring(html)
+
+
+def _first(elements: list):
+    return elements[0] if elements else None
+
+
+def _string(text: str) -> str:
+    # BeautifulSoup заменяет строки только из пробельных символов на '\n' (если есть перенос строки) или ' '
+    if text.strip(ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def _text(element: HtmlElement, strip: bool = False) -> str:
+    """Текст элемента как .text / .get_text(strip=True) в BeautifulSoup"""
+
+    if strip:
+        return ''.join(part.strip() for part in element.itertext())
+    return ''.join(_string(part) for part in element.itertext())
+
+
+def _color(element: HtmlElement) -> str:
+    return role_color(token for classes in CLASSES(element) for token in classes.split())
+
+
+def parse_member(request: dict, user_id: int) -> dict:
+    """Данные пользователя из JSON ответа /members/{id}"""
+
+    content = _document(page_content(request))
+    username = page_title(request)
+
+    username_class = _first(USERNAME_SPAN(content))
+    username_color = _color(username_class) if username_class is not None else None
+
+    roles = []
+    banners = BANNERS(content)[0]
+    children = [_string(banners.text)] if banners.text else []
+    for child in banners:
+        children.append(_text(child) if isinstance(child.tag, str) else child.text or '')
+        if child.tail: children.append(_string(child.tail))
+    for text in children:
+        if text != '\n': roles.append(text)
+
+    user_title = _first(USER_TITLE(content))
+    user_title = _text(user_title) if user_title is not None else None
+    avatar = _first(AVATAR_LINK(content))
+    avatar = MAIN_URL + avatar.attrib['href'] if avatar is not None else None
+
+    messages_count = int(_text(LINK_BY_HREF(content, href=f'/search/member?user_id={user_id}')[0]).strip().replace(',', ''))
+    reactions_count = int(_text(REACTIONS(content)[0]).strip().replace(',', ''))
+    trophies_count = int(_text(LINK_BY_HREF(content, href=f'/members/{user_id}/trophies')[0]).strip().replace(',', ''))
+
+    return {
+        'id': user_id, 'username': username, 'user_title': user_title, 'avatar': avatar, 'roles': roles,
+        'messages_count': messages_count, 'reactions_count': reactions_count, 'trophies_count': trophies_count,
+        'username_color': username_color
+    }
+
+
+def parse_threads(request: dict) -> dict:
+    """Закрепленные ('pins') и незакрепленные ('unpins') темы из JSON ответа страницы раздела"""
+
+    content = _document(page_content(request))
+    result = {'pins': [], 'unpins': []}
+    for thread in THREAD_ITEMS(content):
+        thread_id = DIGITS.search(THREAD_TITLE_LINKS(thread)[-1].attrib['href'])
+        if thread_id is None: continue
+
+        result['pins' if PINNED(thread) else 'unpins'].append(int(thread_id.group()))
+
+    return result
+
+
+def parse_thread_records(request: dict) -> list:
+    """Темы страницы раздела в виде словарей {'thread_id', 'is_pinned'}"""
+
+    threads = parse_threads(request)
+    return [{'thread_id': thread_id, 'is_pinned': True} for thread_id in threads['pins']] + [{'thread_id': thread_id, 'is_pinned': False} for thread_id in threads['unpins']]
+
+
+def parse_threads_extended(request: dict) -> list:
+    """Темы с дополнительной информацией из JSON ответа страницы раздела"""
+
+    content = _document(page_content(request))
+    result = []
+    seen_thread_ids = set()
+
+    for thread in THREAD_ITEMS(content):
+        link = THREAD_TITLE_LINKS(thread)[-1]
+        thread_id = int(DIGITS.search(link.attrib['href']).group())
+        if thread_id in seen_thread_ids:
+            continue
+        seen_thread_ids.add(thread_id)
+
+        thread_data = {}
+
+        parts = MAIN_PARTS(thread)[0]
+        username_author = _first(PART_USERNAME(parts))
+        thread_data['username_author'] = _text(username_author).strip() if username_author is not None else None
+
+        thread_data['thread_title'] = _text(link).strip()
+
+        prefix_label = _first(LABEL(thread))
+        thread_data['prefix'] = _text(prefix_label).strip() if prefix_label is not None else None
+
+        if username_author is not None:
+            thread_data['username_author_color'] = _color(username_author)
+
+        created_date = PART_START_DATE(parts)[0].get('data-time')
+        thread_data['created_date'] = int(created_date) if created_date else None
+
+        latest = LATEST_CELL(thread)[0]
+        last_message_username = _first(LATEST_USERNAME(latest))
+        thread_data['username_last_message'] = _text(last_message_username).strip() if last_message_username is not None else None
+
+        if last_message_username is not None:
+            thread_data['username_last_message_color'] = _color(last_message_username)
+
+        last_message_date = LATEST_DATE(latest)[0].get('data-time')
+        thread_data['last_message_date'] = int(last_message_date) if last_message_date else None
+
+        thread_data['thread_id'] = thread_id
+        thread_data['is_pinned'] = len(PINNED(thread)) > 0
+        thread_data['is_closed'] = len(CLOSED(thread)) > 0
+
+        result.append(thread_data)
+
+    return result
+
+
+def parse_thread_posts(request: dict) -> list:
+    """ID сообщений из JSON ответа страницы темы"""
+
+    return [post_id.strip('js-post-') for post_id in POSTS(_document(page_content(request)))]
+
+
+def parse_thread_posts_page(request: dict) -> tuple:
+    """ID сообщений и количество страниц из JSON ответа страницы темы"""
+
+    content = _document(page_content(request))
+    posts = [post_id.strip('js-post-') for post_id in POSTS(content)]
+    try:
+        pages_count = int(_text(PAGE_NAV(content)[-1]))
+    except (IndexError, ValueError):
+        pages_count = 1
+    return posts, pages_count
+
+
+def parse_notifications(content: bytes) -> list:
+    """Уведомления со страницы /account/alerts"""
+
+    notifications = []
+
+    for alert in ALERTS(_document(content)):
+        if 'data-alert-id' not in alert.attrib:
+            continue
+
+        sender = None
+        username_link = _first(ALERT_USERNAME(alert))
+        if username_link is not None:
+            sender = {
+                'id': int(username_link.get('data-user-id', 0)),
+                'name': _text(username_link, strip=True),
+                'avatar': None,
+                'avatar_color': None,
+                'initials': None
+            }
+
+            avatar_img = _first(ALERT_AVATAR_IMG(alert))
+            avatar_span = _first(ALERT_AVATAR_SPAN(alert))
+
+            if avatar_img is not None and 'src' in avatar_img.attrib:
+                sender['avatar'] = avatar_img.attrib['src']
+            elif avatar_span is not None:
+                sender['avatar_color'] = avatar_span.get('style')
+                sender['initials'] = _text(avatar_span, strip=True)
+
+        time_tag = _first(ALERT_TIME(alert))
+        timestamp = {
+            'iso': time_tag.attrib['datetime'],
+            'unix': int(time_tag.attrib['data-time']) if 'data-time' in time_tag.attrib else None
+        } if time_tag is not None else None
+
+        text = _first(ALERT_TEXT(alert))
+        link = _first(ALERT_LINK(alert))
+        alert_data = {
+            'id': alert.attrib['data-alert-id'],
+            'is_unread': 'is-unread' in alert.get('class', '').split(),
+            'text': _text(text, strip=True) if text is not None else None,
+            'link': link.attrib['href'] if link is not None else None,
+            'sender': sender,
+            'timestamp': timestamp
+        }
+
+        notifications.append(alert_data)
+
+    return notifications
@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from asyncio import Semaphore, get_running_loop, sleep as async_sleep
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+from requests import Session
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+WRITE_METHODS = frozenset(('POST', 'PUT', 'PATCH', 'DELETE'))
+"""Методы, которые расходуют токены ведра записи"""
+
+
+class TokenBucket:
+    """Ведро токенов: rate токенов в секунду, не больше burst накоплено
+
+    reserve() не ждет сам, а сразу забирает токен (уходя в долг) и возвращает, сколько нужно подождать.
+    Поэтому одно ведро подходит и для потоков, и для asyncio, а ожидающие обслуживаются по очереди
+
+    Attributes:
+        rate (float): Токенов в секунду
+        burst (float): Емкость ведра (сколько запросов можно отправить подряд без ожидания). По умолчанию rate (необяз.)
+    """
+
+    def __init__(self, rate: float, burst: float = None) -> None:
+        self.rate = rate
+        self.burst = max(burst or rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Забрать токены
+
+        Returns:
+            Сколько секунд подождать перед запросом (0 - можно сразу)
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - tokens
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+
+class FileTokenBucket(TokenBucket):
+    """Ведро токенов в файле с блокировкой, общее для нескольких процессов (например, нескольких ботов)
+
+    В одном файле хранятся все ведра RateLimiter (ключ - хост и тип запроса). Время берется по часам системы,
+    так как monotonic у каждого процесса свой
+
+    Attributes:
+        path (str): Путь до файла
+        key (str): Ключ ведра в файле
+        rate (float): Токенов в секунду
+        burst (float): Емкость ведра. По умолчанию rate (необяз.)
+    """
+
+    def __init__(self, path: str, key: str, rate: float, burst: float = None) -> None:
+        super().__init__(rate, burst)
+        self.path = path
+        self.key = key
+
+    def reserve(self, tokens: float = 1) -> float:
+        with self._lock, open(self.path, 'a+b') as file:
+            _lock_file(file)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read() or b'{}')
+                except ValueError:
+                    state = {}
+
+                now = time.time()
+                available, updated = state.get(self.key, (self.burst, now))
+                available = min(self.burst, available + max(0.0, now - updated) * self.rate) - tokens
+                state[self.key] = (available, now)
+
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state).encode())
+                file.flush()
+            finally:
+                _unlock_file(file)
+        return max(0.0, -available / self.rate)
+
+
+def _lock_file(file) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(file) -> None:
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RateLimiter:
+    """Ограничение частоты и количества одновременных запросов к форуму
+
+    На каждый хост заводятся два ведра токенов: для чтения (GET) и для записи (POST - ответы, реакции и т.д.),
+    max_concurrency ограничивает количество запросов в работе. Один объект можно передать нескольким клиентам
+    (ArizonaAPI или AsyncArizonaAPI) - тогда лимит общий для них, а с path - и для нескольких процессов.
+    Ведра общие для всех потоков и циклов событий, а max_concurrency для asyncio считается в каждом цикле событий отдельно
+
+    Attributes:
+        read_rate (float): Запросов чтения в секунду на хост. По умолчанию 5 (необяз.)
+        read_burst (float): Сколько запросов чтения можно отправить подряд. По умолчанию 10 (необяз.)
+        write_rate (float): Запросов записи в секунду на хост. По умолчанию 0.5 (необяз.)
+        write_burst (float): Сколько запросов записи можно отправить подряд. По умолчанию 2 (необяз.)
+        max_concurrency (int): Максимум одновременных запросов. По умолчанию не ограничено (необяз.)
+        path (str): Файл для ведер, общих между процессами. По умолчанию ведра в памяти процесса (необяз.)
+
+    Пример:
+        limiter = RateLimiter(read_rate=2, write_rate=0.2, max_concurrency=4)
+        api = ArizonaAPI(user_agent, cookie, rate_limiter=limiter)
+        ...
+        print(limiter.stats)
+    """
+
+    def __init__(self, read_rate: float = 5, read_burst: float = 10, write_rate: float = 0.5, write_burst: float = 2, max_concurrency: int = None, path: str = None) -> None:
+        self.rates = {'read': (read_rate, read_burst), 'write': (write_rate, write_burst)}
+        self.max_concurrency = max_concurrency
+        self.path = path
+
+        self.requests = Counter()
+        """Количество запросов по типам ('read' / 'write')"""
+        self.throttled = Counter()
+        """Количество запросов, которым пришлось ждать (больше 1 мс)"""
+        self.waited = Counter()
+        """Суммарное ожидание (секунды) по типам"""
+        self.max_wait = 0.0
+        """Самое долгое ожидание одного запроса (секунды)"""
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._async_semaphores = WeakKeyDictionary()
+        self._local = threading.local()
+
+    def bucket(self, host: str, kind: str) -> TokenBucket:
+        """Ведро токенов хоста для типа запросов ('read' или 'write')"""
+
+        with self._lock:
+            bucket = self._buckets.get((host, kind))
+            if bucket is None:
+                rate, burst = self.rates[kind]
+                if self.path is None:
+                    bucket = TokenBucket(rate, burst)
+                else:
+                    bucket = FileTokenBucket(self.path, f"{host}|{kind}", rate, burst)
+                self._buckets[(host, kind)] = bucket
+            return bucket
+
+    def reserve(self, method: str, url: str) -> tuple:
+        """Забрать токен для запроса
+
+        Returns:
+            Пара (тип запроса, сколько секунд подождать)
+        """
+
+        kind = 'write' if method.upper() in WRITE_METHODS else 'read'
+        return kind, self.bucket(urlsplit(url).netloc, kind).reserve()
+
+    def _record(self, kind: str, waited: float) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+            self.waited[kind] += waited
+            self.max_wait = max(self.max_wait, waited)
+            if waited >= 0.001:
+                self.throttled[kind] += 1
+
+    @contextmanager
+    def limit(self, method: str, url: str):
+        """Дождаться токена и свободного места для запроса (для потоков)
+
+        Вложенные запросы того же потока (повтор с новым CSRF токеном, редиректы) не занимают второе место,
+        иначе при max_concurrency=1 повтор ждал бы сам себя
+        """
+
+        start = time.monotonic()
+        kind, delay = self.reserve(method, url)
+        if delay:
+            time.sleep(delay)
+
+        depth = getattr(self._local, 'depth', 0)
+        if self._semaphore is not None and not depth:
+            self._semaphore.acquire()
+        self._record(kind, time.monotonic() - start)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if self._semaphore is not None and not depth:
+                self._semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self, method: str, url: str):
+        """Дождаться токена и свободного места для запроса (для asyncio)"""
+
+        start = time.monotonic()
+        kind, delay = self.reserve(method, url)
+        if delay:
+            await async_sleep(delay)
+
+        if not self.max_concurrency:
+            self._record(kind, time.monotonic() - start)
+            yield
+            return
+
+        # asyncio.Semaphore привязан к циклу событий, в котором его впервые ждали - у каждого цикла свой
+        loop = get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = Semaphore(self.max_concurrency)
+
+        async with semaphore:
+            self._record(kind, time.monotonic() - start)
+            yield
+
+    @property
+    def stats(self) -> dict:
+        """Статистика: запросы, ожидавшие запросы, суммарное / среднее / наибольшее ожидание"""
+
+        requests, waited = sum(self.requests.values()), sum(self.waited.values())
+        return {
+            'requests': dict(self.requests), 'throttled': dict(self.throttled),
+            'waited': round(waited, 6), 'average_wait': waited / requests if requests else 0.0,
+            'max_wait': round(self.max_wait, 6)
+        }
+
+
+class RateLimitedSession(Session):
+    """requests.Session, которая пропускает каждый отправленный запрос (включая редиректы и повторы) через RateLimiter
+
+    Attributes:
+        limiter (RateLimiter): Ограничитель. None - без ограничений (необяз.)
+    """
+
+    def __init__(self, limiter: RateLimiter = None) -> None:
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        if self.limiter is None:
+            return super().send(request, **kwargs)
+        with self.limiter.limit(request.method, request.url):
+            return super().send(request, **kwargs)
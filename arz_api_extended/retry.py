@@ -0,0 +1,162 @@
+import random
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from arz_api_extended.bypass_antibot import is_challenge
+from arz_api_extended.exceptions import RetryError
+from arz_api_extended.ratelimit import RateLimiter, RateLimitedSession
+
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+"""Коды ответов, после которых запрос повторяется"""
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+"""Методы, которые можно повторять после ошибки сервера или обрыва соединения"""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Значение заголовка Retry-After в секундах (число секунд или HTTP дата), None если его нет или оно неверное"""
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Повтор запросов при временных ошибках: 5xx, 429, обрыв соединения и страница анти-бота посреди сессии
+
+    Пауза перед повтором - backoff * 2 ** номер попытки (не больше max_backoff), уменьшенная на случайную долю
+    до jitter, чтобы несколько клиентов не повторяли запросы одновременно. Если сервер прислал Retry-After,
+    ждем столько, сколько он просит (не больше max_retry_after). Если попытки кончились, вызывается RetryError
+    (вместо ошибки разбора страницы с ошибкой), а обрыв соединения пробрасывается как есть.
+    POST после ошибки сервера или обрыва соединения не повторяется (сообщение могло уже отправиться),
+    а после 429 и страницы анти-бота - повторяется: такой запрос форум точно не обработал
+
+    Attributes:
+        attempts (int): Сколько всего попыток на запрос. По умолчанию 4 (необяз.)
+        backoff (float): Пауза перед первым повтором, секунды. По умолчанию 0.5 (необяз.)
+        max_backoff (float): Наибольшая пауза, секунды. По умолчанию 30 (необяз.)
+        jitter (float): Доля паузы, на которую она случайно уменьшается (0 - без разброса). По умолчанию 0.5 (необяз.)
+        max_retry_after (float): Наибольшее ожидание по Retry-After, секунды. По умолчанию 60 (необяз.)
+        challenges (int): Сколько раз повторить запрос после страницы анти-бота (cookie решается заново). По умолчанию 1 (необяз.)
+        statuses (Iterable[int]): Коды ответов для повтора. По умолчанию RETRY_STATUSES (необяз.)
+        methods (Iterable[str]): Методы, которые повторяются после ошибок сервера. По умолчанию IDEMPOTENT_METHODS (необяз.)
+
+    Пример:
+        api = ArizonaAPI(user_agent, cookie, retry=RetryPolicy(attempts=6, backoff=1))
+        ...
+        print(api.retry.stats)
+    """
+
+    def __init__(self, attempts: int = 4, backoff: float = 0.5, max_backoff: float = 30, jitter: float = 0.5, max_retry_after: float = 60, challenges: int = 1, statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.challenges = challenges
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+        self.stats = Counter()
+        """Повторы по причинам (код ответа, 'connection', 'challenge'), 'gave_up' - запросы, для которых попытки кончились"""
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """Пауза перед повтором номер attempt (с нуля)"""
+
+        wait = parse_retry_after(retry_after)
+        if wait is not None:
+            return min(wait, self.max_retry_after)
+        wait = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return wait * (1 - self.jitter * random.random())
+
+    def retry_response(self, method: str, url: str, status: int, headers, attempt: int) -> float | None:
+        """Нужно ли повторить запрос после ответа
+
+        Returns:
+            Пауза перед повтором в секундах или None, если повторять не нужно.
+            Если ответ - временная ошибка, а попытки кончились - RetryError
+        """
+
+        if status not in self.statuses or (status != 429 and method.upper() not in self.methods):
+            return None
+        if attempt + 1 >= self.attempts:
+            self.stats['gave_up'] += 1
+            raise RetryError(url, status, attempt + 1)
+        self.stats[status] += 1
+        return self.delay(attempt, headers.get('Retry-After') if status in (429, 503) else None)
+
+    def retry_error(self, method: str, attempt: int) -> float | None:
+        """Нужно ли повторить запрос после ошибки соединения (пауза или None)"""
+
+        if method.upper() not in self.methods:
+            return None
+        if attempt + 1 >= self.attempts:
+            self.stats['gave_up'] += 1
+            return None
+        self.stats['connection'] += 1
+        return self.delay(attempt)
+
+    def retry_challenge(self, url: str, challenges: int) -> None:
+        """Учесть повтор запроса после страницы анти-бота (challenges - сколько раз уже повторяли).
+        Если повторы кончились - RetryError"""
+
+        if challenges >= self.challenges:
+            self.stats['gave_up'] += 1
+            raise RetryError(url, 'анти-бот', challenges + 1)
+        self.stats['challenge'] += 1
+
+
+class RetrySession(RateLimitedSession):
+    """requests.Session с ограничением частоты (RateLimiter) и повтором запросов по RetryPolicy
+
+    Страницу анти-бота решает хук клиента (ArizonaAPI._bypass_hook) и сохраняет новую cookie в сессии,
+    а эта сессия заново подставляет cookie в запрос и отправляет его еще раз
+
+    Attributes:
+        limiter (RateLimiter): Ограничитель частоты. None - без ограничений (необяз.)
+        retry (RetryPolicy): Политика повторов. None - без повторов (необяз.)
+    """
+
+    def __init__(self, limiter: RateLimiter = None, retry: RetryPolicy = None) -> None:
+        super().__init__(limiter)
+        self.retry = retry
+
+    def send(self, request, **kwargs):
+        policy = self.retry
+        if policy is None:
+            return super().send(request, **kwargs)
+
+        attempt = challenges = 0
+        while True:
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                delay = policy.retry_error(request.method, attempt)
+                if delay is None:
+                    raise
+            else:
+                if not kwargs.get('stream') and is_challenge(response.content):
+                    policy.retry_challenge(request.url, challenges)
+                    challenges += 1
+                    response.close()
+                    request.headers.pop('Cookie', None)
+                    request.prepare_cookies(self.cookies)
+                    continue
+
+                delay = policy.retry_response(request.method, request.url, response.status_code, response.headers, attempt)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,499 @@
+import json
+import os
+import threading
+from asyncio import Event as AsyncEvent, Semaphore, TimeoutError as WaitTimeout, create_task, gather, get_running_loop, wait_for
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
+from tempfile import NamedTemporaryFile
+from time import monotonic
+from typing import TYPE_CHECKING, Callable
+
+from arz_api_extended.models.thread_object import Thread
+
+if TYPE_CHECKING:
+    from arz_api_extended import ArizonaAPI
+
+
+# Инкрементальное слежение за форумом: опрашиваются только страницы, на которых могло появиться новое,
+# а состояние (водяные знаки) можно сохранить в JSON файл, чтобы после перезапуска не перечитывать все заново.
+# Работают и с ArizonaAPI, и с AsyncArizonaAPI: с асинхронным API poll() возвращает корутину
+
+
+def _read_state(path: str | None) -> dict:
+    if path is None:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_state(path: str | None, state: dict) -> None:
+    if path is None:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    with NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as file:
+        json.dump(state, file)
+    os.replace(file.name, path)
+
+
+class ThreadWatcher:
+    """Новые сообщения в темах с прошлого опроса
+
+    Для каждой темы хранится водяной знак: ID последнего увиденного сообщения и количество страниц.
+    Опрос загружает только последнюю известную страницу темы (и страницы, появившиеся после нее)
+    и возвращает сообщения новее водяного знака, а не перечитывает тему через get_all_thread_posts
+
+    Attributes:
+        API (ArizonaAPI): Объект ArizonaAPI или AsyncArizonaAPI
+        path (str): JSON файл, в котором сохраняется состояние после каждого опроса (необяз.)
+
+    Пример:
+        watcher = ThreadWatcher(api, 'threads.json')
+        watcher.watch(8801234)
+        while True:
+            for post in watcher.poll():
+                print(post.thread.id, post.creator.username, post.text_content)
+            sleep(30)
+    """
+
+    def __init__(self, API: 'ArizonaAPI', path: str = None) -> None:
+        self.API = API
+        self.path = path
+        self.state = _read_state(path)
+        """**Водяные знаки**: ID темы (str) -> {'last_post_id': int | None, 'pages_count': int}"""
+        self._threads = {}
+
+    def watch(self, thread_id: int, backlog: bool = False) -> None:
+        """Следить за темой (если за ней уже следят - ничего не меняется)
+
+        Attributes:
+            thread_id (int): ID темы
+            backlog (bool): Первый опрос вернет все сообщения темы. По умолчанию False - первый опрос только
+                запоминает последнее сообщение и загружает не больше двух страниц (необяз.)
+        """
+
+        self.state.setdefault(str(thread_id), {'last_post_id': 0 if backlog else None, 'pages_count': 1})
+
+    def unwatch(self, thread_id: int) -> None:
+        """Перестать следить за темой"""
+
+        self.state.pop(str(thread_id), None)
+        self._threads.pop(str(thread_id), None)
+        _write_state(self.path, self.state)
+
+    def poll(self) -> list:
+        """Опросить все темы
+
+        Returns:
+            Список (list) новых объектов Post (по темам, в порядке сообщений). Для AsyncArizonaAPI - корутина
+        """
+
+        if iscoroutinefunction(self.API.get_thread):
+            return self._poll_async()
+
+        posts = []
+        for thread_id in list(self.state):
+            posts.extend(self._poll_thread(thread_id))
+        _write_state(self.path, self.state)
+        return posts
+
+    async def _poll_async(self) -> list:
+        results = await gather(*(self._poll_thread_async(thread_id) for thread_id in list(self.state)))
+        _write_state(self.path, self.state)
+        return [post for posts in results for post in posts]
+
+    def _fetch(self, thread_id: str, page: int, thread: Thread | None):
+        # fresh=True: кэш ответов API отдал бы страницу, которую уже видели
+        return self.API.get_thread_page(int(thread_id), page, thread, fresh=True)
+
+    def _poll_thread(self, thread_id: str) -> list:
+        mark, thread = self.state[thread_id], self._threads.get(thread_id)
+        result = self._fetch(thread_id, mark['pages_count'], thread)
+        if result is None:
+            return []
+
+        thread = self._remember_thread(thread_id, thread, result)
+        pages = [result, *(self._fetch(thread_id, page, thread) for page in self._next_pages(mark, result[1]))]
+        return self._consume(mark, pages)
+
+    async def _poll_thread_async(self, thread_id: str) -> list:
+        mark, thread = self.state[thread_id], self._threads.get(thread_id)
+        result = await self._fetch(thread_id, mark['pages_count'], thread)
+        if result is None:
+            return []
+
+        thread = self._remember_thread(thread_id, thread, result)
+        pages = [result, *[await self._fetch(thread_id, page, thread) for page in self._next_pages(mark, result[1])]]
+        return self._consume(mark, pages)
+
+    def _remember_thread(self, thread_id: str, thread: Thread | None, result: tuple) -> Thread | None:
+        """Объект темы из первой загруженной страницы - для сообщений следующих опросов"""
+
+        if thread is None and result[0]:
+            thread = self._threads[thread_id] = result[0][0].thread
+        return thread
+
+    @staticmethod
+    def _next_pages(mark: dict, pages_count: int) -> range:
+        """Страницы, которые нужно загрузить после последней известной"""
+
+        if mark['last_post_id'] is None:
+            return range(pages_count, pages_count + 1) if pages_count > mark['pages_count'] else range(0)
+        return range(mark['pages_count'] + 1, pages_count + 1)
+
+    @staticmethod
+    def _consume(mark: dict, pages: list) -> list:
+        last_post_id, posts = mark['last_post_id'], []
+        mark['pages_count'] = pages[0][1]
+
+        for result in pages:
+            if result is None:
+                continue
+            new = [post for post in result[0] if last_post_id is None or post.id > last_post_id]
+            if not new:
+                continue
+            mark['last_post_id'] = max(mark['last_post_id'] or 0, max(post.id for post in new))
+            if last_post_id is not None:
+                posts.extend(new)
+        return posts
+
+
+class CategoryFeed:
+    """Лента изменений разделов по last_message_date из get_threads_extended
+
+    Для каждого раздела хранится водяной знак (самая поздняя last_message_date) и последние увиденные темы.
+    Опрос загружает 1 страницу раздела, а следующие - только пока все незакрепленные темы страницы обновлялись
+    после водяного знака, поэтому спокойный раздел стоит одного запроса за цикл (с ConditionalCache у API -
+    условного запроса без разбора неизмененной страницы).
+
+    События - словари {'type', 'category_id', 'thread_id', 'thread'}, где 'thread' - запись get_threads_extended, а 'type':
+        'new_thread' - тема создана после прошлого опроса
+        'thread_bumped' - в теме новое сообщение
+        'thread_closed' - тема закрыта (замечается, только если тема попала на загруженные страницы)
+
+    Attributes:
+        API (ArizonaAPI): Объект ArizonaAPI или AsyncArizonaAPI
+        path (str): JSON файл, в котором сохраняется состояние после каждого опроса (необяз.)
+        max_pages (int): Сколько страниц раздела загружать за опрос не больше. По умолчанию 5 (необяз.)
+        max_threads (int): Сколько последних тем помнить в каждом разделе. По умолчанию 500 (необяз.)
+
+    Пример:
+        feed = CategoryFeed(api, 'categories.json')
+        for category_id in (412, 413, 414):
+            feed.follow(category_id)
+        while True:
+            for event in feed.poll():
+                print(event['type'], event['thread']['thread_title'])
+            sleep(60)
+    """
+
+    def __init__(self, API: 'ArizonaAPI', path: str = None, max_pages: int = 5, max_threads: int = 500) -> None:
+        self.API = API
+        self.path = path
+        self.max_pages = max_pages
+        self.max_threads = max_threads
+        self.state = _read_state(path)
+        """**Состояние разделов**: ID раздела (str) -> {'watermark': int | None, 'threads': {ID темы (str): [last_message_date, is_closed]}}"""
+
+    def follow(self, category_id: int) -> None:
+        """Следить за разделом. Первый опрос только запоминает текущее состояние раздела (без событий)"""
+
+        self.state.setdefault(str(category_id), {'watermark': None, 'threads': {}})
+
+    def unfollow(self, category_id: int) -> None:
+        """Перестать следить за разделом"""
+
+        self.state.pop(str(category_id), None)
+        _write_state(self.path, self.state)
+
+    def poll(self) -> list:
+        """Опросить все разделы
+
+        Returns:
+            Список (list) событий. Для AsyncArizonaAPI - корутина
+        """
+
+        if iscoroutinefunction(self.API.get_threads_extended):
+            return self._poll_async()
+
+        events = []
+        for category_id in list(self.state):
+            pages = []
+            for page in range(1, self.max_pages + 1):
+                records = self.API.get_threads_extended(int(category_id), page)
+                if not records:
+                    break
+                pages.append(records)
+                if not self._deeper(self.state[category_id], records):
+                    break
+            events.extend(self._consume(category_id, pages))
+        _write_state(self.path, self.state)
+        return events
+
+    async def _poll_async(self) -> list:
+        async def poll_category(category_id: str) -> list:
+            pages = []
+            for page in range(1, self.max_pages + 1):
+                records = await self.API.get_threads_extended(int(category_id), page)
+                if not records:
+                    break
+                pages.append(records)
+                if not self._deeper(self.state[category_id], records):
+                    break
+            return self._consume(category_id, pages)
+
+        results = await gather(*(poll_category(category_id) for category_id in list(self.state)))
+        _write_state(self.path, self.state)
+        return [event for events in results for event in events]
+
+    @staticmethod
+    def _deeper(state: dict, records: list) -> bool:
+        """Нужна ли следующая страница: все незакрепленные темы этой обновлялись после водяного знака"""
+
+        if state['watermark'] is None:
+            return False
+        dates = [record['last_message_date'] or 0 for record in records if not record['is_pinned']]
+        return bool(dates) and min(dates) > state['watermark']
+
+    def _consume(self, category_id: str, pages: list) -> list:
+        state = self.state[category_id]
+        watermark, known, events = state['watermark'], state['threads'], []
+
+        for record in (record for records in pages for record in records):
+            key, last_message_date = str(record['thread_id']), record['last_message_date'] or 0
+            previous = known.get(key)
+            if watermark is not None:
+                types = []
+                if previous is None and (record['created_date'] or 0) > watermark:
+                    types.append('new_thread')
+                elif last_message_date > (previous[0] if previous is not None else watermark):
+                    types.append('thread_bumped')
+                if record['is_closed'] and previous is not None and not previous[1]:
+                    types.append('thread_closed')
+                events.extend({'type': kind, 'category_id': int(category_id), 'thread_id': record['thread_id'], 'thread': record} for kind in types)
+
+            known[key] = [last_message_date, record['is_closed']]
+            state['watermark'] = max(state['watermark'] or 0, last_message_date)
+
+        if len(known) > self.max_threads:
+            state['threads'] = dict(sorted(known.items(), key=lambda item: item[1][0], reverse=True)[:self.max_threads])
+        return events
+
+
+class NotificationStream:
+    """Поток новых уведомлений (/account/alerts) с обработчиками
+
+    Опрос с адаптивным интервалом: после новых уведомлений - min_interval, каждый пустой опрос (или ошибка)
+    увеличивает интервал в backoff раз до max_interval. Уведомления отсеиваются по ID (data-alert-id) через
+    ограниченное множество seen_size последних ID, новые передаются обработчикам в пуле из workers потоков
+    (с AsyncArizonaAPI корутины-обработчики выполняются задачами, не больше workers одновременно).
+    С mark_read=True непрочитанные уведомления помечаются прочитанными одним запросом раз в mark_interval секунд.
+
+    С ArizonaAPI опрос идет в фоновом потоке, с AsyncArizonaAPI - в задаче asyncio (start() из работающего цикла,
+    stop() - корутина)
+
+    Attributes:
+        API (ArizonaAPI): Объект ArizonaAPI или AsyncArizonaAPI
+        min_interval (float): Интервал опроса после новых уведомлений, секунды. По умолчанию 5 (необяз.)
+        max_interval (float): Наибольший интервал опроса, секунды. По умолчанию 120 (необяз.)
+        backoff (float): Во сколько раз увеличивается интервал после пустого опроса. По умолчанию 2 (необяз.)
+        seen_size (int): Сколько последних ID уведомлений помнить. По умолчанию 10000 (необяз.)
+        workers (int): Количество потоков (задач) для обработчиков. По умолчанию 4 (необяз.)
+        mark_read (bool): Помечать новые уведомления прочитанными. По умолчанию False (необяз.)
+        mark_interval (float): Как часто отправлять накопленные пометки, секунды. По умолчанию 30 (необяз.)
+        backlog (bool): Передать обработчикам уведомления, которые уже есть при первом опросе. По умолчанию False (необяз.)
+        on_error (Callable): Функция on_error(уведомление или None, исключение) для ошибок опроса и обработчиков (необяз.)
+
+    Пример:
+        stream = NotificationStream(api, mark_read=True)
+
+        @stream.subscribe
+        def on_alert(alert):
+            print(alert['sender']['name'], alert['text'])
+
+        with stream:
+            sleep(3600)
+    """
+
+    def __init__(self, API: 'ArizonaAPI', min_interval: float = 5, max_interval: float = 120, backoff: float = 2, seen_size: int = 10000, workers: int = 4, mark_read: bool = False, mark_interval: float = 30, backlog: bool = False, on_error: Callable = None) -> None:
+        self.API = API
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.seen_size = seen_size
+        self.workers = workers
+        self.mark_read = mark_read
+        self.mark_interval = mark_interval
+        self.on_error = on_error
+
+        self.interval = min_interval
+        """**Текущий интервал опроса**"""
+        self.stats = Counter()
+        """Счетчики: опросы, новые уведомления, помеченные прочитанными, ошибки опроса и обработчиков"""
+
+        self._callbacks = []
+        self._seen = OrderedDict()
+        self._baseline = not backlog
+        self._unread = []
+        self._marked_at = monotonic()
+        self._is_async = iscoroutinefunction(API.get_notifications)
+        self._executor = self._stopped = self._runner = self._semaphore = None
+        self._tasks = set()
+
+    def subscribe(self, callback: Callable) -> Callable:
+        """Добавить обработчик callback(уведомление). Можно использовать как декоратор"""
+
+        self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Удалить обработчик"""
+
+        self._callbacks.remove(callback)
+
+    def poll(self):
+        """Один опрос без обработчиков
+
+        Returns:
+            Список (list) новых уведомлений, от старых к новым. Для AsyncArizonaAPI - корутина
+        """
+
+        if self._is_async:
+            return self._poll_async()
+        return self._new(self.API.get_notifications())
+
+    async def _poll_async(self) -> list:
+        return self._new(await self.API.get_notifications())
+
+    def _new(self, alerts: list | None) -> list:
+        fresh = []
+        for alert in alerts or []:
+            if alert['id'] in self._seen:
+                self._seen.move_to_end(alert['id'])
+                continue
+            self._seen[alert['id']] = None
+            fresh.append(alert)
+        while len(self._seen) > self.seen_size:
+            self._seen.popitem(last=False)
+
+        if self._baseline:
+            self._baseline, fresh = False, []
+        self.interval = self.min_interval if fresh else min(self.interval * self.backoff, self.max_interval)
+        if self.mark_read:
+            # alert-toggle переключает состояние, поэтому помечаются только непрочитанные
+            self._unread.extend(int(alert['id']) for alert in fresh if alert['is_unread'])
+
+        self.stats['polls'] += 1
+        self.stats['alerts'] += len(fresh)
+        return fresh[::-1]
+
+    def _mark_due(self, force: bool = False) -> list:
+        if not self._unread or (not force and monotonic() - self._marked_at < self.mark_interval):
+            return []
+        alert_ids, self._unread = self._unread, []
+        self._marked_at = monotonic()
+        self.stats['marked'] += len(alert_ids)
+        return alert_ids
+
+    def _error(self, alert: dict | None, error: Exception) -> None:
+        self.stats['errors' if alert is None else 'callback_errors'] += 1
+        if self.on_error is not None:
+            self.on_error(alert, error)
+
+    def _call(self, callback: Callable, alert: dict) -> None:
+        try:
+            callback(alert)
+        except Exception as error:
+            self._error(alert, error)
+
+    def start(self) -> 'NotificationStream':
+        """Запустить опрос (в фоновом потоке или, для AsyncArizonaAPI, в задаче asyncio)"""
+
+        self._executor = ThreadPoolExecutor(self.workers)
+        if self._is_async:
+            self._stopped, self._semaphore = AsyncEvent(), Semaphore(self.workers)
+            self._runner = create_task(self._run_async())
+        else:
+            self._stopped = threading.Event()
+            self._runner = threading.Thread(target=self._run, daemon=True)
+            self._runner.start()
+        return self
+
+    def stop(self):
+        """Остановить опрос, дождаться обработчиков и отправить накопленные пометки (для AsyncArizonaAPI - корутина)"""
+
+        if self._is_async:
+            return self._stop_async()
+
+        self._stopped.set()
+        self._runner.join()
+        self._executor.shutdown(wait=True)
+        alert_ids = self._mark_due(force=True)
+        if alert_ids:
+            self.API.mark_notifications_read(alert_ids)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                for alert in self.poll():
+                    for callback in list(self._callbacks):
+                        self._executor.submit(self._call, callback, alert)
+                alert_ids = self._mark_due()
+                if alert_ids:
+                    self.API.mark_notifications_read(alert_ids)
+            except Exception as error:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+                self._error(None, error)
+            self._stopped.wait(self.interval)
+
+    async def _run_async(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                for alert in await self.poll():
+                    for callback in list(self._callbacks):
+                        task = create_task(self._call_async(callback, alert))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+                alert_ids = self._mark_due()
+                if alert_ids:
+                    await self.API.mark_notifications_read(alert_ids)
+            except Exception as error:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+                self._error(None, error)
+            try:
+                await wait_for(self._stopped.wait(), self.interval)
+            except WaitTimeout:
+                pass
+
+    async def _call_async(self, callback: Callable, alert: dict) -> None:
+        async with self._semaphore:
+            if not iscoroutinefunction(callback):
+                return await get_running_loop().run_in_executor(self._executor, self._call, callback, alert)
+            try:
+                await callback(alert)
+            except Exception as error:
+                self._error(alert, error)
+
+    async def _stop_async(self) -> None:
+        self._stopped.set()
+        await self._runner
+        await gather(*self._tasks)
+        self._executor.shutdown(wait=True)
+        alert_ids = self._mark_due(force=True)
+        if alert_ids:
+            await self.API.mark_notifications_read(alert_ids)
+
+    def __enter__(self) -> 'NotificationStream':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    async def __aenter__(self) -> 'NotificationStream':
+        return self.start()
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
@@ -0,0 +1,63 @@
+"""Время и память методов ArizonaAPI / AsyncArizonaAPI целиком (запрос + разбор + модели) против локального сервера-заглушки
+
+Сервер (stub_server.py) запускается в фоновом потоке, клиент проходит анти-бот и авторизацию как на настоящем форуме.
+
+Запуск: python benchmarks/bench_client.py [sync|async|all] [soup|lxml]
+"""
+import asyncio
+import sys
+
+import stub_server
+from harness import CATEGORY_ID, HEADER, MEMBER_ID, POST_ID, PROFILE_POST_ID, THREAD_ID, measure, report
+
+from arz_api_extended import ArizonaAPI, AsyncArizonaAPI
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+CALLS = [
+    ('get_category', (CATEGORY_ID,)),
+    ('get_categories', (CATEGORY_ID,)),
+    ('get_threads', (CATEGORY_ID,)),
+    ('get_threads_extended', (CATEGORY_ID,)),
+    ('get_thread', (THREAD_ID,)),
+    ('get_thread_posts', (THREAD_ID,)),
+    ('get_post', (POST_ID,)),
+    ('get_member', (MEMBER_ID,)),
+    ('get_profile_messages', (MEMBER_ID,)),
+    ('get_profile_post', (PROFILE_POST_ID,)),
+    ('get_forum_statistic', ()),
+    ('get_notifications', ()),
+    ('search_threads', ('жалоба',)),
+]
+"""(метод, аргументы)"""
+
+
+def bench_sync(base_url: str, parser: str):
+    api = ArizonaAPI(USER_AGENT, {}, cookie_store=None, parser=parser, base_url=base_url)
+    for name, args in CALLS:
+        print(report(f"sync.{name}", measure(getattr(api, name), *args, repeat=3)))
+    api.logout()
+
+
+def bench_async(base_url: str, parser: str):
+    loop = asyncio.new_event_loop()
+    api = loop.run_until_complete(AsyncArizonaAPI(USER_AGENT, {}, cookie_store=None, parser=parser, base_url=base_url).start())
+    for name, args in CALLS:
+        method = getattr(api, name)
+        print(report(f"async.{name}", measure(lambda: loop.run_until_complete(method(*args)), repeat=3)))
+    loop.run_until_complete(api.logout())
+    loop.close()
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'all'
+    parser = sys.argv[2] if len(sys.argv) > 2 else 'lxml'
+    base_url = stub_server.start()
+
+    print(HEADER)
+    if mode in ('sync', 'all'): bench_sync(base_url, parser)
+    if mode in ('async', 'all'): bench_async(base_url, parser)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Выгрузка тем: список словарей get_threads_extended против колонок ThreadColumns / ThreadExporter
+
+Страница раздела из fixtures размножается до нужного количества тем (ID тем сдвигаются).
+
+Запуск: python benchmarks/bench_export.py [количество тем]
+"""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from harness import load
+
+from arz_api_extended.export import ThreadColumns, ThreadExporter
+from arz_api_extended.parsers import xpath
+
+
+def records(count: int):
+    page = xpath.parse_threads_extended(load('forum_page.json'))
+    for index in range(count):
+        record = dict(page[index % len(page)])
+        record['thread_id'] += index
+        yield record
+
+
+def retained(build, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build(records(count))
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def columns(items) -> ThreadColumns:
+    buffer = ThreadColumns()
+    buffer.extend(items, 412)
+    return buffer
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    as_dicts, as_columns = retained(list, count), retained(columns, count)
+    print(f"{count} тем в памяти")
+    print(f"список словарей: {as_dicts / 2 ** 20:8.2f} МиБ  ({as_dicts / count:6.0f} байт на тему)")
+    print(f"ThreadColumns:   {as_columns / 2 ** 20:8.2f} МиБ  ({as_columns / count:6.0f} байт на тему)\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('threads.parquet', 'threads.arrow', 'threads.npz'):
+            path = os.path.join(directory, name)
+            tracemalloc.start()
+            start = perf_counter()
+            with ThreadExporter(path, batch_size=50000) as exporter:
+                exporter.write_many(records(count), 412)
+            elapsed = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = sum(os.path.getsize(os.path.join(directory, file)) for file in os.listdir(directory) if file.startswith(os.path.splitext(name)[0]) and file.endswith(os.path.splitext(name)[1]))
+            print(f"{name:16} {elapsed:7.2f} с  {count / elapsed:10.0f} тем/с  пик {peak / 2 ** 20:7.2f} МиБ  файл {size / 2 ** 20:7.2f} МиБ")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Пропускная способность AsyncArizonaAPI при разной конкурентности против локального сервера (LocalForum)
+
+Сервер отвечает с задержкой и заданной долей ошибок / 429, поэтому результаты воспроизводимы
+и не нагружают настоящий форум.
+
+Запуск: python benchmarks/bench_load.py [задержка, с] [доля ошибок] [доля 429] [запросов на прогон]
+"""
+import asyncio
+import sys
+from collections import Counter
+from time import perf_counter
+
+import harness  # noqa: F401 - добавляет корень репозитория в sys.path
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+CONCURRENCY = (1, 5, 10, 25, 50, 100)
+
+
+async def run(forum: LocalForum, concurrency: int, total: int, error_rate: float, rate_limit_rate: float) -> tuple:
+    forum.error_rate = forum.rate_limit_rate = 0
+    async with AsyncArizonaAPI(USER_AGENT, {}, cookie_store=None, limit=concurrency, limit_per_host=concurrency, base_url=forum.url) as api:
+        # Ошибки включаются после входа, чтобы замерялись только вызовы методов
+        forum.error_rate, forum.rate_limit_rate = error_rate, rate_limit_rate
+        forum.stats.clear()
+        semaphore = asyncio.Semaphore(concurrency)
+        errors = Counter()
+
+        async def call(index: int):
+            async with semaphore:
+                try:
+                    if index % 2: await api.get_thread(412001 + index % forum.threads_per_category)
+                    else: await api.get_member(index + 2)
+                except Exception as exception:
+                    errors[type(exception).__name__] += 1
+
+        start = perf_counter()
+        await asyncio.gather(*(call(index) for index in range(total)))
+        return perf_counter() - start, errors
+
+
+async def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    error_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    rate_limit_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    total = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+
+    async with LocalForum(latency=latency, jitter=latency / 2) as forum:
+        print(f"{'потоков':>8} {'время':>9} {'вызовов/с':>10} {'запросов':>9}  ошибки")
+        for concurrency in CONCURRENCY:
+            elapsed, errors = await run(forum, concurrency, total, error_rate, rate_limit_rate)
+            print(f"{concurrency:8d} {elapsed:8.2f}с {total / elapsed:10.1f} {forum.stats['requests']:9d}  {dict(errors) or '-'}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Память, которую занимают модели сообщений: живой Tag BeautifulSoup (как раньше) против HtmlFragment (строка)
+
+Tag держит ссылку на все дерево страницы, поэтому каждое сообщение, полученное через get_post,
+удерживает целую страницу темы. HtmlFragment хранит только HTML сообщения.
+
+Запуск: python benchmarks/bench_memory.py [количество сообщений]
+"""
+import gc
+import sys
+import tracemalloc
+
+from bs4 import BeautifulSoup
+from harness import POST_ID, load
+
+from arz_api_extended.models.post_object import Post
+from arz_api_extended.parsers import soup
+
+
+def legacy_post(content: bytes, post_id: int) -> Post:
+    """Модель с живым Tag, как до HtmlFragment"""
+
+    post = BeautifulSoup(content, 'lxml').find('article', {'id': f'js-post-{post_id}'})
+    bb_content = post.find('div', {'class': 'bbWrapper'})
+    model = Post(None, post_id, None, None, int(post.find('time', {'class': 'u-dt'})['data-time']), '', bb_content.text)
+    model.bb_content = bb_content
+    return model
+
+
+def fragment_post(content: bytes, post_id: int) -> Post:
+    data = soup.parse_post(content, post_id)
+    return Post(None, post_id, None, None, data['create_date'], data['bb_content'], data['text_content'])
+
+
+def retained(build, content: bytes, count: int) -> int:
+    """Память (байт), которую удерживают count моделей после сборки мусора"""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        models = [build(content, POST_ID) for _ in range(count)]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del models
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    content = load('thread_page.html')
+
+    legacy = retained(legacy_post, content, count)
+    fragment = retained(fragment_post, content, count)
+    print(f"{count} сообщений (страница {len(content) / 1024:.0f} КиБ)")
+    print(f"Tag:          {legacy / 2 ** 20:8.2f} МиБ  ({legacy / count / 1024:8.1f} КиБ на сообщение)")
+    print(f"HtmlFragment: {fragment / 2 ** 20:8.2f} МиБ  ({fragment / count / 1024:8.1f} КиБ на сообщение)")
+    print(f"в {legacy / fragment:.0f} раз меньше")
+
+
+if __name__ == '__main__':
+    main()
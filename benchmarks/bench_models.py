@@ -0,0 +1,82 @@
+"""Модели на __slots__ против прежних классов с __dict__: память на объект, to_dict / from_dict и pickle
+
+Прежний Member (атрибуты в __dict__, url строкой, обязательная ссылка на API) повторен здесь для сравнения.
+
+Запуск: python benchmarks/bench_models.py [количество объектов]
+"""
+import gc
+import pickle
+import sys
+import tracemalloc
+
+from harness import HEADER, measure, report
+
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models import Member, Thread
+from arz_api_extended.models.post_object import Post
+
+
+class LegacyMember:
+    def __init__(self, API, id, username, user_title, avatar, roles, messages_count, reactions_count, trophies_count, username_color) -> None:
+        self.API = API
+        self.id = id
+        self.username = username
+        self.user_title = user_title
+        self.avatar = avatar
+        self.roles = roles
+        self.messages_count = messages_count
+        self.reactions_count = reactions_count
+        self.trophies_count = trophies_count
+        self.username_color = username_color
+        self.url = f"{MAIN_URL}/members/{self.id}/"
+        self.hydrated = True
+
+
+def member(cls, index: int):
+    return cls(None, index, f'Nick_Name{index}', 'Пользователь', f'/data/avatars/l/{index}.jpg', ['Игрок'], index % 5000, index % 900, index % 70, '#fff')
+
+
+def retained(cls, count: int) -> int:
+    """Память (байт), которую удерживают count объектов"""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        models = [member(cls, index) for index in range(count)]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del models
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    legacy, slotted = retained(LegacyMember, count), retained(Member, count)
+    print(f"{count} объектов Member")
+    print(f"__dict__:  {legacy / 2 ** 20:8.2f} МиБ  ({legacy / count:6.0f} байт на объект)")
+    print(f"__slots__: {slotted / 2 ** 20:8.2f} МиБ  ({slotted / count:6.0f} байт на объект)\n")
+
+    creator = member(Member, 1)
+    thread = Thread(None, 8801234, Member.stub(None, 2, 'Stub_Name'), 1700000000, 'Тема', 'Жалоба', 'текст', '<div>текст</div>', 3, 88012340, False)
+    posts = [Post(None, 88012340 + index, creator, thread, 1700000000 + index, f'<div class="bbWrapper">сообщение {index}</div>', f'сообщение {index}') for index in range(1000)]
+    dicts = [post.to_dict() for post in posts]
+    dump = pickle.dumps(posts)
+    print(f"pickle 1000 сообщений: {len(dump) / 1024:.1f} КиБ\n")
+
+    print(HEADER)
+    for name, result in (
+        ('to_dict, 1000 сообщений', measure(lambda: [post.to_dict() for post in posts])),
+        ('from_dict, 1000 сообщений', measure(lambda: [Post.from_dict(data) for data in dicts])),
+        ('from_dict frozen, 1000 сообщений', measure(lambda: [Post.from_dict(data, frozen=True) for data in dicts])),
+        ('pickle.dumps, 1000 сообщений', measure(pickle.dumps, posts)),
+        ('pickle.loads, 1000 сообщений', measure(pickle.loads, dump)),
+        ('set() по ID, 1000 сообщений', measure(set, posts)),
+    ):
+        print(report(name, result))
+
+
+if __name__ == '__main__':
+    main()
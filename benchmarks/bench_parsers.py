@@ -0,0 +1,64 @@
+"""Время и память каждой функции разбора по отдельности на записанных страницах (без сети)
+
+Запуск: python benchmarks/bench_parsers.py [soup|lxml|all] [фильтр по имени функции]
+"""
+import json
+import sys
+
+from harness import HEADER, MEMBER_ID, POST_ID, PROFILE_POST_ID, THREAD_ID, load, measure, report
+
+from arz_api_extended.bypass_antibot.script import solve_challenge
+from arz_api_extended.parsers import BACKENDS
+from arz_api_extended.parsers.payload import loads
+
+CASES = [
+    ('parse_logged_in', 'index.html', ()),
+    ('parse_current_user_id', 'index.html', ()),
+    ('parse_forum_statistic', 'index.html', ()),
+    ('parse_category', 'forum_page.json', ()),
+    ('parse_categories', 'forum_page.json', ()),
+    ('parse_threads', 'forum_page.json', ()),
+    ('parse_thread_records', 'forum_page.json', ()),
+    ('parse_threads_extended', 'forum_page.json', ()),
+    ('parse_parent_category_id', 'category_page.html', ()),
+    ('parse_thread', 'thread_page.json', ()),
+    ('parse_thread_posts', 'thread_page.json', ()),
+    ('parse_thread_posts_page', 'thread_page.json', ()),
+    ('parse_thread_posts_full', 'thread_page.json', (THREAD_ID,)),
+    ('parse_first_post_id', 'thread_page.html', ()),
+    ('parse_thread_category_id', 'thread_page.html', ()),
+    ('parse_post', 'thread_page.html', (POST_ID,)),
+    ('parse_posts', 'thread_page.html', ()),
+    ('parse_member', 'member.json', (MEMBER_ID,)),
+    ('parse_profile_messages', 'profile_posts.json', ()),
+    ('parse_profile_post', 'profile_post.html', (PROFILE_POST_ID,)),
+    ('parse_notifications', 'alerts.html', ()),
+    ('parse_search_results', 'search.html', ()),
+]
+"""(функция, записанная страница, дополнительные аргументы)"""
+
+
+def main():
+    backends = sys.argv[1] if len(sys.argv) > 1 else 'all'
+    backends = list(BACKENDS) if backends == 'all' else [backends]
+    pattern = sys.argv[2] if len(sys.argv) > 2 else ''
+
+    print(HEADER)
+    for name, fixture, args in CASES:
+        if pattern not in name: continue
+        args = (load(fixture), *args)
+        for backend in backends:
+            print(report(f"{backend}.{name}", measure(getattr(BACKENDS[backend], name), *args)))
+
+    if pattern in 'loads':
+        for fixture in ('forum_page.json', 'thread_page.json', 'member.json'):
+            content = load(fixture, raw=True)
+            print(report(f"json.loads({fixture})", measure(json.loads, content)))
+            print(report(f"payload.loads({fixture})", measure(loads, content)))
+
+    if pattern in 'solve_challenge':
+        print(report("solve_challenge", measure(solve_challenge, load('challenge.html').decode())))
+
+
+if __name__ == '__main__':
+    main()
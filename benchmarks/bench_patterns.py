@@ -0,0 +1,51 @@
+"""Экономия от заранее скомпилированных выражений и поиска цвета роли по классам (parsers.patterns) на одной странице раздела
+
+Прежние варианты (поиск каждого стиля в str(тега), compile/findall на каждый вызов) повторены здесь для сравнения.
+
+Запуск: python benchmarks/bench_patterns.py
+"""
+import re
+
+from bs4 import BeautifulSoup
+from harness import HEADER, load, measure, report
+from lxml.html import tostring
+
+from arz_api_extended.consts import ROLE_COLOR
+from arz_api_extended.parsers import soup, xpath
+from arz_api_extended.parsers.patterns import DIGITS, THREAD_ITEM, USERNAME
+
+
+def legacy_color(html: str) -> str:
+    for style in ROLE_COLOR:
+        if style in html:
+            return ROLE_COLOR[style]
+    return '#fff'
+
+
+def main():
+    page = load('forum_page.json')
+    document = BeautifulSoup(page.content, 'lxml')
+    tags = document.find_all(class_=re.compile('username'))
+    tags = [tag for tag in tags if 'username' in tag['class']]
+    elements = xpath._document(page.content).xpath(f"//*[{xpath._class('username')}]")
+    links = [thread.find('div', "structItem-title").find_all("a")[-1]['href'] for thread in document.find_all('div', class_=THREAD_ITEM)]
+
+    print(f"страница: {len(links)} тем, {len(tags)} ников\n")
+    print(HEADER)
+    for name, result in (
+        ('soup: цвет, str(тега) + поиск стилей', measure(lambda: [legacy_color(str(tag)) for tag in tags])),
+        ('soup: цвет, классы + пересечение', measure(lambda: [soup.role_color(soup._classes(tag)) for tag in tags])),
+        ('lxml: цвет, tostring + поиск стилей', measure(lambda: [legacy_color(tostring(element, encoding=str)) for element in elements])),
+        ('lxml: цвет, классы + пересечение', measure(lambda: [xpath._color(element) for element in elements])),
+        ('ID тем, findall x2 на ссылку', measure(lambda: [int(re.findall(r'\d+', link)[0]) for link in links if len(re.findall(r'\d+', link)) > 0])),
+        ('ID тем, DIGITS.search', measure(lambda: [int(match.group()) for match in map(DIGITS.search, links) if match is not None])),
+        ('поиск тем, compile на вызов', measure(lambda: document.find_all('div', class_=re.compile('structItem structItem--thread.*')))),
+        ('поиск тем, THREAD_ITEM', measure(lambda: document.find_all('div', class_=THREAD_ITEM))),
+        ('ники, compile на вызов', measure(lambda: document.find_all(class_=re.compile('username')))),
+        ('ники, USERNAME', measure(lambda: document.find_all(class_=USERNAME))),
+    ):
+        print(report(name, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Сравнение скорости решения задачи анти-бота: чистый Python против dukpy
+
+Запуск: python benchmarks/bypass_solver.py [количество повторов]
+"""
+import os
+import sys
+from timeit import timeit
+
+import harness  # noqa: F401 - добавляет корень репозитория в sys.path
+from arz_api_extended.bypass_antibot.script import dukpy, solve_dukpy, solve_native
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    key, iv, cipher = (os.urandom(16).hex() for _ in range(3))
+
+    native = timeit(lambda: solve_native(key, iv, cipher), number=number) / number
+    print(f"native: {native * 1000:.3f} мс на решение")
+
+    if dukpy is None:
+        print("dukpy не установлен, сравнение пропущено")
+        return
+
+    assert solve_native(key, iv, cipher) == solve_dukpy(key, iv, cipher)
+    js = timeit(lambda: solve_dukpy(key, iv, cipher), number=number) / number
+    print(f"dukpy:  {js * 1000:.3f} мс на решение")
+    print(f"ускорение: x{js / native:.1f}")
+
+
+if __name__ == '__main__':
+    main()
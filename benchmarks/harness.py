@@ -0,0 +1,81 @@
+"""Общие функции бенчмарков: загрузка записанных страниц и замер времени / памяти
+
+Записанные страницы лежат в benchmarks/fixtures:
+    forum_page.json     - JSON ответ страницы раздела (/forums/{id}/page-N?_xfResponseType=json)
+    category_page.html  - HTML страница раздела (хлебные крошки)
+    thread_page.json    - JSON ответ страницы темы
+    thread_page.html    - HTML страница темы (/threads/{id}, /posts/{id})
+    member.json         - JSON ответ профиля (/members/{id})
+    profile_posts.json  - JSON ответ стенки профиля (/members/{id}/page-N)
+    profile_post.html   - HTML страница сообщения профиля (/profile-posts/{id})
+    alerts.html         - HTML страница уведомлений (/account/alerts)
+    search.html         - HTML страница результатов поиска
+    index.html          - главная страница (статистика форума, авторизация, ID пользователя)
+    challenge.html      - страница с задачей анти-бота
+"""
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+# Скрипты запускаются как python benchmarks/<скрипт>.py - пакет берется из корня репозитория без установки
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arz_api_extended.parsers.payload import loads
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+THREAD_ID, POST_ID, MEMBER_ID, PROFILE_POST_ID, CATEGORY_ID = 8801234, 88012340, 1234567, 77000000, 412
+"""ID, под которые записаны страницы"""
+
+
+def load(name: str, raw: bool = False):
+    """Содержимое записанной страницы: JsonPage для .json (как ответ клиента), иначе (или при raw=True) bytes"""
+
+    with open(os.path.join(FIXTURES, name), 'rb') as file:
+        content = file.read()
+    return loads(content) if name.endswith('.json') and not raw else content
+
+
+def measure(func, *args, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """Замерить функцию: время одного вызова (минимум и среднее по repeat сериям), операций в секунду
+    и память одного вызова по tracemalloc (пик и количество выделенных блоков, оставшихся после вызова)
+
+    Количество вызовов в серии подбирается так, чтобы серия шла не меньше min_time секунд
+    """
+
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number): func(*args)
+        elapsed = perf_counter() - start
+        if elapsed >= min_time: break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = perf_counter()
+        for _ in range(number): func(*args)
+        times.append((perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+
+    best, mean = min(times), sum(times) / len(times)
+    return {'min': best, 'mean': mean, 'ops': 1 / best if best else float('inf'), 'peak': peak, 'blocks': blocks, 'number': number}
+
+
+def report(name: str, result: dict) -> str:
+    return f"{name:40} {result['min'] * 1000:9.3f} мс  {result['mean'] * 1000:9.3f} мс  {result['ops']:10.1f} оп/с  {result['peak'] / 1024:9.1f} КиБ  {result['blocks']:7d}"
+
+
+HEADER = f"{'':40} {'мин.':>12}  {'сред.':>12}  {'':>15}  {'пик памяти':>13}  {'блоки':>7}"
@@ -0,0 +1,44 @@
+"""Проверка, что быстрый бэкенд разбора (lxml) возвращает то же, что эталонный (soup), и сравнение их скорости
+
+Страницы берутся из benchmarks/fixtures. Код возврата 1, если результаты хотя бы одной функции различаются.
+
+Запуск: python benchmarks/parser_parity.py [количество повторов]
+"""
+import sys
+from timeit import timeit
+
+from harness import MEMBER_ID, load
+
+from arz_api_extended.parsers import soup, xpath
+
+
+CASES = [
+    ('parse_threads', 'forum_page.json', ()),
+    ('parse_thread_records', 'forum_page.json', ()),
+    ('parse_threads_extended', 'forum_page.json', ()),
+    ('parse_thread_posts', 'thread_page.json', ()),
+    ('parse_thread_posts_page', 'thread_page.json', ()),
+    ('parse_member', 'member.json', (MEMBER_ID,)),
+    ('parse_notifications', 'alerts.html', ()),
+]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    failed = False
+
+    for name, fixture, args in CASES:
+        args = (load(fixture), *args)
+        reference, fast = getattr(soup, name), getattr(xpath, name)
+
+        same = reference(*args) == fast(*args)
+        failed |= not same
+        soup_time = timeit(lambda: reference(*args), number=number) / number
+        lxml_time = timeit(lambda: fast(*args), number=number) / number
+        print(f"{name:26} {'OK  ' if same else 'DIFF'} soup {soup_time * 1000:7.2f} мс  lxml {lxml_time * 1000:7.2f} мс  x{soup_time / lxml_time:.1f}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Локальный сервер-заглушка форума, отдающий записанные страницы из benchmarks/fixtures
+
+Пока в запросе нет cookie анти-бота (R3ACTLAB-ARZ1), отдается страница с задачей (как на настоящем форуме).
+Страницы отдаются одни и те же для любых ID, поэтому запрашивать нужно ID из harness (THREAD_ID, MEMBER_ID...)
+
+Запуск: python benchmarks/stub_server.py [порт]
+Пример: ArizonaAPI(user_agent, {}, cookie_store=None, base_url="http://127.0.0.1:8765")
+"""
+import asyncio
+import os
+import re
+import sys
+from threading import Event, Thread
+
+from aiohttp import web
+
+from harness import FIXTURES
+
+ROUTES = [
+    (re.compile(r'/forums/\d+(/page-\d+)?/?$'), 'forum_page.json', 'category_page.html'),
+    (re.compile(r'/threads/\d+(/page-\d+)?/?$'), 'thread_page.json', 'thread_page.html'),
+    (re.compile(r'/posts/\d+/?$'), None, 'thread_page.html'),
+    (re.compile(r'/members/\d+/page-\d+/?$'), 'profile_posts.json', None),
+    (re.compile(r'/members/\d+/?$'), 'member.json', None),
+    (re.compile(r'/profile-posts/\d+/?$'), None, 'profile_post.html'),
+    (re.compile(r'/account/alerts/?$'), None, 'alerts.html'),
+    (re.compile(r'/search/'), None, 'search.html'),
+    (re.compile(r'/(account|help/terms)?/?$'), None, 'index.html'),
+]
+"""(путь, страница для _xfResponseType=json, HTML страница)"""
+
+PAGES = {}
+
+
+def page(name: str) -> bytes:
+    if name not in PAGES:
+        with open(os.path.join(FIXTURES, name), 'rb') as file:
+            PAGES[name] = file.read()
+    return PAGES[name]
+
+
+async def handle(request: web.Request) -> web.Response:
+    if 'R3ACTLAB-ARZ1' not in request.cookies:
+        return web.Response(body=page('challenge.html'), content_type='text/html')
+
+    is_json = request.query.get('_xfResponseType') == 'json'
+    for pattern, json_page, html_page in ROUTES:
+        if pattern.match(request.path):
+            name = json_page if is_json else html_page
+            if name is None: break
+            return web.Response(body=page(name), content_type='application/json' if name.endswith('.json') else 'text/html')
+
+    if is_json:
+        return web.json_response({'status': 'error', 'errors': ['Запрашиваемая страница не может быть найдена.']}, status=404)
+    raise web.HTTPNotFound()
+
+
+def make_app() -> web.Application:
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handle)
+    return app
+
+
+def start(host: str = '127.0.0.1', port: int = 8765) -> str:
+    """Запустить сервер в фоновом потоке
+
+    Returns:
+        Адрес сервера (для base_url)
+    """
+
+    ready = Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(make_app(), access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, host, port).start())
+        ready.set()
+        loop.run_forever()
+
+    Thread(target=run, daemon=True).start()
+    ready.wait()
+    return f"http://{host}:{port}"
+
+
+if __name__ == '__main__':
+    web.run_app(make_app(), host='127.0.0.1', port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+from arz_api_extended import ArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+@pytest.fixture
+def forum():
+    """Локальный форум в фоновом потоке"""
+
+    forum = LocalForum(threads_per_category=45, retry_after=0)
+    forum.start_in_thread()
+    yield forum
+    forum.stop_thread()
+
+
+@pytest.fixture
+def make_api(forum):
+    """Клиент ArizonaAPI для локального форума, параметры конструктора можно переопределить"""
+
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault('cookie_store', None)
+        api = ArizonaAPI('pytest', {}, base_url=forum.url, **kwargs)
+        clients.append(api)
+        return api
+
+    yield make
+    for api in clients:
+        api.logout()
+
+
+class FakeClock:
+    """Часы для time.monotonic / time.time, которые двигаются только вручную (или через sleep)"""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('arz_api_extended.ratelimit.time', SimpleNamespace(monotonic=clock, time=clock, sleep=clock.advance))
+    monkeypatch.setattr('arz_api_extended.cache.monotonic', clock)
+    monkeypatch.setattr('arz_api_extended.bypass_antibot.store.time', clock)
+    return clock
+
+
+@pytest.fixture
+def forum_clock(monkeypatch):
+    """Часы локального форума (время ответов и новых тем)"""
+
+    clock = FakeClock(1800000000)
+    monkeypatch.setattr('arz_api_extended.local_server.time', clock)
+    return clock
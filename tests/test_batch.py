@@ -0,0 +1,70 @@
+import asyncio
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+def count_calls(api, name: str) -> list:
+    """Подменить метод клиента, чтобы видеть аргументы каждого вызова"""
+
+    calls, method = [], getattr(api, name)
+    def recorder(*args):
+        calls.append(args)
+        return method(*args)
+    setattr(api, name, recorder)
+    return calls
+
+
+def test_get_threads_by_id(forum, make_api):
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    threads = api.get_threads_by_id([412005, 412001, 412005, 412999])
+    assert list(threads) == [412005, 412001, 412999]
+    assert [thread.id for thread in list(threads.values())[:2]] == [412005, 412001]
+    assert threads[412999] is None
+    assert forum.stats['requests'] - requests == 3
+
+
+def test_get_posts_groups_by_page(make_api):
+    api = make_api()
+    pages = count_calls(api, '_get_posts_page')
+    post_ids = [412003041, 412003002, 412003001, 412003020, 412003099, 412004001, 412003001]
+
+    posts = api.get_posts(post_ids)
+    assert list(posts) == [412003041, 412003002, 412003001, 412003020, 412003099, 412004001]
+    assert posts[412003099] is None
+    assert all(posts[post_id].id == post_id for post_id in posts if post_id != 412003099)
+    # 1 и 3 страница темы 412003, несуществующее сообщение и тема 412004
+    assert sorted(args[0] for args in pages) == [412003001, 412003041, 412003099, 412004001]
+    # сообщения одной темы получают общий объект Thread
+    assert posts[412003041].thread is posts[412003002].thread
+    assert posts[412004001].thread.id == 412004
+
+
+def test_get_posts_concurrent(make_api):
+    api = make_api()
+    post_ids = [412003001, 412005001, 412007001, 412009001]
+    posts = api.get_posts(post_ids, hydrate=True, max_concurrency=4)
+    assert [post.thread.id for post in posts.values()] == [412003, 412005, 412007, 412009]
+    assert all(post.creator.username for post in posts.values())
+
+
+def test_async_batch():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                threads = await api.get_threads_by_id([412005, 412001, 412005, 412999])
+                await api.get_token()
+                requests = forum.stats['requests']
+                posts = await api.get_posts([412003041, 412003002, 412003001, 412003099])
+                # 2 страницы темы, несуществующее сообщение и сама тема
+                fetched = forum.stats['requests'] - requests
+            return threads, posts, fetched
+
+    threads, posts, fetched = asyncio.run(run())
+    assert list(threads) == [412005, 412001, 412999] and threads[412999] is None
+    assert list(posts) == [412003041, 412003002, 412003001, 412003099]
+    assert posts[412003099] is None and posts[412003041].thread is posts[412003001].thread
+    assert fetched == 4
@@ -0,0 +1,75 @@
+from arz_api_extended import ResponseCache
+from arz_api_extended.cache import MISS
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl=10, ttls={'member': 5})
+    cache.set('member', 1, value='участник')
+    cache.set('other', 1, value='другое')
+
+    clock.advance(4.9)
+    assert cache.get('member', 1) == 'участник'
+    clock.advance(0.2)
+    assert cache.get('member', 1) is MISS
+    assert cache.get('other', 1) == 'другое'
+    clock.advance(5)
+    assert cache.get('other', 1) is MISS
+    assert len(cache) == 0
+
+
+def test_none_is_cached():
+    cache = ResponseCache()
+    cache.set('thread', 1, value=None)
+    assert cache.get('thread', 1) is None
+    assert cache.stats['hits'] == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.set('member', 1, value=1)
+    cache.set('member', 2, value=2)
+    cache.get('member', 1)
+    cache.set('member', 3, value=3)
+
+    assert cache.get('member', 2) is MISS
+    assert (cache.get('member', 1), cache.get('member', 3)) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_invalidate_by_prefix():
+    cache = ResponseCache()
+    for page in (1, 2):
+        cache.set('thread_posts', 10, page, value=page)
+    cache.set('thread_posts', 100, 1, value=0)
+    cache.set('thread', 10, value=0)
+
+    assert cache.invalidate('thread_posts', 10) == 2
+    assert cache.get('thread_posts', 100, 1) == 0
+    assert cache.get('thread', 10) == 0
+    assert cache.invalidate() == 2
+
+
+def test_client_reuses_and_invalidates(forum, make_api):
+    cache = ResponseCache()
+    api = make_api(cache=cache)
+
+    api.get_member(5)
+    posts = api.get_thread_posts(412003, 1)
+    requests = forum.stats['requests']
+    api.get_member(5)
+    assert api.get_thread_posts(412003, 1) == posts
+    assert forum.stats['requests'] == requests
+
+    api.answer_thread(412003, 'текст')
+    assert cache.get('thread_posts', 412003, 1) is MISS
+    assert cache.get('member', 5) is not MISS
+
+
+def test_changed_result_does_not_touch_cache(forum, make_api):
+    api = make_api(cache=ResponseCache())
+    member = api.get_member(5)
+    roles = list(member.roles)
+    member.roles.append('Изменено')
+
+    assert api.get_member(5).roles == roles
+    assert api.get_member(5).roles is not api.get_member(5).roles
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+from arz_api_extended.watchers import CategoryFeed
+
+
+def count_pages(api) -> list:
+    """Подменить get_threads_extended клиента, чтобы видеть загруженные страницы"""
+
+    pages, get_threads_extended = [], api.get_threads_extended
+    def recorder(category_id, page=1):
+        pages.append(page)
+        return get_threads_extended(category_id, page)
+    api.get_threads_extended = recorder
+    return pages
+
+
+def kinds(events: list) -> list:
+    return [(event['type'], event['thread_id']) for event in events]
+
+
+def started_feed(make_api, **kwargs) -> tuple:
+    api = make_api()
+    pages = count_pages(api)
+    feed = CategoryFeed(api, **kwargs)
+    feed.follow(412)
+    assert feed.poll() == []
+    pages.clear()
+    return api, feed, pages
+
+
+def test_first_poll_is_silent_and_quiet_category_costs_one_page(make_api):
+    api, feed, pages = started_feed(make_api)
+    assert feed.state['412']['watermark'] == 1700500000 + 412020
+    assert len(feed.state['412']['threads']) == 20
+
+    assert feed.poll() == []
+    assert pages == [1]
+
+
+def test_bump_new_and_closed(forum, forum_clock, make_api):
+    api, feed, pages = started_feed(make_api)
+
+    api.answer_thread(412015, 'текст')
+    forum_clock.advance(60)
+    thread_id = forum.add_thread(412)
+    forum.close_thread(412005)
+
+    events = feed.poll()
+    assert sorted(kinds(events)) == [('new_thread', thread_id), ('thread_bumped', 412015), ('thread_closed', 412005)]
+    assert events[0]['category_id'] == 412 and events[0]['thread']['thread_id'] == events[0]['thread_id']
+    assert feed.state['412']['watermark'] == 1800000060
+    assert pages == [1]
+    assert feed.poll() == []
+
+
+def test_deeper_pages_while_every_thread_is_new(forum, make_api):
+    api, feed, pages = started_feed(make_api)
+    for thread_id in range(412020, 412045):
+        api.answer_thread(thread_id, 'текст')
+
+    events = feed.poll()
+    # все 18 незакрепленных тем 1 страницы обновлены - нужна 2 страница, на ней есть старые темы
+    assert pages == [1, 2]
+    assert sorted(thread_id for _, thread_id in kinds(events)) == list(range(412020, 412045))
+    assert {kind for kind, _ in kinds(events)} == {'thread_bumped'}
+
+
+def test_max_pages_and_max_threads(forum, make_api):
+    api, feed, pages = started_feed(make_api, max_pages=1, max_threads=10)
+    assert len(feed.state['412']['threads']) == 10
+
+    for thread_id in range(412020, 412045):
+        api.answer_thread(thread_id, 'текст')
+    events = feed.poll()
+    assert pages == [1]
+    assert len(events) == 18
+    assert len(feed.state['412']['threads']) == 10
+
+
+def test_state_file(tmp_path, forum_clock, make_api):
+    path = str(tmp_path / 'categories.json')
+    api = make_api()
+    feed = CategoryFeed(api, path)
+    feed.follow(412)
+    feed.follow(413)
+    feed.poll()
+    with open(path, encoding='utf-8') as file:
+        assert set(json.load(file)) == {'412', '413'}
+
+    api.answer_thread(413030, 'текст')
+    feed = CategoryFeed(api, path)
+    assert kinds(feed.poll()) == [('thread_bumped', 413030)]
+
+    feed.unfollow(413)
+    assert list(CategoryFeed(api, path).state) == ['412']
+
+
+def test_async_feed(forum_clock):
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                feed = CategoryFeed(api)
+                feed.follow(412)
+                feed.follow(413)
+                first = await feed.poll()
+                await api.answer_thread(413007, 'текст')
+                forum.close_thread(412009)
+                second = await feed.poll()
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first == []
+    assert sorted(kinds(second)) == [('thread_bumped', 413007), ('thread_closed', 412009)]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+def expected(category_id: int, count: int, start: int = 1) -> list:
+    return [category_id * 1000 + index for index in range(start, count + 1)]
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 2, 10])
+def test_order_for_any_prefetch(forum, make_api, prefetch):
+    forum.threads_per_category = 95
+    api = make_api()
+    threads = list(api.iter_category_threads(412, prefetch=prefetch))
+    assert [thread['thread_id'] for thread in threads] == expected(412, 95)
+    assert threads[0]['thread_title'] == 'Тема #412001 от ' + threads[0]['username_author']
+
+
+def test_records_and_start_page(make_api):
+    api = make_api()
+    records = list(api.iter_category_threads(412, extended=False, start_page=2, prefetch=0))
+    assert records == [{'thread_id': thread_id, 'is_pinned': False} for thread_id in expected(412, 45, 21)]
+
+
+def test_stops_with_consumer(forum, make_api):
+    forum.threads_per_category = 400
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    threads = api.iter_category_threads(412, prefetch=2)
+    next(threads)
+    threads.close()
+    # первая страница и не больше prefetch страниц в фоне
+    assert forum.stats['requests'] - requests <= 3
+
+
+def test_async_order():
+    async def run():
+        async with LocalForum(threads_per_category=95) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                return [[thread['thread_id'] async for thread in api.iter_category_threads(412, prefetch=prefetch)] for prefetch in (0, 2, 10)]
+
+    for thread_ids in asyncio.run(run()):
+        assert thread_ids == expected(412, 95)
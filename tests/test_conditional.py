@@ -0,0 +1,85 @@
+import asyncio
+
+from arz_api_extended import AsyncArizonaAPI, ConditionalCache
+from arz_api_extended.cache import fingerprint
+from arz_api_extended.local_server import LocalForum
+
+
+def test_fingerprint_ignores_token_and_time():
+    first = b'<html data-csrf="1,aaa"><script>csrf: \'1,aaa\', time: { now: 100 }</script><p>text</p></html>'
+    second = b'<html data-csrf="2,bbb"><script>csrf: \'2,bbb\', time: { now: 200 }</script><p>text</p></html>'
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint(first) != fingerprint(first.replace(b'text', b'other'))
+
+
+def test_etag_revalidation(forum, make_api):
+    conditional = ConditionalCache()
+    api = make_api(conditional=conditional)
+    api.answer_thread(412003, 'текст')
+
+    first = api.get_notifications()
+    second = api.get_notifications()
+    assert first and second == first
+    assert forum.stats[304] == 1
+    assert conditional.stats == {'not_modified': 1, 'unchanged': 0, 'parsed': 1, 'size': 1}
+
+    # копия, а не сам закэшированный результат
+    second.clear()
+    assert api.get_notifications() == first
+
+    api.answer_thread(412003, 'еще текст')
+    assert len(api.get_notifications()) == len(first) + 1
+    assert conditional.parsed == 2
+
+
+def evict_after_headers(conditional) -> None:
+    """Запись вытесняется сразу после того, как клиент взял условные заголовки"""
+
+    headers = conditional.headers
+    def patched(key):
+        result = headers(key)
+        conditional.invalidate(key)
+        return result
+    conditional.headers = patched
+
+
+def test_304_after_eviction_refetches(forum, make_api):
+    conditional = ConditionalCache()
+    api = make_api(conditional=conditional)
+    api.answer_thread(412003, 'текст')
+    first = api.get_notifications()
+
+    evict_after_headers(conditional)
+    assert api.get_notifications() == first
+    assert forum.stats[304] == 1
+    assert (conditional.not_modified, conditional.parsed) == (0, 2)
+
+
+def test_unchanged_body_is_not_parsed_again(forum, make_api):
+    conditional = ConditionalCache()
+    api = make_api(conditional=conditional)
+
+    first = api.get_threads(412)
+    assert api.get_threads(412) == first
+    assert forum.stats[304] == 0
+    assert (conditional.unchanged, conditional.parsed) == (1, 1)
+
+    api.get_threads(412, 2)
+    assert conditional.parsed == 2
+
+
+def test_async_etag_revalidation():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            conditional = ConditionalCache()
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url, conditional=conditional) as api:
+                await api.answer_thread(412003, 'текст')
+                results = [await api.get_notifications() for _ in range(3)]
+                evict_after_headers(conditional)
+                results.append(await api.get_notifications())
+            return forum, conditional, results
+
+    forum, conditional, results = asyncio.run(run())
+    assert results[0] and results[0] == results[1] == results[2] == results[3]
+    assert forum.stats[304] == 3
+    assert (conditional.not_modified, conditional.parsed) == (2, 2)
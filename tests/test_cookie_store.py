@@ -0,0 +1,104 @@
+import json
+import threading
+
+import pytest
+
+from arz_api_extended import ArizonaAPI, RetryPolicy
+from arz_api_extended.bypass_antibot import CookieStore, FileCookieStore, MemoryCookieStore
+
+
+def test_cookie_store_is_abstract():
+    with pytest.raises(TypeError):
+        CookieStore()
+
+
+def test_memory_ttl_and_lru(clock):
+    store = MemoryCookieStore(maxsize=2, ttl=60)
+    store.set('ua1', '', 'R3ACTLAB-ARZ1=1')
+    store.set('ua2', 'socks5://proxy', 'R3ACTLAB-ARZ1=2')
+    assert store.get('ua2') is None
+    assert store.get('ua2', 'socks5://proxy') == 'R3ACTLAB-ARZ1=2'
+
+    store.get('ua1')
+    store.set('ua3', '', 'R3ACTLAB-ARZ1=3')
+    assert store.get('ua2', 'socks5://proxy') is None
+    assert store.get('ua1') == 'R3ACTLAB-ARZ1=1'
+
+    clock.advance(61)
+    assert store.get('ua1') is None and store.get('ua3') is None
+
+
+def test_file_store_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'cookies.json')
+    FileCookieStore(path).set('ua', '', 'R3ACTLAB-ARZ1=1')
+
+    assert FileCookieStore(path).get('ua') == 'R3ACTLAB-ARZ1=1'
+    with open(path, encoding='utf-8') as file:
+        assert json.load(file)['ua|']['cookie'] == 'R3ACTLAB-ARZ1=1'
+    assert (tmp_path / 'cookies.json.lock').exists()
+    # запись через временный файл и os.replace - временных файлов не остается
+    assert sorted(file.name for file in tmp_path.iterdir()) == ['cookies.json', 'cookies.json.lock']
+
+
+def test_file_store_ttl_uses_creation_time(tmp_path, clock):
+    path = str(tmp_path / 'cookies.json')
+    FileCookieStore(path, ttl=60).set('ua', '', 'R3ACTLAB-ARZ1=1')
+
+    clock.advance(50)
+    store = FileCookieStore(path, ttl=60)
+    assert store.get('ua') == 'R3ACTLAB-ARZ1=1'
+    # в памяти cookie живет от времени получения, а не от чтения файла
+    clock.advance(11)
+    assert store.get('ua') is None
+    assert store.memory.get('ua') is None
+
+
+def test_file_store_invalidate_and_broken_file(tmp_path):
+    path = tmp_path / 'cookies.json'
+    store = FileCookieStore(str(path))
+    store.set('ua1', '', 'R3ACTLAB-ARZ1=1')
+    store.set('ua2', '', 'R3ACTLAB-ARZ1=2')
+
+    store.invalidate('ua1')
+    assert store.get('ua1') is None and FileCookieStore(str(path)).get('ua1') is None
+    assert FileCookieStore(str(path)).get('ua2') == 'R3ACTLAB-ARZ1=2'
+
+    path.write_text('{не json', encoding='utf-8')
+    assert FileCookieStore(str(path)).get('ua2') is None
+
+
+def test_file_store_concurrent_writers(tmp_path):
+    path = str(tmp_path / 'cookies.json')
+    threads = [threading.Thread(target=lambda index=index: FileCookieStore(path).set(f'ua{index}', '', f'R3ACTLAB-ARZ1={index}')) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # блокировка не дает потерять записи при одновременном чтении-изменении-записи
+    with open(path, encoding='utf-8') as file:
+        assert len(json.load(file)) == 16
+
+
+def test_client_reuses_stored_cookie(forum, tmp_path):
+    store = FileCookieStore(str(tmp_path / 'cookies.json'))
+    ArizonaAPI('pytest', {}, cookie_store=store, base_url=forum.url).logout()
+    assert store.get('pytest') == 'R3ACTLAB-ARZ1=' + forum.antibot_cookie
+    challenges = forum.stats['challenge']
+
+    ArizonaAPI('pytest', {}, cookie_store=FileCookieStore(store.path), base_url=forum.url).logout()
+    assert forum.stats['challenge'] == challenges
+
+
+def test_challenge_replaces_stored_cookie(forum, tmp_path):
+    store = FileCookieStore(str(tmp_path / 'cookies.json'))
+    store.set('pytest', '', 'R3ACTLAB-ARZ1=stale')
+
+    # с RetryPolicy запрос после новой задачи анти-бота повторяется с новой cookie
+    api = ArizonaAPI('pytest', {}, cookie_store=store, base_url=forum.url, retry=RetryPolicy(backoff=0.001))
+    assert FileCookieStore(store.path).get('pytest') == 'R3ACTLAB-ARZ1=' + forum.antibot_cookie
+
+    forum.rotate_challenge()
+    assert api.get_member(2) is not None
+    assert FileCookieStore(store.path).get('pytest') == 'R3ACTLAB-ARZ1=' + forum.antibot_cookie
+    api.logout()
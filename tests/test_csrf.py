@@ -0,0 +1,84 @@
+import asyncio
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+def stale_forever(manager) -> None:
+    """Токен, который форум никогда не примет, даже после повторного запроса за ним"""
+
+    def harvest(content: bytes) -> str:
+        manager.set('stale')
+        return 'stale'
+    manager.harvest = harvest
+
+
+def test_stale_token_is_replayed_once(forum, make_api):
+    api = make_api()
+    api.token_manager.set('stale')
+    fetches = api.token_manager.fetches
+
+    assert api.answer_thread(412003, 'текст').status_code == 200
+    assert forum.stats[400] == 1
+    assert api.token_manager.fetches == fetches + 1
+    assert api.token_manager.cached == forum.token
+    assert len(forum.replies[412003]) == 1
+
+
+def test_cached_token_is_reused(forum, make_api):
+    api = make_api()
+    api.answer_thread(412003, 'первый')
+    fetches = api.token_manager.fetches
+
+    api.answer_thread(412003, 'второй')
+    assert api.token_manager.fetches == fetches
+    assert forum.stats[400] == 0
+
+
+def test_no_second_replay(forum, make_api):
+    api = make_api()
+    stale_forever(api.token_manager)
+    api.token_manager.set('stale')
+    requests = forum.stats['requests']
+
+    assert api.answer_thread(412003, 'текст').status_code == 400
+    # запрос, запрос за токеном и один повтор
+    assert forum.stats['requests'] - requests == 3
+    assert forum.stats[400] == 2
+    assert not forum.replies
+
+
+def test_async_stale_token_is_replayed_once():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                api.token_manager.set('stale')
+                first = await api.answer_thread(412003, 'текст')
+
+                stale_forever(api.token_manager)
+                api.token_manager.set('stale')
+                second = await api.answer_thread(412003, 'текст')
+            return forum, first, second
+
+    forum, first, second = asyncio.run(run())
+    assert (first.status, second.status) == (200, 400)
+    assert forum.stats[400] == 3
+    assert len(forum.replies[412003]) == 1
+
+
+def test_async_avatar_form_is_replayed(tmp_path):
+    image = tmp_path / 'avatar.png'
+    image.write_bytes(b'\x89PNG avatar')
+
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                statuses = []
+                for send in (lambda: api.edit_avatar(str(image)), api.delete_avatar):
+                    api.token_manager.set('stale')
+                    statuses.append((await send()).status)
+            return forum, statuses
+
+    forum, statuses = asyncio.run(run())
+    assert statuses == [200, 200]
+    assert forum.stats[400] == 2
@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip('numpy')
+ipc = pytest.importorskip('pyarrow.ipc')
+parquet = pytest.importorskip('pyarrow.parquet')
+
+from arz_api_extended.export import DICTIONARY_COLUMNS, MISSING, ThreadExporter, read_npz
+
+
+@pytest.fixture
+def records(make_api):
+    records = list(make_api().iter_category_threads(412))
+    # запись без префикса и даты - проверка MISSING / null
+    records.append({'thread_id': 999001, 'thread_title': 'Без префикса', 'username_author': 'Nick_Name', 'is_pinned': False, 'is_closed': True})
+    return records
+
+
+def expected(records: list, name: str, category_id: int = 412) -> list:
+    if name == 'category_id':
+        return [category_id] * len(records)
+    return [record.get(name) for record in records]
+
+
+def test_parquet_round_trip(records, tmp_path):
+    path = str(tmp_path / 'threads.parquet')
+    with ThreadExporter(path, batch_size=10) as exporter:
+        assert exporter.write_many(records, 412) == len(records)
+    assert exporter.rows == len(records) and exporter.batches == 5
+
+    table = parquet.read_table(path)
+    assert table.num_rows == len(records)
+    for name in ('thread_id', 'category_id', 'created_date', 'thread_title', 'is_closed', *DICTIONARY_COLUMNS):
+        assert table.column(name).to_pylist() == expected(records, name), name
+
+
+def test_arrow_stream_round_trip(records, tmp_path):
+    path = str(tmp_path / 'threads.arrow')
+    with ThreadExporter(path, batch_size=16, compression=None) as exporter:
+        exporter.write_many(records, 412)
+
+    with ipc.open_stream(path) as reader:
+        table = reader.read_all()
+    for name in ('thread_id', 'last_message_date', 'is_pinned', *DICTIONARY_COLUMNS):
+        assert table.column(name).to_pylist() == expected(records, name), name
+
+
+def test_npz_round_trip(records, tmp_path):
+    path = str(tmp_path / 'threads.npz')
+    with ThreadExporter(path, batch_size=20) as exporter:
+        exporter.write_many(records, 412)
+    assert sorted(file.name for file in tmp_path.iterdir()) == ['threads-00000.npz', 'threads-00001.npz', 'threads-00002.npz']
+
+    columns = read_npz(path)
+    assert columns['thread_id'].tolist() == expected(records, 'thread_id')
+    assert columns['created_date'][-1] == MISSING
+    assert columns['is_closed'].tolist() == expected(records, 'is_closed')
+    for name in DICTIONARY_COLUMNS:
+        values = columns[f'{name}.values']
+        # коды из разных частей ссылаются на общий словарь последней части
+        decoded = [None if code == MISSING else str(values[code]) for code in columns[name]]
+        assert decoded == expected(records, name), name
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ThreadExporter(str(tmp_path / 'threads.csv'))
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from arz_api_extended import AsyncArizonaAPI, Member
+from arz_api_extended.local_server import LocalForum
+
+
+def test_stub_hydrates_on_first_profile_field(forum, make_api):
+    api = make_api()
+    creator = api.get_thread(412003).creator
+    assert not creator.hydrated
+    assert creator.to_dict() == {'id': creator.id, 'username': creator.username, 'hydrated': False}
+
+    requests = forum.stats['requests']
+    assert creator.messages_count == creator.id
+    assert creator.roles == ['Игрок']
+    assert creator.hydrated
+    # все поля профиля загружаются одним запросом
+    assert forum.stats['requests'] - requests == 1
+
+
+def test_hydrate_true_loads_profile_upfront(forum, make_api):
+    api = make_api()
+    creator = api.get_thread(412003, hydrate=True).creator
+    assert creator.hydrated
+
+    requests = forum.stats['requests']
+    assert creator.user_title == f'Пользователь #{creator.id}'
+    assert forum.stats['requests'] == requests
+
+
+def test_frozen_stub_can_still_hydrate(forum, make_api):
+    api = make_api()
+    creator = api.get_thread(412003).creator.freeze()
+    assert creator.trophies_count == creator.id % 100
+    with pytest.raises(AttributeError):
+        creator.username = 'other'
+
+
+def test_stub_without_api_raises_attribute_error():
+    member = Member.stub(None, 7, 'Nick_Name')
+    with pytest.raises(AttributeError):
+        member.roles
+    with pytest.raises(AttributeError):
+        member.unknown_field
+    assert not hasattr(member, 'avatar')
+
+
+def test_async_stub_needs_explicit_hydrate():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                creator = (await api.get_thread(412003)).creator
+                with pytest.raises(AttributeError, match='await member.hydrate'):
+                    creator.messages_count
+                requests = forum.stats['requests']
+                assert await creator.hydrate() is creator
+                return creator, forum.stats['requests'] - requests
+
+    creator, fetched = asyncio.run(run())
+    assert creator.hydrated and fetched == 1
+    assert creator.messages_count == creator.id
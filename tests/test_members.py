@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+def fail_for(api, *user_ids) -> None:
+    """get_member клиента поднимает ошибку для указанных ID"""
+
+    get_member = api.get_member
+    def patched(user_id):
+        if user_id in user_ids:
+            raise ValueError(user_id)
+        return get_member(user_id)
+    api.get_member = patched
+
+
+def test_get_members_deduplicates_and_keeps_order(forum, make_api):
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    members = api.get_members([7, 3, 7, 5, 3, 9], max_concurrency=3)
+    assert list(members) == [7, 3, 5, 9]
+    assert [member.id for member in members.values()] == [7, 3, 5, 9]
+    assert forum.stats['requests'] - requests == 4
+
+
+def test_on_error_result_goes_to_dict(make_api):
+    api = make_api()
+    fail_for(api, 4)
+
+    members = api.get_members([3, 4, 5], on_error=lambda user_id, error: f'ошибка {error}')
+    assert members[4] == 'ошибка 4'
+    assert members[3].id == 3 and members[5].id == 5
+    with pytest.raises(ValueError):
+        api.get_members([3, 4, 5])
+
+
+def test_iter_members_stops_with_consumer(forum, make_api):
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    members = api.iter_members(range(2, 1000), max_concurrency=2)
+    user_id, member = next(members)
+    assert member.id == user_id
+    members.close()
+
+    # в работе не больше 2 * max_concurrency ID, остальные задачи отменяются
+    assert forum.stats['requests'] - requests <= 5
+
+
+def test_async_members():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                await api.get_token()
+                requests = forum.stats['requests']
+                members = await api.get_members([7, 3, 7, 5], max_concurrency=2)
+                fetched = forum.stats['requests'] - requests
+
+                fail_for(api, 4)
+                errors = await api.get_members([3, 4], on_error=lambda user_id, error: None)
+
+                requests = forum.stats['requests']
+                stream = api.iter_members(range(2, 1000), max_concurrency=2)
+                await stream.__anext__()
+                await stream.aclose()
+                await asyncio.sleep(0.05)
+                streamed = forum.stats['requests'] - requests
+            return members, fetched, errors, streamed
+
+    members, fetched, errors, streamed = asyncio.run(run())
+    assert [member.id for member in members.values()] == [7, 3, 5]
+    assert fetched == 3
+    assert errors[4] is None and errors[3].id == 3
+    assert streamed <= 3
@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+
+from arz_api_extended import CurrentMember, Member, Post, Thread
+from arz_api_extended.consts import MAIN_URL
+from arz_api_extended.models.other import HtmlFragment
+
+
+@pytest.fixture
+def post(make_api):
+    post = make_api().get_post(412003001)
+    post.creator.hydrate()
+    return post
+
+
+def test_to_dict_from_dict_round_trip(post):
+    data = post.to_dict()
+    copy = Post.from_dict(data)
+
+    assert copy.to_dict() == data
+    assert copy.API is None
+    assert isinstance(copy.thread, Thread) and isinstance(copy.creator, Member)
+    assert isinstance(copy.bb_content, HtmlFragment) and str(copy.bb_content) == str(post.bb_content)
+    assert copy.creator.roles == post.creator.roles
+
+
+def test_from_dict_skips_missing_fields():
+    member = Member.from_dict({'id': 7, 'username': 'Nick_Name', 'hydrated': False})
+    assert member.to_dict() == {'id': 7, 'username': 'Nick_Name', 'hydrated': False}
+
+
+def test_freeze_forbids_changes(post):
+    thread = post.thread.freeze()
+    assert thread.is_frozen and isinstance(thread, Thread)
+    with pytest.raises(AttributeError):
+        thread.title = 'Новый заголовок'
+    with pytest.raises(AttributeError):
+        del thread.title
+    assert thread.freeze() is thread
+
+
+def test_from_dict_frozen_freezes_nested_models(post):
+    copy = Post.from_dict(post.to_dict(), frozen=True)
+    assert copy.is_frozen and copy.thread.is_frozen and copy.thread.creator.is_frozen
+    with pytest.raises(AttributeError):
+        copy.thread.creator.username = 'other'
+    assert not post.is_frozen
+
+
+def test_pickle_drops_api(post):
+    copy = pickle.loads(pickle.dumps(post))
+    assert copy.API is None and copy.thread.API is None
+    assert copy == post and hash(copy) == hash(post)
+    assert copy.to_dict() == post.to_dict()
+
+    frozen = pickle.loads(pickle.dumps(post.thread.freeze()))
+    assert frozen.is_frozen and frozen == post.thread
+
+
+def test_bind_restores_actions(post):
+    copy = pickle.loads(pickle.dumps(post.thread))
+    assert copy.bind(post.API) is copy
+    assert copy.get_posts() == post.thread.get_posts()
+
+
+def test_equality_by_entity_and_id():
+    member = Member.stub(None, 7, 'Nick_Name')
+    assert member == CurrentMember.from_dict({'id': 7})
+    assert member != Member.stub(None, 8, 'Nick_Name')
+    assert member != Thread.from_dict({'id': 7})
+    assert len({member, Member.from_dict({'id': 7, 'username': 'Other'})}) == 1
+
+
+def test_url_uses_client_base_url(post, forum):
+    assert post.url == f'{forum.url}/posts/{post.id}/'
+    assert post.thread.url == f'{forum.url}/threads/{post.thread.id}/'
+    assert post.creator.url == f'{forum.url}/members/{post.creator.id}/'
+    assert Post.from_dict({'id': post.id}).url == f'{MAIN_URL}/posts/{post.id}/'
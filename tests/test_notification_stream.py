@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+from arz_api_extended.watchers import NotificationStream
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def record_marks(api) -> list:
+    """Подменить mark_notifications_read клиента, чтобы видеть каждый запрос"""
+
+    calls, mark = [], api.mark_notifications_read
+    def recorder(alert_ids):
+        calls.append(list(alert_ids))
+        return mark(alert_ids)
+    api.mark_notifications_read = recorder
+    return calls
+
+
+def test_existing_alerts_are_skipped_and_new_ones_deduplicated(make_api):
+    api = make_api()
+    api.answer_thread(412003, 'старое')
+    stream = NotificationStream(api)
+
+    assert stream.poll() == []
+    assert stream.poll() == []
+    api.answer_thread(412003, 'первое')
+    api.answer_thread(412004, 'второе')
+    fresh = stream.poll()
+    assert [alert['id'] for alert in fresh] == ['2', '3']
+    assert stream.poll() == []
+    assert stream.stats == {'polls': 4, 'alerts': 2}
+
+
+def test_backlog_and_bounded_seen(make_api):
+    api = make_api()
+    for _ in range(3):
+        api.answer_thread(412003, 'текст')
+    stream = NotificationStream(api, backlog=True, seen_size=2)
+
+    assert [alert['id'] for alert in stream.poll()] == ['1', '2', '3']
+    assert len(stream._seen) == 2
+
+
+def test_interval_backs_off_and_resets(make_api):
+    api = make_api()
+    stream = NotificationStream(api, min_interval=1, max_interval=5, backoff=2)
+    stream.poll()
+    stream.poll()
+    stream.poll()
+    assert stream.interval == 5
+    api.answer_thread(412003, 'текст')
+    stream.poll()
+    assert stream.interval == 1
+
+
+def test_mark_read_is_batched(forum, make_api):
+    api = make_api()
+    api.answer_thread(412003, 'уже было')
+    calls = record_marks(api)
+    got = []
+    stream = NotificationStream(api, min_interval=0.01, max_interval=0.02, mark_read=True, mark_interval=60)
+    stream.subscribe(lambda alert: got.append(alert['id']))
+
+    with stream:
+        assert wait_until(lambda: stream.stats['polls'] >= 1)
+        for thread_id in (412003, 412004, 412005):
+            api.answer_thread(thread_id, 'текст')
+        assert wait_until(lambda: len(got) == 3)
+        assert calls == []
+
+    # одна пометка при остановке, и только для новых уведомлений
+    assert [sorted(ids) for ids in calls] == [[2, 3, 4]]
+    assert [alert['is_unread'] for alert in api.get_notifications()] == [False, False, False, True]
+
+    # прочитанные не отправляются повторно: alert-toggle переключил бы их обратно
+    stream = NotificationStream(api, backlog=True, mark_read=True)
+    assert len(stream.poll()) == 4
+    assert stream._mark_due(force=True) == [1]
+
+
+def test_callback_errors_go_to_on_error(make_api):
+    api = make_api()
+    errors, got = [], []
+    stream = NotificationStream(api, min_interval=0.01, max_interval=0.02, on_error=lambda alert, error: errors.append((alert['id'], str(error))))
+
+    @stream.subscribe
+    def broken(alert):
+        raise ValueError('ошибка')
+    stream.subscribe(lambda alert: got.append(alert['id']))
+
+    with stream:
+        assert wait_until(lambda: stream.stats['polls'] >= 1)
+        api.answer_thread(412003, 'текст')
+        assert wait_until(lambda: got and errors)
+
+    assert errors == [('1', 'ошибка')]
+    assert stream.stats['callback_errors'] == 1 and stream.stats['errors'] == 0
+
+
+def test_async_stream():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                calls, mark = [], api.mark_notifications_read
+                async def recorder(alert_ids):
+                    calls.append(list(alert_ids))
+                    return await mark(alert_ids)
+                api.mark_notifications_read = recorder
+
+                got = []
+                stream = NotificationStream(api, min_interval=0.01, max_interval=0.02, mark_read=True, mark_interval=60)
+
+                @stream.subscribe
+                async def on_alert(alert):
+                    got.append(alert['id'])
+                stream.subscribe(lambda alert: got.append('sync' + alert['id']))
+
+                async with stream:
+                    while not stream.stats['polls']:
+                        await asyncio.sleep(0.01)
+                    await api.answer_thread(412003, 'текст')
+                    await api.answer_thread(412004, 'текст')
+                    while len(got) < 4:
+                        await asyncio.sleep(0.01)
+                unread = [alert['is_unread'] for alert in await api.get_notifications()]
+            return got, calls, unread
+
+    got, calls, unread = asyncio.run(asyncio.wait_for(run(), 10))
+    assert sorted(got) == ['1', '2', 'sync1', 'sync2']
+    assert [sorted(ids) for ids in calls] == [[1, 2]]
+    assert unread == [False, False]
@@ -0,0 +1,50 @@
+"""Бэкенд lxml (parsers.xpath) должен разбирать записанные страницы так же, как эталонный soup"""
+import pytest
+from harness import MEMBER_ID, POST_ID, PROFILE_POST_ID, THREAD_ID, load
+
+from arz_api_extended.parsers import soup, xpath
+
+
+CASES = {
+    'parse_categories': ('forum_page.json', ()),
+    'parse_category': ('forum_page.json', ()),
+    'parse_current_user_id': ('index.html', ()),
+    'parse_first_post_id': ('thread_page.html', ()),
+    'parse_forum_statistic': ('index.html', ()),
+    'parse_logged_in': ('index.html', ()),
+    'parse_member': ('member.json', (MEMBER_ID,)),
+    'parse_notifications': ('alerts.html', ()),
+    'parse_parent_category_id': ('category_page.html', ()),
+    'parse_post': ('thread_page.html', (POST_ID,)),
+    'parse_posts': ('thread_page.html', ()),
+    'parse_profile_messages': ('profile_posts.json', ()),
+    'parse_profile_post': ('profile_post.html', (PROFILE_POST_ID,)),
+    'parse_search_results': ('search.html', ()),
+    'parse_thread': ('thread_page.json', ()),
+    'parse_thread_category_id': ('thread_page.html', ()),
+    'parse_thread_posts': ('thread_page.json', ()),
+    'parse_thread_posts_full': ('thread_page.json', (THREAD_ID,)),
+    'parse_thread_posts_page': ('thread_page.json', ()),
+    'parse_thread_records': ('forum_page.json', ()),
+    'parse_threads': ('forum_page.json', ()),
+    'parse_threads_extended': ('forum_page.json', ()),
+}
+
+
+def test_every_parser_has_a_case():
+    assert sorted(name for name in dir(xpath) if name.startswith('parse_')) == sorted(CASES)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_xpath_matches_soup(name):
+    fixture, args = CASES[name]
+    assert getattr(xpath, name)(load(fixture), *args) == getattr(soup, name)(load(fixture), *args)
+
+
+@pytest.mark.parametrize('name', ['parse_threads_extended', 'parse_thread_posts_full', 'parse_member', 'parse_notifications', 'parse_posts'])
+def test_fixture_is_not_empty(name):
+    """Страницы действительно содержат данные - иначе сравнение пустых результатов ничего не проверяет"""
+
+    fixture, args = CASES[name]
+    result = getattr(xpath, name)(load(fixture), *args)
+    assert result if not isinstance(result, tuple) else result[0]
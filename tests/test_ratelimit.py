@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from arz_api_extended import AsyncArizonaAPI, RateLimiter, TokenBucket
+from arz_api_extended.local_server import LocalForum
+
+
+def test_bucket_burst_then_wait(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # ведро пустое - каждый следующий запрос ждет на 1 / rate дольше
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refill_is_capped_by_burst(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.reserve()
+    clock.advance(1)
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    clock.advance(60)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() > 0
+
+
+def test_read_and_write_buckets_are_separate(clock):
+    limiter = RateLimiter(read_rate=1, read_burst=1, write_rate=1, write_burst=1)
+    assert limiter.reserve('GET', 'https://forum/threads/1/') == ('read', 0)
+    assert limiter.reserve('POST', 'https://forum/threads/1/add-reply') == ('write', 0)
+    assert limiter.reserve('GET', 'https://forum/members/1/')[1] == pytest.approx(1)
+    assert limiter.reserve('POST', 'https://forum/posts/1/react')[1] == pytest.approx(1)
+    # у другого хоста свои ведра
+    assert limiter.reserve('GET', 'https://other/threads/1/') == ('read', 0)
+
+
+def test_limit_waits_and_records_stats(clock):
+    limiter = RateLimiter(read_rate=10, read_burst=1)
+    for _ in range(3):
+        with limiter.limit('GET', 'https://forum/'):
+            pass
+    assert clock.now == pytest.approx(1000.2)
+    assert limiter.requests == {'read': 3}
+    assert limiter.throttled == {'read': 2}
+    assert limiter.stats['max_wait'] == pytest.approx(0.1)
+
+
+def test_file_bucket_is_shared(tmp_path, clock):
+    path = str(tmp_path / 'buckets.json')
+    first, second = RateLimiter(read_rate=1, read_burst=2, path=path), RateLimiter(read_rate=1, read_burst=2, path=path)
+    assert first.reserve('GET', 'https://forum/')[1] == 0
+    assert second.reserve('GET', 'https://forum/')[1] == 0
+    assert first.reserve('GET', 'https://forum/')[1] == pytest.approx(1)
+
+
+def test_sync_client_is_limited(make_api):
+    limiter = RateLimiter(read_rate=100, read_burst=1, write_rate=1000, write_burst=1, max_concurrency=1)
+    api = make_api(rate_limiter=limiter)
+    api.get_members(range(2, 12), max_concurrency=4)
+    assert limiter.requests['read'] >= 10
+    assert limiter.throttled['read'] > 0
+
+    # повтор с новым CSRF токеном идет внутри того же запроса и не ждет свободного места сам у себя
+    api.token_manager._token = 'stale'
+    assert api.answer_thread(412003, 'текст').status_code == 200
+    assert limiter.requests['write'] == 2
+
+
+def test_async_client_is_limited():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            limiter = RateLimiter(read_rate=100, read_burst=1, max_concurrency=2)
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url, rate_limiter=limiter) as api:
+                members = await asyncio.gather(*(api.get_member(user_id) for user_id in range(2, 12)))
+            return members, limiter
+
+    members, limiter = asyncio.run(run())
+    assert all(members)
+    assert limiter.requests['read'] >= 10
+    assert limiter.throttled['read'] > 0
+
+
+def test_every_request_is_limited(forum, make_api):
+    limiter = RateLimiter(read_rate=1000, read_burst=100)
+    api = make_api(rate_limiter=limiter)
+    # страница анти-бота при входе тоже проходит через limiter
+    assert sum(limiter.requests.values()) == forum.stats['requests'] > 0
+    api.get_member(2)
+    assert sum(limiter.requests.values()) == forum.stats['requests']
+
+
+def test_async_every_request_is_limited():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            limiter = RateLimiter(read_rate=1000, read_burst=100)
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url, rate_limiter=limiter) as api:
+                await api.get_member(2)
+                return sum(limiter.requests.values()), forum.stats['requests']
+
+    limited, requests = asyncio.run(run())
+    assert limited == requests
+
+
+def test_limiter_shared_between_event_loops():
+    limiter = RateLimiter(read_rate=1000, read_burst=100, max_concurrency=1)
+    active = []
+
+    async def request():
+        async with limiter.limit_async('GET', 'https://forum/'):
+            active.append(1)
+            assert len(active) == 1
+            await asyncio.sleep(0.001)
+            active.pop()
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert limiter.requests['read'] == 10
@@ -0,0 +1,147 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from arz_api_extended import AntiBotError, AsyncArizonaAPI, RetryError, RetryPolicy
+from arz_api_extended.local_server import LocalForum
+from arz_api_extended.retry import parse_retry_after
+
+
+def fast_policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault('backoff', 0.001)
+    kwargs.setdefault('max_backoff', 0.005)
+    return RetryPolicy(**kwargs)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after('-1') == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('завтра') is None
+
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(date) <= 30
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+
+def test_backoff_grows_up_to_max():
+    policy = RetryPolicy(backoff=0.5, max_backoff=3, jitter=0)
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_jitter_only_shortens_delay():
+    policy = RetryPolicy(backoff=1, jitter=0.5)
+    delays = [policy.delay(2) for _ in range(200)]
+    assert all(2 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_is_respected_and_capped():
+    policy = RetryPolicy(backoff=0.5, jitter=0, max_retry_after=10)
+    assert policy.retry_response('GET', 'u', 429, {'Retry-After': '7'}, 0) == 7
+    assert policy.retry_response('GET', 'u', 503, {'Retry-After': '120'}, 0) == 10
+    # у 500 Retry-After не бывает осмысленным - обычная пауза
+    assert policy.retry_response('GET', 'u', 500, {'Retry-After': '7'}, 1) == 1
+
+
+def test_post_is_retried_only_after_429():
+    policy = RetryPolicy(jitter=0)
+    assert policy.retry_response('POST', 'u', 503, {}, 0) is None
+    assert policy.retry_response('POST', 'u', 429, {}, 0) == 0.5
+    assert policy.retry_error('POST', 0) is None
+    assert policy.retry_response('GET', 'u', 404, {}, 0) is None
+
+
+def test_gives_up_after_attempts():
+    policy = RetryPolicy(attempts=3, jitter=0)
+    policy.retry_response('GET', 'u', 502, {}, 0)
+    policy.retry_response('GET', 'u', 502, {}, 1)
+    with pytest.raises(RetryError):
+        policy.retry_response('GET', 'u', 502, {}, 2)
+    assert policy.retry_error('GET', 2) is None
+    assert policy.stats == {502: 2, 'gave_up': 2}
+
+
+def test_sync_client_recovers_from_faults(forum, make_api):
+    policy = fast_policy(attempts=12, challenges=5)
+    forum.error_rate, forum.rate_limit_rate, forum.challenge_rate = 0.2, 0.2, 0.1
+    api = make_api(retry=policy)
+
+    assert all(api.get_members(range(2, 22)))
+    assert len(api.get_all_thread_posts(412003)) == 45
+    assert forum.stats[429] and forum.stats[500] + forum.stats[502] + forum.stats[503]
+    assert policy.stats[429] and policy.stats['gave_up'] == 0
+
+
+def test_sync_client_raises_retry_error(forum, make_api):
+    policy = fast_policy(attempts=3)
+    api = make_api(retry=policy)
+    forum.rate_limit_rate = 1
+    requests = forum.stats['requests']
+
+    with pytest.raises(RetryError):
+        api.get_member(2)
+    assert forum.stats['requests'] - requests == 3
+
+
+def test_sync_post_is_not_repeated_after_server_error(forum, make_api):
+    api = make_api(retry=fast_policy())
+    forum.error_rate = 1
+    requests = forum.stats['requests']
+
+    assert api.answer_thread(412003, 'текст').status_code >= 500
+    assert forum.stats['requests'] - requests == 1
+    assert not forum.replies
+
+
+def test_startup_bypass_is_retried(forum, make_api):
+    forum.error_rate, forum.rate_limit_rate = 0.3, 0.3
+    policy = fast_policy(attempts=10)
+    api = make_api(retry=policy)
+    assert forum.stats['challenge'] and policy.stats['gave_up'] == 0
+    forum.error_rate = forum.rate_limit_rate = 0
+    assert api.get_member(2)
+
+
+def test_startup_bypass_fails_clearly_without_challenge(forum, make_api):
+    forum.error_rate = 1
+    with pytest.raises((AntiBotError, RetryError)):
+        make_api(retry=fast_policy(attempts=2))
+
+
+def test_async_client_recovers_from_faults():
+    async def run():
+        async with LocalForum(threads_per_category=45, retry_after=0, seed=3) as forum:
+            policy = fast_policy(attempts=12, challenges=5)
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url, retry=policy) as api:
+                forum.error_rate, forum.rate_limit_rate, forum.challenge_rate = 0.2, 0.2, 0.1
+                members = await asyncio.gather(*(api.get_member(user_id) for user_id in range(2, 22)))
+
+                forum.error_rate = forum.challenge_rate = 0
+                forum.rate_limit_rate = 1
+                with pytest.raises(RetryError):
+                    await api.get_member(30)
+            return members, policy
+
+    members, policy = asyncio.run(run())
+    assert all(members)
+    assert policy.stats[429] and policy.stats['challenge'] and policy.stats['gave_up'] == 1
+
+
+def test_async_avatar_form_is_retried(tmp_path):
+    image = tmp_path / 'avatar.png'
+    image.write_bytes(b'\x89PNG avatar')
+
+    async def run():
+        async with LocalForum(threads_per_category=45, retry_after=0, seed=1) as forum:
+            policy = fast_policy(attempts=20)
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url, retry=policy) as api:
+                forum.rate_limit_rate = 0.5
+                statuses = [(await api.edit_avatar(str(image))).status, (await api.delete_avatar()).status]
+            return statuses, policy
+
+    statuses, policy = asyncio.run(run())
+    assert statuses == [200, 200]
+    assert policy.stats[429] > 0
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+
+
+def expected(thread_id: int, count: int) -> list:
+    return [thread_id * 1000 + index for index in range(1, count + 1)]
+
+
+def expected_ids(thread_id: int, count: int) -> list:
+    """Списки ID (get_thread_posts, get_all_thread_posts) - строки, как и раньше"""
+
+    return [str(post_id) for post_id in expected(thread_id, count)]
+
+
+def test_get_thread_posts_full(make_api):
+    api = make_api()
+    posts = api.get_thread_posts(412003, 3, full=True)
+    assert [post.id for post in posts] == expected(412003, 45)[40:]
+    assert posts[0].thread.id == 412003 and posts[0].thread is posts[-1].thread
+    assert '<b>доказательства</b>' in str(posts[0].bb_content)
+    assert api.get_thread_posts(412003, 3) == [str(post.id) for post in posts]
+    assert api.get_thread_posts(412999, full=True) is None
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 2, 10])
+def test_iter_thread_posts_order(forum, make_api, prefetch):
+    forum.posts_per_thread = 95
+    api = make_api()
+    posts = list(api.iter_thread_posts(412003, prefetch=prefetch))
+    assert [post.id for post in posts] == expected(412003, 95)
+    assert len({id(post.thread) for post in posts}) == 1
+
+
+def test_iter_thread_posts_start_page(make_api):
+    api = make_api()
+    assert [post.id for post in api.iter_thread_posts(412003, start_page=2)] == expected(412003, 45)[20:]
+    assert list(api.iter_thread_posts(412999)) == []
+
+
+def test_iter_thread_posts_stops_with_consumer(forum, make_api):
+    forum.posts_per_thread = 400
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    posts = api.iter_thread_posts(412003, prefetch=2)
+    next(posts)
+    posts.close()
+    # первая страница и не больше prefetch страниц в фоне
+    assert forum.stats['requests'] - requests <= 3
+
+
+def test_get_all_thread_posts(forum, make_api):
+    forum.posts_per_thread = 95
+    api = make_api()
+    assert api.get_all_thread_posts(412003, max_workers=3) == expected_ids(412003, 95)
+
+    pages = dict(api.get_all_thread_posts(412003, max_workers=3, stream=True))
+    assert sorted(pages) == [1, 2, 3, 4, 5]
+    assert [post_id for page in sorted(pages) for post_id in pages[page]] == expected_ids(412003, 95)
+    assert list(api.get_all_thread_posts(412999, stream=True)) == []
+
+
+def test_get_all_thread_posts_stream_stops_with_consumer(forum, make_api):
+    forum.posts_per_thread = 400
+    api = make_api()
+    api.token
+    requests = forum.stats['requests']
+
+    pages = api.get_all_thread_posts(412003, max_workers=2, stream=True)
+    next(pages)
+    next(pages)
+    pages.close()
+    # из 20 страниц загружены первая и те, что уже были в работе
+    assert forum.stats['requests'] - requests <= 5
+
+
+def test_async_thread_posts():
+    async def run():
+        async with LocalForum(threads_per_category=45, posts_per_thread=95) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                full = await api.get_thread_posts(412003, 2, full=True)
+                posts = [post async for post in api.iter_thread_posts(412003, prefetch=0)]
+                all_posts = await api.get_all_thread_posts(412003)
+            return full, posts, all_posts
+
+    full, posts, all_posts = asyncio.run(run())
+    assert [post.id for post in full] == expected(412003, 95)[20:40]
+    assert [post.id for post in posts] == expected(412003, 95)
+    assert all_posts == expected_ids(412003, 95)
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from arz_api_extended import AsyncArizonaAPI
+from arz_api_extended.local_server import LocalForum
+from arz_api_extended.watchers import ThreadWatcher
+
+
+def count_pages(api) -> list:
+    """Подменить get_thread_page клиента, чтобы видеть загруженные страницы"""
+
+    pages, get_thread_page = [], api.get_thread_page
+    def recorder(thread_id, page=1, *args, **kwargs):
+        pages.append((thread_id, page))
+        return get_thread_page(thread_id, page, *args, **kwargs)
+    api.get_thread_page = recorder
+    return pages
+
+
+def test_first_poll_only_remembers(make_api):
+    api = make_api()
+    pages = count_pages(api)
+    watcher = ThreadWatcher(api)
+    watcher.watch(412003)
+
+    assert watcher.poll() == []
+    assert watcher.state == {'412003': {'last_post_id': 412003045, 'pages_count': 3}}
+    # 1 страница, затем последняя - не вся тема
+    assert pages == [(412003, 1), (412003, 3)]
+
+
+def test_new_posts_in_order(forum, make_api):
+    api = make_api()
+    watcher = ThreadWatcher(api)
+    watcher.watch(412003)
+    watcher.watch(412999)
+    watcher.poll()
+
+    api.answer_thread(412003, 'первый')
+    api.answer_thread(412003, 'второй')
+    posts = watcher.poll()
+    assert [post.id for post in posts] == [412003046, 412003047]
+    assert 'первый' in str(posts[0].bb_content) and 'второй' in str(posts[1].bb_content)
+    assert posts[0].thread is posts[1].thread
+    assert watcher.poll() == []
+
+
+def test_new_pages_are_loaded(forum, make_api):
+    api = make_api()
+    pages = count_pages(api)
+    watcher = ThreadWatcher(api)
+    watcher.watch(412003)
+    watcher.poll()
+    pages.clear()
+
+    forum.posts_per_thread = 85
+    posts = watcher.poll()
+    assert [post.id for post in posts] == list(range(412003046, 412003086))
+    # известная последняя страница и появившиеся после нее
+    assert pages == [(412003, 3), (412003, 4), (412003, 5)]
+    assert watcher.state['412003'] == {'last_post_id': 412003085, 'pages_count': 5}
+
+
+def test_backlog(make_api):
+    api = make_api()
+    watcher = ThreadWatcher(api)
+    watcher.watch(412003, backlog=True)
+    assert [post.id for post in watcher.poll()] == list(range(412003001, 412003046))
+
+
+def test_watermark_file(tmp_path, make_api):
+    path = str(tmp_path / 'threads.json')
+    api = make_api()
+    watcher = ThreadWatcher(api, path)
+    watcher.watch(412003)
+    watcher.watch(412004)
+    watcher.poll()
+    with open(path, encoding='utf-8') as file:
+        assert json.load(file)['412003'] == {'last_post_id': 412003045, 'pages_count': 3}
+
+    api.answer_thread(412004, 'пока никто не следил')
+    watcher = ThreadWatcher(api, path)
+    assert [post.id for post in watcher.poll()] == [412004046]
+
+    watcher.unwatch(412004)
+    assert list(ThreadWatcher(api, path).state) == ['412003']
+    assert not list(tmp_path.glob('tmp*'))
+
+
+def test_async_watcher():
+    async def run():
+        async with LocalForum(threads_per_category=45) as forum:
+            async with AsyncArizonaAPI('pytest', {}, cookie_store=None, base_url=forum.url) as api:
+                watcher = ThreadWatcher(api)
+                watcher.watch(412003)
+                watcher.watch(412005, backlog=True)
+                first = await watcher.poll()
+                await api.answer_thread(412003, 'текст')
+                second = await watcher.poll()
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert [post.id for post in first] == list(range(412005001, 412005046))
+    assert [post.id for post in second] == [412003046]